@@ -67,16 +67,18 @@ export default function ResultsPage({ params }: { params: { jobId: string } }) {
 
       const { data: uploads, error: err3 } = await supabase
         .from("resume_uploads")
-        .select("resume_id, file_name")
+        .select("resume_id, file_name, file_path")
         .in("resume_id", ids);
         
       if (err3) console.error("Error fetching filenames:", err3);
-      const fileMap = Object.fromEntries((uploads ?? []).map(u => [u.resume_id, u.file_name]));
+      const fileMap = Object.fromEntries((uploads ?? []).map(u => [u.resume_id, u]));
 
       const finalRows = rankings.map(r => ({
           ...r,
           candidate_name: r.candidate_name || "Unknown",
-          file_name: fileMap[r.resume_id] || "",
+          file_name: fileMap[r.resume_id]?.file_name || "",
+          // Storage objects are content-addressed; older uploads still live under {jobId}/{file_name}
+          file_url: fileMap[r.resume_id]?.file_path || `${SUPABASE_BUCKET_BASE}/${params.jobId}/${fileMap[r.resume_id]?.file_name}`,
           ...analysisMap[r.resume_id],
         }));
       
@@ -203,7 +205,7 @@ export default function ResultsPage({ params }: { params: { jobId: string } }) {
                       <h3 className="candidate-hero-name">{selected.candidate_name}</h3>
                       {selected.file_name && (
                         <a
-                          href={`${SUPABASE_BUCKET_BASE}/${params.jobId}/${selected.file_name}`}
+                          href={selected.file_url}
                           target="_blank"
                           rel="noopener noreferrer"
                           className="pdf-link"
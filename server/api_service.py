@@ -1,8 +1,8 @@
 # File: api_service.py
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Depends, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Depends, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 import uvicorn
 import os
 import shutil
@@ -22,10 +22,15 @@ env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path, override=True)
 
 from process_resumes import process_all_resumes
+from screening_cascade import CascadeConfig, CASCADE_MODES
 from rank_candidates import compute_relative_ranking
 from routes.comparison import router as comparison_router
 from routes.collaboration import router as collaboration_router
 from routes.search_analytics import router as search_router
+from routes.results import router as results_router
+from result_index import result_cache
+from result_store import ResultStore
+from result_export import COLUMNAR_FORMATS, MEDIA_TYPES, project_columns, stream_columnar
 
 # ─── Load & init ─────────────────────────────────────────
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -47,6 +52,7 @@ app.add_middleware(
 app.include_router(comparison_router)
 app.include_router(collaboration_router)
 app.include_router(search_router)
+app.include_router(results_router)
 
 # ─── Paths ───────────────────────────────────────────────
 RESUME_FOLDER         = "resumes"
@@ -83,9 +89,9 @@ def update_job_status(job_id: str):
         print("⚠️ update_job_status:", e)
 
 # ─── DB uploads ──────────────────────────────────────────
-def upload_job_description_to_db(job_id, title, desc, exp_w, proj_w, cert_w, user_id):
+def upload_job_description_to_db(job_id, title, desc, exp_w, proj_w, cert_w, user_id, cascade=None):
     try:
-        supabase.table("job_descriptions").insert({
+        row = {
             "job_id":             job_id,
             "user_id":            user_id,
             "job_title":          title,
@@ -93,7 +99,18 @@ def upload_job_description_to_db(job_id, title, desc, exp_w, proj_w, cert_w, use
             "experience_weight":  exp_w,
             "project_weight":     proj_w,
             "certifications_weight": cert_w
-        }).execute()
+        }
+        if cascade:
+            row["cascade_config"] = cascade
+        try:
+            supabase.table("job_descriptions").insert(row).execute()
+        except Exception as e:
+            if "cascade_config" not in row:
+                raise
+            # Schema without migrations/002_screening_cascade.sql; the config still reaches the pipeline directly
+            print("⚠️ cascade_config not stored:", e)
+            row.pop("cascade_config")
+            supabase.table("job_descriptions").insert(row).execute()
     except Exception as e:
         print("⚠️ upload_job_description_to_db:", e)
 
@@ -149,22 +166,19 @@ def upload_resume_info_to_db(file_name: str, file_path: str, job_id: str, user_i
     return resume_id
 
 def upload_analysis_to_db(resume_id_map, job_id: str):
-    fn = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_analysis.json")
-    if not os.path.exists(fn):
-        print("⚠️ Analysis file missing:", fn)
+    store = ResultStore(job_id)
+    if not store.exists():
+        print("⚠️ Result store missing:", store.path)
         return
 
-    with open(fn) as f:
-        results = json.load(f)
-
     print("\n📦 Available keys in resume_id_map:")
     print(list(resume_id_map.keys()))
     print("📖 Uploading all analysis entries:")
 
-    for entry in results:
+    for entry in store.records():
         raw_filename = entry.get("filename", "")
         lookup_name  = raw_filename.strip().lower()
-        resume_id    = resume_id_map.get(lookup_name)
+        resume_id    = entry.get("resume_id") or resume_id_map.get(lookup_name)
 
         if not resume_id:
             print(f"🚫 No resume_id for {lookup_name} (original: {raw_filename})")
@@ -191,14 +205,19 @@ def upload_analysis_to_db(resume_id_map, job_id: str):
             print(f"🚨 upload_analysis_to_db error ({lookup_name}): {e}")
 
 # ─── Background work ─────────────────────────────────────
-def background_process(zip_path, job_description, weightages, out_folder, job_id, user_id):
+# Jobs with a background_process running in this process (a resumed job must not run twice)
+running_jobs = set()
+
+def background_process(zip_path, job_description, weightages, out_folder, job_id, user_id, cascade=None):
+    running_jobs.add(job_id)
     try:
         results, resume_id_map = process_all_resumes(
-            zip_path, job_description, weightages, out_folder, job_id, user_id
+            zip_path, job_description, weightages, out_folder, job_id, user_id, cascade=cascade
         )
         print("📦 Passing keys to upload_analysis_to_db:", list(resume_id_map.keys()))
         upload_analysis_to_db(resume_id_map, job_id)
         compute_relative_ranking(job_id)
+        result_cache.invalidate(job_id)
     except Exception as e:
         print("🚨 Background processing error:", e)
     finally:
@@ -207,6 +226,7 @@ def background_process(zip_path, job_description, weightages, out_folder, job_id
             print(f"✅ Job status marked complete → {job_id}")
         except Exception as e:
             print("⚠️ update_job_status failed:", e)
+        running_jobs.discard(job_id)
 
 # ─── API endpoints ───────────────────────────────────────
 @app.post("/upload-resumes/")
@@ -218,10 +238,24 @@ async def upload_resumes(
     weight_experience: int = Form(...),
     weight_projects:    int = Form(...),
     weight_certifications: int = Form(...),
+    cascade_mode: Optional[str] = Form(None),
+    cascade_reject_below: Optional[float] = Form(None),
+    cascade_escalate_top: Optional[int] = Form(None),
     user=Depends(get_current_user)
 ):
     if user["role"] != "recruiter":
         raise HTTPException(403, "Only recruiters can upload.")
+    if cascade_mode is not None and cascade_mode.lower() not in CASCADE_MODES:
+        raise HTTPException(400, f"cascade_mode must be one of {', '.join(CASCADE_MODES)}.")
+
+    # Per-job cascade settings; anything not given falls back to the SCREENING_CASCADE_* env defaults
+    cascade = CascadeConfig.from_dict({
+        key: value for key, value in {
+            "mode": cascade_mode,
+            "reject_below": cascade_reject_below,
+            "escalate_top": cascade_escalate_top
+        }.items() if value is not None
+    }).to_dict()
 
     job_id     = str(uuid.uuid4())
     user_id    = user["user_id"]
@@ -236,7 +270,7 @@ async def upload_resumes(
         raise HTTPException(400, "Uploaded file is empty.")
 
     upload_job_description_to_db(job_id, job_title, job_description,
-                                 weight_experience, weight_projects, weight_certifications, user_id)
+                                 weight_experience, weight_projects, weight_certifications, user_id, cascade)
     insert_job_status(job_id)
 
     weight_map = {
@@ -246,48 +280,121 @@ async def upload_resumes(
     }
     background_tasks.add_task(
         background_process, zip_path, job_description,
-        weight_map, out_folder, job_id, user_id
+        weight_map, out_folder, job_id, user_id, cascade
     )
 
     return {"job_id": job_id}
 
+@app.post("/resume-job/{job_id}")
+async def resume_job(job_id: str, background_tasks: BackgroundTasks, user=Depends(get_current_user)):
+    """
+    Re-run a job left "pending" by a crash or restart, from its uploaded ZIP and stored settings.
+    Resumes already in the job's result store are not analyzed again.
+    """
+    status = supabase.table("job_status").select("status").eq("job_id", job_id).limit(1).execute()
+    job = supabase.table("job_descriptions").select("*").eq("job_id", job_id).limit(1).execute()
+    if not status.data or not job.data or job.data[0].get("user_id") != user["user_id"]:
+        raise HTTPException(404, "Job ID not found.")
+    if status.data[0]["status"] == "complete":
+        raise HTTPException(409, "Job is already complete.")
+    if job_id in running_jobs:
+        raise HTTPException(409, "Job is still running.")
+    zip_path = os.path.join(UPLOAD_FOLDER, f"{job_id}.zip")
+    if not os.path.exists(zip_path):
+        raise HTTPException(410, "The uploaded ZIP for this job is no longer available.")
+
+    job = job.data[0]
+    weight_map = {
+        "experience": job["experience_weight"],
+        "projects": job["project_weight"],
+        "certifications": job["certifications_weight"]
+    }
+    out_folder = os.path.join(RESUME_FOLDER, job_id)
+    os.makedirs(out_folder, exist_ok=True)
+    # Marked running now, so a second request before the task starts is refused
+    running_jobs.add(job_id)
+    background_tasks.add_task(
+        background_process, zip_path, job["job_description"],
+        weight_map, out_folder, job_id, user["user_id"], job.get("cascade_config")
+    )
+    return {"job_id": job_id, "completed": len(ResultStore(job_id).completed())}
+
 @app.get("/status")
 async def get_status(job_id: str):
     resp = supabase.table("job_status").select("status").eq("job_id", job_id).limit(1).execute()
     if not resp.data:
         raise HTTPException(404, "Job ID not found.")
-    return {"status": resp.data[0]["status"]}
+    stats = None
+    try:
+        job = supabase.table("job_descriptions").select("screening_stats").eq("job_id", job_id).limit(1).execute()
+        stats = job.data[0].get("screening_stats") if job.data else None
+    except Exception as e:
+        print("⚠️ screening_stats lookup failed:", e)
+    return {"status": resp.data[0]["status"], "screening_stats": stats}
 
 @app.get("/export")
-async def export_results(job_id: str, format: str = "json"):
-    jrank = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_ranked_candidates.json")
-    janal = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_analysis.json")
-    file_path = jrank if os.path.exists(jrank) else janal
+async def export_results(job_id: str, format: str = "json", columns: list[str] = Query(default=[])):
+    store = ResultStore(job_id)
+    # Jobs screened before the result store existed only have their *_ranked / *_analysis.json files
+    if not (store.exists() or store.import_legacy()):
+        raise HTTPException(404, "No results to export.")
+    format = format.lower()
+    if format not in ("json", "csv", *COLUMNAR_FORMATS):
+        raise HTTPException(400, "Unsupported format.")
+
+    # Column projection: filename, resume_id, rank and analysis keys such as "Key Skills" (repeat ?columns=)
+    try:
+        selected = project_columns(store, columns) if columns or format in COLUMNAR_FORMATS else None
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    if not file_path:
-        raise HTTPException(500, "No results to export.")
+    # Streamed from the result store in rank order (insertion order until the job is ranked)
+    rows = (r for r in store.records(ranked=True) if r.get("filename") and r.get("analysis"))
 
-    if format.lower() == "json":
-        data = [r for r in json.load(open(file_path)) if r.get("filename") and r.get("analysis")]
-        return JSONResponse(content=data)
+    if format in COLUMNAR_FORMATS:
+        try:
+            content = stream_columnar(store, format, selected)
+        except ImportError:
+            raise HTTPException(501, "Parquet/Arrow export needs pyarrow installed on the server.")
+        extension = "parquet" if format == "parquet" else "arrows"
+        return StreamingResponse(content, media_type=MEDIA_TYPES[format], headers={
+            "Content-Disposition": f'attachment; filename="{job_id}.{extension}"'
+        })
 
-    if format.lower() == "csv":
-        arr = json.load(open(file_path))
-        stream = io.StringIO()
+    if format == "json":
+        def stream_json():
+            yield "["
+            for i, r in enumerate(rows):
+                analysis = {k: v for k, v in r["analysis"].items() if not columns or k in selected}
+                yield ("," if i else "") + json.dumps({"filename": r["filename"], "analysis": analysis})
+            yield "]"
+        return StreamingResponse(stream_json(), media_type="application/json")
+
+    def stream_csv():
+        buf = io.StringIO()
         writer = None
-        for item in arr:
-            row = {"filename": item["filename"], **item["analysis"]}
+        for r in rows:
+            row = {"filename": r["filename"], "resume_id": r.get("resume_id"), "rank": r.get("rank"), **r["analysis"]}
             if writer is None:
-                writer = csv.DictWriter(stream, fieldnames=row.keys())
+                fieldnames = selected if columns else [k for k in row if k not in ("resume_id", "rank")]
+                writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
                 writer.writeheader()
             writer.writerow(row)
-        stream.seek(0)
-        return StreamingResponse(stream, media_type="text/csv")
-
-    raise HTTPException(400, "Unsupported format.")
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    return StreamingResponse(stream_csv(), media_type="text/csv")
 
 @app.get("/resumes/{job_id}/{filename}")
 def get_resume_url(job_id: str, filename: str):
+    # Objects are content-addressed now; resume_uploads.file_path knows where this job's file lives
+    try:
+        row = supabase.table("resume_uploads").select("file_path") \
+            .eq("job_id", job_id).eq("file_name", filename).limit(1).execute()
+        if row.data and row.data[0].get("file_path"):
+            return {"url": row.data[0]["file_path"]}
+    except Exception as e:
+        print("⚠️ resume_uploads lookup failed:", e)
     url = f"{SUPABASE_URL}/storage/v1/object/public/resumes/{job_id}/{filename}"
     return {"url": url}
 
@@ -307,6 +414,7 @@ async def update_resume_status(
             .eq("job_id", job_id) \
             .eq("resume_id", resume_id) \
             .execute()
+        result_cache.set_status(job_id, resume_id, status)
         return {"message": f"Status updated to {status}"}
     except Exception as e:
         print("🚨 Error in /update-status/:", e)
@@ -0,0 +1,172 @@
+import json
+import re
+
+from skill_taxonomy import canonical_skill, get_matcher, normalize, normalize_skill
+
+# Compiled once per job_id and stored in job_descriptions.requirement_spec (see migrations/001_job_requirement_spec.sql)
+SPEC_VERSION = 1
+SPEC_MAX_DESCRIPTION_CHARS = 8000
+# Skills outside the taxonomy this short are never matched as bare words in resume text
+AMBIGUOUS_SKILL_MAX_CHARS = 3
+
+SPEC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "required_skills": {"type": "array", "items": {"type": "string"}},
+        "optional_skills": {"type": "array", "items": {"type": "string"}},
+        "seniority": {"type": "string", "enum": ["intern", "junior", "mid", "senior", "lead", "unspecified"]},
+        "min_years_experience": {"type": "number"},
+        "domains": {"type": "array", "items": {"type": "string"}},
+        "responsibilities": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["required_skills", "optional_skills", "seniority", "domains"],
+}
+
+SENIORITY_LEVELS = ("intern", "junior", "mid", "senior", "lead", "unspecified")
+
+def compile_prompt(job_title: str, job_description: str) -> str:
+    return f"""
+Extract the hiring requirements from this job description.
+Return a JSON object matching this schema:
+
+{json.dumps(SPEC_SCHEMA)}
+
+Rules:
+- Skills are short canonical names ("Python", "PostgreSQL", "Kubernetes"), one per entry, no duplicates.
+- required_skills are must-haves; optional_skills are nice-to-haves.
+- responsibilities: at most 5 short phrases.
+- Use "unspecified" and 0 when seniority or years are not stated.
+
+### Job Title:
+{job_title or "Not specified"}
+
+### Job Description:
+{job_description[:SPEC_MAX_DESCRIPTION_CHARS]}
+"""
+
+class JobSpec:
+    """Structured requirements of one job description."""
+
+    __slots__ = ("required_skills", "optional_skills", "seniority", "min_years_experience", "domains", "responsibilities")
+
+    def __init__(self, required_skills=None, optional_skills=None, seniority="unspecified",
+                 min_years_experience=0, domains=None, responsibilities=None):
+        self.required_skills = required_skills or []
+        self.optional_skills = optional_skills or []
+        self.seniority = seniority
+        self.min_years_experience = min_years_experience
+        self.domains = domains or []
+        self.responsibilities = responsibilities or []
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobSpec":
+        required = _unique(data.get("required_skills"))
+        required_keys = {canonical_skill(s) for s in required}
+        seniority = str(data.get("seniority") or "unspecified").strip().lower()
+        try:
+            years = max(0.0, float(data.get("min_years_experience") or 0))
+        except (TypeError, ValueError):
+            years = 0.0
+        return cls(
+            required_skills=required,
+            optional_skills=[s for s in _unique(data.get("optional_skills")) if canonical_skill(s) not in required_keys],
+            seniority=seniority if seniority in SENIORITY_LEVELS else "unspecified",
+            min_years_experience=int(years) if years.is_integer() else years,
+            domains=_unique(data.get("domains")),
+            responsibilities=_unique(data.get("responsibilities"))[:5],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": SPEC_VERSION,
+            "required_skills": self.required_skills,
+            "optional_skills": self.optional_skills,
+            "seniority": self.seniority,
+            "min_years_experience": self.min_years_experience,
+            "domains": self.domains,
+            "responsibilities": self.responsibilities,
+        }
+
+    def is_empty(self) -> bool:
+        return not (self.required_skills or self.optional_skills)
+
+    def prompt_block(self) -> str:
+        """Compact requirement list used in every per-resume prompt of the job (identical text -> cacheable prefix)."""
+        lines = [
+            f"Required skills: {', '.join(self.required_skills) or 'none listed'}",
+            f"Nice-to-have skills: {', '.join(self.optional_skills) or 'none listed'}",
+            f"Seniority: {self.seniority}" + (f" ({self.min_years_experience}+ years)" if self.min_years_experience else ""),
+            f"Domains: {', '.join(self.domains) or 'any'}",
+        ]
+        if self.responsibilities:
+            lines.append(f"Responsibilities: {'; '.join(self.responsibilities)}")
+        return "\n".join(lines)
+
+def matched_skills(skills, resume_skills, resume_text: str = ""):
+    """
+    The given skills the resume has: among its extracted skills, or found in its text through the skill
+    taxonomy's aliases (so "Express.js" needs "express.js"/"expressjs", not the word "express").
+    Skills the taxonomy doesn't know are matched as whole words, unless they are short enough to be
+    ordinary words or letters ("C", "Go").
+    """
+    matcher = get_matcher()
+    found = {canonical_skill(s) for s in resume_skills or []}
+    found.update(normalize_skill(s) for s in matcher.extract(resume_text or ""))
+    text = f" {normalize(resume_text or '')} "
+
+    def present(skill: str) -> bool:
+        key = canonical_skill(skill)
+        if key in found:
+            return True
+        if matcher.lookup(skill) is not None or len(key) <= AMBIGUOUS_SKILL_MAX_CHARS:
+            return False
+        return re.search(rf"(?<![\w+#.]){re.escape(key)}(?![\w+#]|\.\w)", text) is not None
+
+    return [skill for skill in skills if present(skill)]
+
+def skill_match_score(spec: JobSpec, resume_skills, resume_text: str = "") -> float:
+    """Deterministic 0-10 match: 70% share of required skills found, 30% share of optional skills found (see matched_skills)."""
+    if spec is None or spec.is_empty():
+        return 0.0
+    matched = set(matched_skills(spec.required_skills + spec.optional_skills, resume_skills, resume_text))
+
+    def share(skills) -> float:
+        return sum(s in matched for s in skills) / len(skills) if skills else 1.0
+
+    if not spec.required_skills:
+        return round(10 * share(spec.optional_skills), 2)
+    if not spec.optional_skills:
+        return round(10 * share(spec.required_skills), 2)
+    return round(10 * (0.7 * share(spec.required_skills) + 0.3 * share(spec.optional_skills)), 2)
+
+def load_spec(supabase, job_id: str):
+    """Stored spec for the job, or None if it hasn't been compiled (or was compiled by an older version)."""
+    try:
+        result = supabase.table("job_descriptions").select("requirement_spec").eq("job_id", job_id).execute()
+    except Exception as e:
+        print(f"⚠️ Could not read requirement spec for {job_id}: {e}")
+        return None
+    data = (result.data or [{}])[0].get("requirement_spec")
+    if not data or data.get("version") != SPEC_VERSION:
+        return None
+    return JobSpec.from_dict(data)
+
+def store_spec(supabase, job_id: str, spec: JobSpec) -> None:
+    try:
+        supabase.table("job_descriptions").update({"requirement_spec": spec.to_dict()}).eq("job_id", job_id).execute()
+    except Exception as e:
+        print(f"⚠️ Could not store requirement spec for {job_id}: {e}")
+
+def _unique(values):
+    """Non-empty strings, first occurrence wins (compared on the canonical skill name)."""
+    if isinstance(values, str):
+        values = re.split(r"[,;\n]", values)
+    seen = set()
+    items = []
+    for value in values or []:
+        value = str(value).strip()
+        key = canonical_skill(value)
+        if value and key not in seen:
+            seen.add(key)
+            items.append(value)
+    return items
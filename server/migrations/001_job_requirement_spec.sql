@@ -0,0 +1,4 @@
+-- Structured requirements compiled once per job from the free-text job description
+-- (process_resumes.compile_job_spec). Per-resume prompts use this instead of the full description.
+
+alter table job_descriptions add column if not exists requirement_spec jsonb;
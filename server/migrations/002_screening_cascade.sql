@@ -0,0 +1,6 @@
+-- Per-job two-tier screening settings and the resulting stats (screening_cascade.py).
+-- cascade_config: {"mode": "off" | "local" | "small", "reject_below": 0-10, "escalate_top": N}
+-- screening_stats: escalation rate, first-pass / large-model time, estimated time and token savings
+
+alter table job_descriptions add column if not exists cascade_config jsonb;
+alter table job_descriptions add column if not exists screening_stats jsonb;
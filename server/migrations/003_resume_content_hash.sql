@@ -0,0 +1,9 @@
+-- Content hashes of uploaded resumes (resume_dedup.py), filled in at ingestion.
+-- original_hash: SHA-256 of the file bytes; also names the storage object resumes/objects/{original_hash}{ext}
+-- text_hash: SHA-256 of the normalized extracted text, so a .pdf and a .docx of the same resume match
+-- /history looks up other jobs' uploads by either hash.
+
+alter table resume_uploads add column if not exists original_hash text;
+alter table resume_uploads add column if not exists text_hash text;
+create index if not exists resume_uploads_original_hash_idx on resume_uploads (original_hash);
+create index if not exists resume_uploads_text_hash_idx on resume_uploads (text_hash);
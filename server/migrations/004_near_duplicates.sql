@@ -0,0 +1,12 @@
+-- MinHash-LSH near-duplicate detection across jobs (near_duplicates.py).
+-- resume_uploads.minhash: 128-value MinHash signature of the resume's shingled, normalized text
+-- resume_lsh_bands: one row per (band key, upload); uploads sharing a band key are near-duplicate candidates
+
+alter table resume_uploads add column if not exists minhash jsonb;
+
+create table if not exists resume_lsh_bands (
+    band text not null,
+    resume_id uuid not null references resume_uploads (resume_id) on delete cascade,
+    job_id uuid not null,
+    primary key (band, resume_id)
+);
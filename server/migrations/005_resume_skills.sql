@@ -0,0 +1,11 @@
+-- Skills found in each upload by the local taxonomy matcher (skill_taxonomy.py, skill_taxonomy.json).
+-- One row per (upload, canonical skill), for filtering and faceting candidates without the LLM analysis.
+
+create table if not exists resume_skills (
+    resume_id uuid not null references resume_uploads (resume_id) on delete cascade,
+    job_id uuid not null,
+    skill text not null,
+    category text not null,
+    primary key (resume_id, skill)
+);
+create index if not exists resume_skills_job_skill_idx on resume_skills (job_id, skill);
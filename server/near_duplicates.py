@@ -0,0 +1,166 @@
+import hashlib
+import os
+import zlib
+import numpy as np
+
+from resume_dedup import normalize_text
+
+# 128 permutations in 16 bands of 8 rows: pairs above ~0.7 Jaccard share a band with high probability,
+# candidates are then confirmed against NEAR_DUPLICATE_THRESHOLD on the full signature
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))
+# Opt-in: reuse the scores of an earlier near-duplicate in the same job instead of analyzing again.
+# Only for near-verbatim copies: at 0.85 a resume can differ by a whole job entry.
+NEAR_DUPLICATE_REUSE = os.getenv("NEAR_DUPLICATE_REUSE", "false").lower() in ("1", "true", "yes")
+NEAR_DUPLICATE_REUSE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_REUSE_THRESHOLD", "0.97"))
+LOOKUP_CHUNK_SIZE = 100
+
+# Fixed seeds: signatures are stored in resume_uploads.minhash and must stay comparable across runs
+_rng = np.random.RandomState(1729)
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+def shingles(text: str):
+    """Overlapping SHINGLE_WORDS-word windows of the normalized text."""
+    words = normalize_text(text).split()
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def minhash(text: str):
+    """NUM_PERM-value MinHash signature (uint32 array), or None for text without words."""
+    items = shingles(text)
+    if not items:
+        return None
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in items), dtype=np.uint64, count=len(items))
+    # (a*x + b) mod p for every shingle and permutation at once; x < 2^32 and a < 2^31 keep it inside uint64
+    return (((x[:, None] * _A + _B) % _PRIME) & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(np.asarray(a, dtype=np.uint32) == np.asarray(b, dtype=np.uint32)))
+
+def band_keys(signature):
+    """One key per band; resumes sharing any key are near-duplicate candidates."""
+    signature = np.asarray(signature, dtype=np.uint32)
+    return [
+        f"{band}:{hashlib.blake2b(signature[band * ROWS : (band + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+class LSHIndex:
+    """In-memory MinHash LSH index: band buckets for candidates, full signatures to confirm them."""
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = {}
+        self.signatures = {}
+
+    def add(self, key, signature) -> None:
+        self.signatures[key] = signature
+        for band in band_keys(signature):
+            self.buckets.setdefault(band, []).append(key)
+
+    def query(self, signature):
+        """[(key, similarity)] of indexed entries at or above the threshold, most similar first."""
+        candidates = {key for band in band_keys(signature) for key in self.buckets.get(band, [])}
+        matches = [(key, similarity(signature, self.signatures[key])) for key in candidates]
+        return sorted((m for m in matches if m[1] >= self.threshold), key=lambda m: m[1], reverse=True)
+
+def reuses_analysis(resume) -> bool:
+    """Whether this resume takes its earlier near-duplicate's analysis (see cluster_resumes)."""
+    return (
+        NEAR_DUPLICATE_REUSE
+        and resume.get("near_duplicate_of") is not None
+        and (resume.get("similarity") or 0) >= NEAR_DUPLICATE_REUSE_THRESHOLD
+    )
+
+def cluster_resumes(resumes, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+    """
+    Group near-duplicates within one job, in order. Sets on every resume with a "minhash":
+    - "cluster": filename of the first resume of its similarity cluster (itself if it has no earlier match)
+    - "near_duplicate_of" / "similarity": the most similar earlier resume, if any reaches the threshold
+    Returns {cluster: [filenames]} for clusters with more than one resume.
+    """
+    index = LSHIndex(threshold)
+    cluster_of = {}
+    for position, resume in enumerate(resumes):
+        resume.setdefault("cluster", resume["filename"])
+        signature = resume.get("minhash")
+        if signature is None:
+            continue
+        matches = index.query(signature)
+        if matches:
+            best, score = matches[0]
+            resume["near_duplicate_of"] = resumes[best]["filename"]
+            resume["similarity"] = round(score, 3)
+            resume["cluster"] = cluster_of[best]
+        cluster_of[position] = resume["cluster"]
+        index.add(position, signature)
+
+    clusters = {}
+    for resume in resumes:
+        clusters.setdefault(resume["cluster"], []).append(resume["filename"])
+    return {cluster: members for cluster, members in clusters.items() if len(members) > 1}
+
+def find_history_matches(supabase, resumes, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+    """
+    Near-duplicates among earlier jobs' uploads, via the band keys in resume_lsh_bands.
+    Sets resume["history_matches"] = [{"resume_id", "job_id", "file_name", "similarity"}] on each resume.
+    """
+    keys = {}
+    for position, resume in enumerate(resumes):
+        resume["history_matches"] = []
+        if resume.get("minhash") is not None:
+            for band in band_keys(resume["minhash"]):
+                keys.setdefault(band, []).append(position)
+    if not keys:
+        return
+
+    try:
+        candidates = {}
+        bands = list(keys)
+        for i in range(0, len(bands), LOOKUP_CHUNK_SIZE):
+            rows = supabase.table("resume_lsh_bands").select("band, resume_id") \
+                .in_("band", bands[i : i + LOOKUP_CHUNK_SIZE]).execute().data or []
+            for row in rows:
+                for position in keys[row["band"]]:
+                    candidates.setdefault(row["resume_id"], set()).add(position)
+
+        resume_ids = list(candidates)
+        for i in range(0, len(resume_ids), LOOKUP_CHUNK_SIZE):
+            rows = supabase.table("resume_uploads").select("resume_id, job_id, file_name, minhash") \
+                .in_("resume_id", resume_ids[i : i + LOOKUP_CHUNK_SIZE]).execute().data or []
+            for row in rows:
+                if not row.get("minhash"):
+                    continue
+                for position in candidates[row["resume_id"]]:
+                    score = similarity(resumes[position]["minhash"], row["minhash"])
+                    if score >= threshold:
+                        resumes[position]["history_matches"].append({
+                            "resume_id": row["resume_id"],
+                            "job_id": row["job_id"],
+                            "file_name": row["file_name"],
+                            "similarity": round(score, 3)
+                        })
+    except Exception as e:
+        print(f"⚠️ Near-duplicate history lookup failed: {e}")
+
+def store_band_keys(supabase, job_id: str, signatures) -> None:
+    """Index this job's uploads for later jobs' lookups; signatures is [(resume_id, minhash)]."""
+    rows = [
+        {"band": band, "resume_id": resume_id, "job_id": job_id}
+        for resume_id, signature in signatures if signature is not None
+        for band in band_keys(signature)
+    ]
+    if not rows:
+        return
+    try:
+        supabase.table("resume_lsh_bands").upsert(rows, on_conflict="band,resume_id").execute()
+    except Exception as e:
+        print(f"⚠️ Could not store near-duplicate index for {job_id}: {e}")
@@ -3,13 +3,27 @@ import json
 import os
 import zipfile
 import time
+import importlib.util
 from pathlib import Path
 from pdfminer.high_level import extract_text
 import docx
 from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 from supabase import create_client
-from storage_utils import upload_resume_info_to_db 
+from storage_utils import job_uploads, upload_resume_info_to_db
+from resume_dedup import dedupe_resumes, file_hash, text_hash
+from near_duplicates import (
+    cluster_resumes, find_history_matches, minhash, reuses_analysis, store_band_keys
+)
+from resume_analysis import ANALYSIS_SCHEMA, ResumeAnalysis, parse_json_object
+from resume_condenser import ResumeCondenser
+from screening_cascade import (
+    CascadeConfig, CascadeStats, FAST_TIER, SMALL_MODEL_NAME, local_scores, select_escalations, fast_pass_analysis
+)
+from skill_taxonomy import extract_skills, store_resume_skills
+from search_index import SearchIndex
+from result_store import PROCESSED_DATA_FOLDER, ResultStore, apply_retention
+from job_spec import JobSpec, compile_prompt, load_spec, store_spec, skill_match_score
 
 # Force load the local .env file to fix connection/key errors
 env_path = Path(__file__).parent / '.env'
@@ -22,13 +36,52 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 # Use the correct, active model
 MODEL_NAME = os.getenv("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
 
-client = openai.OpenAI(api_key=GROQ_API_KEY, base_url="https://api.groq.com/openai/v1")
+# Retries are owned by the shared limiter below, not the SDK
+client = openai.OpenAI(api_key=GROQ_API_KEY, base_url="https://api.groq.com/openai/v1", max_retries=0)
+
+# Same rate limiter / retry policy as the student API (stdlib only, loaded by path so the
+# student package's modules don't shadow ours). Budgets are per process: this limiter does not see
+# the student API's calls, so size GROQ_* here for the share of the API key this pipeline may use.
+_spec = importlib.util.spec_from_file_location("rate_limiter", Path(__file__).parent / "student" / "core" / "rate_limiter.py")
+rate_limiter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rate_limiter)
+groq_limiter = rate_limiter.get_limiter(
+    "groq-chat",
+    requests_per_minute=float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+    tokens_per_minute=float(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000")),
+    max_retries=int(os.getenv("GROQ_MAX_RETRIES", "4")),
+    failure_threshold=int(os.getenv("GROQ_CIRCUIT_FAILURE_THRESHOLD", "5")),
+    reset_seconds=float(os.getenv("GROQ_CIRCUIT_RESET_SECONDS", "30")),
+    interactive_reserve=float(os.getenv("GROQ_INTERACTIVE_RESERVE", "0.3"))
+)
+
+def chat_completion(messages, max_tokens=1024, model=None, **kwargs):
+    """Groq chat completion within this process's budgets (backoff on 429/5xx honoring Retry-After, circuit breaker)."""
+    return groq_limiter.call(
+        client.chat.completions.create,
+        model=model or MODEL_NAME,
+        messages=messages,
+        max_tokens=max_tokens,
+        estimated_tokens=rate_limiter.estimate_tokens(messages, max_tokens),
+        # Batch class: screening never uses more than (1 - GROQ_INTERACTIVE_RESERVE) of this process's budget
+        priority=rate_limiter.BATCH,
+        **kwargs
+    )
+
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 embed_model = SentenceTransformer("all-MiniLM-L6-v2")
 
-PROCESSED_DATA_FOLDER = "processed_data"
+# Section-aware packing instead of resume_text[:2000]; budgets are measured with the embedding model's tokenizer
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "600"))
+condenser = ResumeCondenser(
+    count_tokens=lambda text: len(embed_model.tokenizer.encode(text, add_special_tokens=False)),
+    budget=RESUME_TOKEN_BUDGET
+)
+
 os.makedirs(PROCESSED_DATA_FOLDER, exist_ok=True)
 
+search_index = SearchIndex()
+
 def extract_zip(zip_path: str, extract_to: str):
     def _extract(zipfile_path, base_folder):
         with zipfile.ZipFile(zipfile_path, 'r') as zip_ref:
@@ -49,8 +102,10 @@ def extract_zip(zip_path: str, extract_to: str):
 
 def read_resumes(folder_path: str):
     resumes = []
-    for root, _, files in os.walk(folder_path):
-        for file in files:
+    # Sorted walk, so the copy kept when duplicates collapse doesn't depend on filesystem order
+    for root, dirs, files in os.walk(folder_path):
+        dirs.sort()
+        for file in sorted(files):
             if not file.lower().endswith((".pdf", ".docx")):
                 continue
 
@@ -71,7 +126,11 @@ def read_resumes(folder_path: str):
                     resumes.append({
                         "filename": os.path.basename(file),
                         "text": text,
-                        "path": path
+                        "path": path,
+                        "file_hash": file_hash(path),
+                        "text_hash": text_hash(text),
+                        "minhash": minhash(text),
+                        "skills": extract_skills(text)
                     })
                     print(f"✅ Loaded resume: {file}")
             except Exception as e:
@@ -84,86 +143,195 @@ def extract_candidate_name(resume_text):
     Extract only the full name of the candidate from this resume text. Just return the name string, nothing else.
 
     Resume:
-    {resume_text[:2000]}
+    {condenser.header(resume_text)}
     """
     try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        response = chat_completion([{"role": "user", "content": prompt}], max_tokens=50)
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"Name extraction failed: {e}")
         return "Unknown"
 
-def analyze_resume_mistral(resume_text: str, job_description: str):
-    prompt = f"""
-You are an AI that evaluates resumes based on job descriptions.
-Return your response in JSON only:
-
-{{
-  "Key Skills": [],
-  "Overall Analysis": "",
-  "Certifications & Courses": [],
-  "Relevant Projects": [],
-  "Soft Skills": [],
-  "Overall Match Score": 0-10,
-  "Projects Relevance Score": 0-10,
-  "Experience Relevance Score": 0-10,
-  "Certifications Relevance Score": 0-10
-}}
-
-### Job Description:
-{job_description}
-
-### Resume:
-{resume_text[:2000]}
+def compile_job_spec(job_id: str, job_description: str, job_title: str = None):
     """
-    for attempt in range(5):
-        try:
-            resp = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": "Return only JSON."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            content = resp.choices[0].message.content.strip()
-            content = content.replace("```json", "").replace("```", "")
-            
-            content = content.replace(",}", "}").replace(",]", "]")
-            if not content.startswith("{"):
-                content = "{" + content.split("{",1)[-1]
-            if not content.endswith("}"):
-                content = content.rsplit("}",1)[0] + "}"
-            return json.loads(content)
-        except Exception as e:
-            print(f"Attempt {attempt+1} error: {e}")
-            time.sleep(1.5)
-
-    print("⚠️ Returning default analysis after 5 retries.")
-    return {
-        "Key Skills": [], "Overall Analysis": "", "Certifications & Courses": [],
-        "Relevant Projects": [], "Soft Skills": [],
-        "Overall Match Score": 0, "Projects Relevance Score": 0, "Experience Relevance Score": 0,
-        "Certifications Relevance Score": 0
-    }
-
-def process_resumes_in_batches(resumes, job_description, weights, job_id, user_id, batch_size=5):
+    Turn the job description into a JobSpec once per job_id (stored in job_descriptions.requirement_spec).
+    Returns None if it can't be compiled; analysis then falls back to the raw description.
+    """
+    spec = load_spec(supabase, job_id)
+    if spec is not None:
+        return spec
+    try:
+        resp = chat_completion(
+            [
+                {"role": "system", "content": "Return only JSON."},
+                {"role": "user", "content": compile_prompt(job_title, job_description)}
+            ],
+            max_tokens=512,
+            response_format={"type": "json_object"}
+        )
+        data = parse_json_object(resp.choices[0].message.content)
+    except Exception as e:
+        data = parse_json_object(_failed_generation(e) or "")
+        if data is None:
+            print(f"⚠️ Job description compilation failed: {e}")
+    if not data:
+        return None
+    spec = JobSpec.from_dict(data)
+    if spec.is_empty():
+        return None
+    store_spec(supabase, job_id, spec)
+    print(f"🧩 Compiled job spec: {len(spec.required_skills)} required / {len(spec.optional_skills)} optional skills")
+    return spec
+
+def analyze_resume_mistral(resume_text: str, job_description: str, job_spec: JobSpec = None, model: str = None, stats: CascadeStats = None):
+    # Everything job-specific lives in the system message, identical for every resume of the job,
+    # so the provider can cache the prefix; only the resume differs between requests
+    requirements = job_spec.prompt_block() if job_spec is not None else job_description
+    system_prompt = f"""
+You are an AI that evaluates resumes against job requirements.
+Return only a JSON object matching this schema (scores are numbers from 0 to 10):
+
+{json.dumps(ANALYSIS_SCHEMA)}
+
+### Job Requirements:
+{requirements}
+"""
+    # JSON mode: one request, the output is repaired and validated locally instead of re-asking the model
+    started = time.perf_counter()
+    try:
+        resp = chat_completion(
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"### Resume:\n{condenser.condense(resume_text)}"}
+            ],
+            model=model,
+            response_format={"type": "json_object"}
+        )
+        content = resp.choices[0].message.content
+        if stats is not None and model is None:
+            stats.record_large(time.perf_counter() - started, getattr(resp.usage, "total_tokens", 0) or 0)
+    except Exception as e:
+        # Groq rejects invalid JSON-mode output with a 400 that still carries the generation
+        content = _failed_generation(e)
+        if content is None:
+            print(f"Analysis request failed: {e}")
+            return ResumeAnalysis.empty().to_dict()
+
+    data = parse_json_object(content)
+    if data is None:
+        print("⚠️ Could not parse analysis JSON, returning default analysis.")
+        return ResumeAnalysis.empty().to_dict()
+    analysis = ResumeAnalysis.from_dict(data).to_dict()
+    if job_spec is not None:
+        analysis["Skill Match Score"] = skill_match_score(job_spec, analysis["Key Skills"], resume_text)
+    return analysis
+
+def _failed_generation(error):
+    body = getattr(error, "body", None)
+    if isinstance(body, dict):
+        details = body.get("error", body)
+        if isinstance(details, dict) and details.get("failed_generation"):
+            return details["failed_generation"]
+    return None
+
+def first_pass(resumes, job_description, job_spec, cascade: CascadeConfig):
+    """Cascade tier 1 for every resume: returns (scores 0-10, analyses to keep for resumes that aren't escalated)."""
+    if cascade.mode == "small":
+        analyses = [
+            analyze_resume_mistral(r["text"], job_description, job_spec, model=SMALL_MODEL_NAME)
+            for r in resumes
+        ]
+        return [a.get("Overall Match Score", 0) for a in analyses], analyses
+
+    requirements = job_spec.prompt_block() if job_spec is not None else job_description
+    scores = local_scores(
+        embed_model,
+        requirements,
+        [condenser.condense(r["text"]) for r in resumes],
+        job_spec,
+        full_texts=[r["text"] for r in resumes]
+    )
+    return scores, [fast_pass_analysis(score, r["text"], job_spec) for score, r in zip(scores, resumes)]
+
+def process_resumes_in_batches(resumes, job_description, weights, job_id, user_id, batch_size=5, job_spec=None, cascade=None, stats=None, store=None):
     results = []
     resume_id_map = {}
+    store = store or ResultStore(job_id)
+    # Resumes finished before an interrupted run (re-run via POST /resume-job/{job_id}) are taken from the store as-is
+    completed = store.completed()
+    # A crash between the resume_uploads insert and store.append leaves a row the rerun must reuse, not duplicate
+    uploaded = job_uploads(job_id)
+    analyses_by_file = {}
+    signatures = []
+    resume_skills = []
+    cascade = cascade or CascadeConfig()
+    stats = stats or CascadeStats(cascade)
+    stats.resumes = len(resumes)
+
+    # Cascade: grade everything cheaply first, send only the ambiguous/top band to the large model
+    escalate = set(range(len(resumes)))
+    if cascade.enabled:
+        started = time.perf_counter()
+        fast_scores, fast_analyses = first_pass(resumes, job_description, job_spec, cascade)
+        stats.first_pass_seconds = time.perf_counter() - started
+        escalate = select_escalations(fast_scores, cascade)
+        print(f"⚡ First pass ({cascade.mode}) in {stats.first_pass_seconds:.1f}s: escalating {len(escalate)}/{len(resumes)} resumes")
+    # Near-verbatim copies take the analysis of their earlier version (see reuses_analysis)
+    escalate -= {index for index, r in enumerate(resumes) if reuses_analysis(r)}
+    stats.escalated = len(escalate)
 
     for i in range(0, len(resumes), batch_size):
         batch = resumes[i : i + batch_size]
 
-        for r in batch:
+        for index, r in enumerate(batch, start=i):
             clean_name = os.path.basename(r["filename"]).strip().lower()
-            print(f"🧾 Adding to results.json → '{clean_name}'")
+            done = completed.get(r["filename"])
+            if done:
+                print(f"⏭️ Already in result store: '{clean_name}'")
+                results.append({"filename": r["filename"], "analysis": done["analysis"]})
+                analyses_by_file.setdefault(r["filename"], done["analysis"])
+                if done.get("resume_id"):
+                    resume_id_map[clean_name] = done["resume_id"]
+                    # Band keys and skills are written once at the end of the run, so these need them too
+                    signatures.append((done["resume_id"], r["minhash"]))
+                    resume_skills.append((done["resume_id"], r["skills"]))
+                continue
+            print(f"🧾 Adding to result store → '{clean_name}'")
 
             candidate_name = extract_candidate_name(r["text"])
             print(f"🔎 Extracted name: {candidate_name}")
 
-            analysis = analyze_resume_mistral(r["text"], job_description)
+            reused = reuses_analysis(r) and r["near_duplicate_of"] in analyses_by_file
+            if reused:
+                # Near-verbatim copy of a resume already analyzed in this job: its scores, but this
+                # resume's own skills and skill match
+                analysis = dict(analyses_by_file[r["near_duplicate_of"]])
+                analysis["Key Skills"] = list(r["skills"])
+                analysis.pop("Skill Match Score", None)
+                print(f"♻️ Reusing analysis of {r['near_duplicate_of']} ({r['similarity']:.0%} similar)")
+            elif index in escalate or not cascade.enabled:
+                analysis = analyze_resume_mistral(r["text"], job_description, job_spec, stats=stats)
+            else:
+                analysis = fast_analyses[index]
+            if not analysis["Key Skills"]:
+                # Empty default from a failed/empty LLM analysis: fall back to the taxonomy matcher
+                analysis["Key Skills"] = list(r["skills"])
+            analysis["Extracted Skills"] = r["skills"]
+            if job_spec is not None and "Skill Match Score" not in analysis:
+                analysis["Skill Match Score"] = skill_match_score(job_spec, analysis["Key Skills"], r["text"])
+            if cascade.enabled:
+                # Same keys on every row (the CSV export takes its columns from the first row)
+                analysis["Fast Pass Score"] = fast_scores[index]
+                if reused:
+                    # A copy of a screened-out resume stays in the fast tier
+                    analysis["Screening Tier"] = FAST_TIER if analysis.get("Screening Tier") == FAST_TIER else "reused"
+                else:
+                    analysis["Screening Tier"] = "full" if index in escalate else FAST_TIER
+            analysis["Similarity Cluster"] = r.get("cluster", r["filename"])
+            analysis["Near Duplicate Of"] = r.get("near_duplicate_of")
+            analysis["Near Duplicate Similarity"] = r.get("similarity")
+            analysis["Analysis Reused"] = reused
+            analysis["Previous Versions"] = r.get("history_matches", [])
             
             final_score = (
                 analysis.get("Experience Relevance Score", 0) * weights.get("experience", 0)
@@ -173,29 +341,59 @@ def process_resumes_in_batches(resumes, job_description, weights, job_id, user_i
             
             analysis["Final Score"] = round(final_score, 2)
             results.append({"filename": r["filename"], "analysis": analysis})
+            analyses_by_file.setdefault(r["filename"], analysis)
 
-            resume_id = upload_resume_info_to_db(
-                r["filename"], r["path"], job_id, user_id, candidate_name
+            resume_id = uploaded.get(r["filename"]) or upload_resume_info_to_db(
+                r["filename"], r["path"], job_id, user_id, candidate_name,
+                file_hash=r["file_hash"], text_hash=r["text_hash"], minhash=r["minhash"]
             )
             if resume_id:
                 resume_id_map[clean_name] = resume_id
+                signatures.append((resume_id, r["minhash"]))
+                resume_skills.append((resume_id, r["skills"]))
                 print(f"🗂️ Stored resume_id for: {clean_name}")
             else:
                 print(f"❌ Skipped resume_id for: {r['filename']}")
+            # Written as soon as the resume is done: a crash loses at most the one in flight
+            store.append({"filename": r["filename"], "resume_id": resume_id, "analysis": analysis})
 
+        # Pacing comes from groq_limiter; no fixed sleep between batches
         print(f"✅ Processed batch {i // batch_size + 1}")
-        time.sleep(1.5)
 
+    store_band_keys(supabase, job_id, signatures)
+    store_resume_skills(supabase, job_id, resume_skills)
     return results, resume_id_map
 
+def store_screening_stats(job_id: str, summary: dict):
+    print(f"📊 Screening stats: {summary}")
+    try:
+        supabase.table("job_descriptions").update({"screening_stats": summary}).eq("job_id", job_id).execute()
+    except Exception as e:
+        print(f"⚠️ Could not store screening stats: {e}")
+
+def index_for_search(job_id: str, user_id: str, resumes, results, resume_id_map):
+    # results line up with resumes (process_resumes_in_batches keeps the order)
+    documents = []
+    for r, row in zip(resumes, results):
+        resume_id = resume_id_map.get(os.path.basename(r["filename"]).strip().lower())
+        if resume_id:
+            documents.append({"resume_id": resume_id, "filename": r["filename"], "text": r["text"], "analysis": row["analysis"]})
+    try:
+        print(f"🔍 Indexed {search_index.index_job(job_id, user_id, documents)} resumes for search")
+    except Exception as e:
+        print(f"⚠️ Search indexing failed: {e}")
+
 def process_all_resumes(
     zip_path: str,
     job_description: str,
     weightages: dict,
     resume_output_folder: str,
     job_id: str,
-    user_id: str
+    user_id: str,
+    cascade: dict = None
 ):
+    apply_retention()
+
     print("🚀 Extracting ZIP...")
     extract_zip(zip_path, resume_output_folder)
 
@@ -205,13 +403,37 @@ def process_all_resumes(
         print("❌ No resumes found.")
         return [], {}
 
-    print("🧠 Analyzing Resumes...")
-    results, resume_id_map = process_resumes_in_batches(resumes, job_description, weightages, job_id, user_id)
+    # Same resume twice in the ZIP (copies, .pdf + .docx, nested ZIPs): analyze and upload it once
+    resumes, duplicates = dedupe_resumes(resumes)
+    for d in duplicates:
+        print(f"♻️ Skipping {d['filename']}: same {d['match']} as {d['duplicate_of']}")
 
-    job_json_path = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_analysis.json")
-    with open(job_json_path, "w") as f:
-        json.dump(results, f, indent=4)
-    print(f"✅ Wrote local job analysis → {job_json_path}")
+    # Edited versions of the same resume: within this job and against earlier jobs' uploads
+    clusters = cluster_resumes(resumes)
+    find_history_matches(supabase, resumes)
+    for cluster, members in clusters.items():
+        print(f"🧬 Near-duplicate cluster {cluster}: {members}")
+
+    print("🧩 Compiling job description...")
+    job_spec = compile_job_spec(job_id, job_description)
+
+    print("🧠 Analyzing Resumes...")
+    cascade_config = CascadeConfig.from_dict(cascade)
+    stats = CascadeStats(cascade_config)
+    results, resume_id_map = process_resumes_in_batches(
+        resumes, job_description, weightages, job_id, user_id,
+        job_spec=job_spec, cascade=cascade_config, stats=stats
+    )
+    print(f"📈 Groq limiter: {groq_limiter.metrics()}")
+    store_screening_stats(job_id, {
+        **stats.summary(),
+        "duplicates": [{k: d[k] for k in ("filename", "duplicate_of", "match")} for d in duplicates],
+        "near_duplicate_clusters": clusters
+    })
+
+    print(f"✅ Job results in {ResultStore(job_id).path}")
+
+    index_for_search(job_id, user_id, resumes, results, resume_id_map)
 
     try:
         content = json.dumps(results).encode("utf-8")
@@ -1,11 +1,10 @@
 # File: rank_candidates.py
 import os
-import json
-import pandas as pd
 from pathlib import Path
-from sklearn.preprocessing import MinMaxScaler
 from supabase import create_client
 from dotenv import load_dotenv
+from result_store import ResultStore
+from screening_cascade import FAST_TIER
 
 # --- FIX: Force load the local .env file ---
 env_path = Path(__file__).parent / '.env'
@@ -18,54 +17,69 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-PROCESSED_DATA_FOLDER = "processed_data"
 DEFAULT_STATUS = "unreviewed"
+RANK_WRITE_BATCH = 500
 
 def compute_relative_ranking(job_id: str) -> None:
-    in_path = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_analysis.json")
-    if not os.path.exists(in_path):
-        print(f"❌ analysis file not found: {in_path}")
+    store = ResultStore(job_id)
+    if not store.exists():
+        print(f"❌ result store not found: {store.path}")
         return
 
-    with open(in_path) as f:
-        raw = json.load(f)
-    if not raw:
-        print("❌ analysis JSON is empty.")
+    # Pass 1 keeps only scores and clusters; the analyses stay on disk
+    scores = {}
+    clusters = {}
+    fast = set()
+    for row in store.records():
+        analysis = row["analysis"]
+        if analysis.get("Screening Tier") == FAST_TIER:
+            # Not graded by the large model: ordered by the first-pass score, after every escalated resume
+            fast.add(row["filename"])
+            scores[row["filename"]] = analysis.get("Fast Pass Score", 0.0) or 0.0
+        else:
+            scores[row["filename"]] = analysis.get("Final Score", 0.0) or 0.0
+        clusters[row["filename"]] = analysis.get("Similarity Cluster") or row["filename"]
+    if not scores:
+        print("❌ result store is empty.")
         return
 
-    scores = [
-        row["analysis"].get("Final Score", 0.0) or 0.0 for row in raw
-    ]
-    if not scores or all(s == 0 for s in scores):
-        normed = [[0.0] for _ in scores]
-    else:
-        scaler = MinMaxScaler()
-        normed = scaler.fit_transform([[s] for s in scores])
-
-    for idx, row in enumerate(raw):
-        pct = round(float(normed[idx][0]) * 100, 2)
-        row["analysis"]["Relative Ranking Score"] = pct
-
-    ranked = sorted(
-        raw,
-        key=lambda r: r["analysis"]["Relative Ranking Score"],
-        reverse=True,
+    # Min-max to 0-100 over the escalated resumes (all-equal scores rank at 0); fast-tier resumes score 0
+    graded = [score for filename, score in scores.items() if filename not in fast] or [0.0]
+    low, high = min(graded), max(graded)
+    relative = {
+        filename: round((score - low) / (high - low) * 100, 2) if high > low and filename not in fast else 0.0
+        for filename, score in scores.items()
+    }
+    ranked = sorted(scores, key=lambda filename: (filename in fast, -relative[filename], -scores[filename]))
+
+    # Near-duplicate clusters (near_duplicates.cluster_resumes): size and best rank of each row's cluster
+    cluster_ranks = {}
+    for rank, filename in enumerate(ranked, start=1):
+        cluster_ranks.setdefault(clusters[filename], []).append(rank)
+    ranks = {filename: rank for rank, filename in enumerate(ranked, start=1)}
+
+    # Pass 2 appends the ranked version of every record, then compaction drops the unranked ones
+    batch = []
+    for row in store.records():
+        filename = row["filename"]
+        row["analysis"]["Relative Ranking Score"] = relative[filename]
+        row["analysis"]["Cluster Size"] = len(cluster_ranks[clusters[filename]])
+        row["analysis"]["Cluster Best Rank"] = cluster_ranks[clusters[filename]][0]
+        row["rank"] = ranks[filename]
+        batch.append(row)
+        if len(batch) >= RANK_WRITE_BATCH:
+            store.extend(batch)
+            batch = []
+    store.extend(batch)
+    store.compact(force=True)
+
+    print(f"✅ Ranked {len(ranked)} candidates in {store.path}")
+
+    _upsert_rankings(
+        [{"filename": filename, "analysis": {"Relative Ranking Score": relative[filename]}} for filename in ranked],
+        job_id
     )
 
-    out_json = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_ranked.json")
-    out_csv  = os.path.join(PROCESSED_DATA_FOLDER, f"{job_id}_ranked.csv")
-
-    with open(out_json, "w") as f:
-        json.dump(ranked, f, indent=4)
-
-    pd.DataFrame(
-        [{"filename": r["filename"], **r["analysis"]} for r in ranked]
-    ).to_csv(out_csv, index=False)
-
-    print(f"✅ Ranked output saved:\n   • {out_json}\n   • {out_csv}")
-
-    _upsert_rankings(ranked, job_id)
-
 def _upsert_rankings(ranked_list: list, job_id: str) -> None:
     records = []
     for idx, cand in enumerate(ranked_list, start=1):
@@ -0,0 +1,153 @@
+import json
+
+from resume_analysis import LIST_FIELDS, SCORE_FIELDS
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+EXPORT_BATCH_ROWS = 1000
+BASE_COLUMNS = ("filename", "resume_id", "rank")
+
+def _known_types(pa) -> dict:
+    """Arrow types of the columns we know; any other analysis key is exported as a string."""
+    previous_version = pa.struct([
+        ("resume_id", pa.string()), ("job_id", pa.string()), ("file_name", pa.string()), ("similarity", pa.float64())
+    ])
+    return {
+        "filename": pa.string(),
+        "resume_id": pa.string(),
+        "rank": pa.int32(),
+        **{key: pa.list_(pa.string()) for key in LIST_FIELDS.values()},
+        "Extracted Skills": pa.list_(pa.string()),
+        "Overall Analysis": pa.string(),
+        **{key: pa.float64() for key in SCORE_FIELDS.values()},
+        **{key: pa.float64() for key in (
+            "Final Score", "Relative Ranking Score", "Skill Match Score", "Fast Pass Score", "Near Duplicate Similarity"
+        )},
+        "Screening Tier": pa.string(),
+        "Similarity Cluster": pa.string(),
+        "Near Duplicate Of": pa.string(),
+        "Analysis Reused": pa.bool_(),
+        "Cluster Size": pa.int32(),
+        "Cluster Best Rank": pa.int32(),
+        "Previous Versions": pa.list_(previous_version),
+    }
+
+def flatten(record: dict) -> dict:
+    """Store record -> one export row: filename, resume_id, rank, then the analysis keys."""
+    return {
+        "filename": record.get("filename"),
+        "resume_id": record.get("resume_id"),
+        "rank": record.get("rank"),
+        **(record.get("analysis") or {})
+    }
+
+def available_columns(store):
+    """Every column the job's records have, in first-seen order (one streaming pass)."""
+    columns = dict.fromkeys(BASE_COLUMNS)
+    for record in store.records():
+        columns.update(dict.fromkeys(record.get("analysis") or {}))
+    return list(columns)
+
+def project_columns(store, requested=None):
+    """Requested columns in the requested order; ValueError names any the job doesn't have."""
+    columns = available_columns(store)
+    if not requested:
+        return columns
+    unknown = [c for c in requested if c not in columns]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+def _coerce(value, arrow_type, pa):
+    if value is None:
+        return None
+    if pa.types.is_floating(arrow_type) or pa.types.is_integer(arrow_type):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return int(number) if pa.types.is_integer(arrow_type) else number
+    if pa.types.is_boolean(arrow_type):
+        return bool(value)
+    if pa.types.is_list(arrow_type):
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        if pa.types.is_string(arrow_type.value_type):
+            return [str(v) for v in value if v is not None]
+        return [v for v in value if isinstance(v, dict)]
+    if pa.types.is_string(arrow_type):
+        return value if isinstance(value, str) else json.dumps(value)
+    return value
+
+class _ChunkSink:
+    """Write-only file object for pyarrow writers; chunks are drained after every batch for streaming."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_columnar(store, fmt: str, columns):
+    """
+    Parquet or Arrow IPC stream bytes of the job's ranked records, built batch by batch straight from the
+    result store (no DataFrame). Lists stay list<string>, Previous Versions a list of structs.
+    Raises ImportError when pyarrow isn't installed.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    known = _known_types(pa)
+    schema = pa.schema([(name, known.get(name, pa.string())) for name in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd") if fmt == "parquet" \
+        else pa.ipc.new_stream(sink, schema)
+
+    def to_batch(rows):
+        arrays = [
+            pa.array([_coerce(row.get(field.name), field.type, pa) for row in rows], type=field.type)
+            for field in schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def generate():
+        try:
+            rows = []
+            for record in store.records(ranked=True):
+                rows.append(flatten(record))
+                if len(rows) >= EXPORT_BATCH_ROWS:
+                    writer.write_batch(to_batch(rows))
+                    rows = []
+                    yield sink.drain()
+            if rows:
+                writer.write_batch(to_batch(rows))
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    return generate()
@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from skill_taxonomy import canonical_skill
+
+# Sortable / filterable score columns, as named in resume_rankings and resume_analysis
+SCORE_COLUMNS = ("total_score", "rank", "overall_match_score", "experience_relevance_score", "projects_relevance_score")
+RESULT_INDEX_MAX_JOBS = int(os.getenv("RESULT_INDEX_MAX_JOBS", "32"))
+# Status changes made straight through Supabase (the dashboard does) are picked up after this long
+RESULT_INDEX_TTL_SECONDS = float(os.getenv("RESULT_INDEX_TTL_SECONDS", "60"))
+ID_CHUNK_SIZE = 150
+# PostgREST returns at most max-rows rows per request (1000 by default), so job-wide reads are paged
+PAGE_SIZE = 1000
+
+# Set bits per byte value, for popcounts over packed bitsets
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+class JobResultIndex:
+    """
+    One job's screening results in columnar form: float32 arrays per score column, and packed bitsets
+    (one bit per candidate) per skill and per status. Filters AND the bitsets, top-K partitions the
+    sort column, facets are popcounts of each skill bitset against the filter bitset.
+    """
+
+    def __init__(self, job_id: str, rows, owner_id: str = None):
+        self.job_id = job_id
+        self.owner_id = owner_id
+        self.loaded_at = time.monotonic()
+        self.rows = rows
+        self.size = len(rows)
+        self.positions = {row["resume_id"]: i for i, row in enumerate(rows)}
+        self.columns = {
+            name: np.array([float(row.get(name) or 0) for row in rows], dtype=np.float32)
+            for name in SCORE_COLUMNS
+        }
+
+        self.skill_names = {}
+        members = {}
+        for i, row in enumerate(rows):
+            for skill in row.get("skills") or []:
+                key = canonical_skill(skill)
+                self.skill_names.setdefault(key, skill)
+                members.setdefault(key, []).append(i)
+        self.skill_keys = list(members)
+        self.skill_rows = {key: i for i, key in enumerate(self.skill_keys)}
+        self.skill_bits = np.stack([self._bits(members[key]) for key in self.skill_keys]) if members \
+            else np.zeros((0, self._bytes()), dtype=np.uint8)
+
+        self.status_bits = {}
+        for i, row in enumerate(rows):
+            self.status_bits.setdefault(row.get("status") or "unreviewed", []).append(i)
+        self.status_bits = {status: self._bits(positions) for status, positions in self.status_bits.items()}
+
+    def _bytes(self) -> int:
+        return (self.size + 7) // 8
+
+    def _bits(self, positions) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return np.packbits(mask)
+
+    def set_status(self, resume_id: str, status: str) -> bool:
+        """Apply a status change in place; False if the resume isn't in this job."""
+        position = self.positions.get(resume_id)
+        if position is None:
+            return False
+        byte, bit = divmod(position, 8)
+        flag = np.uint8(0x80 >> bit)
+        for bits in self.status_bits.values():
+            bits[byte] &= ~flag
+        self.status_bits.setdefault(status, np.zeros(self._bytes(), dtype=np.uint8))[byte] |= flag
+        self.rows[position]["status"] = status
+        return True
+
+    def query(self, skills=None, statuses=None, score_field: str = "total_score", min_score: float = None,
+              max_score: float = None, sort: str = "total_score", descending: bool = True,
+              limit: int = 20, offset: int = 0, facet_limit: int = 20) -> dict:
+        started = time.perf_counter()
+        mask_bits = np.full(self._bytes(), 0xFF, dtype=np.uint8)
+        for skill in skills or []:
+            row = self.skill_rows.get(canonical_skill(skill))
+            if row is None:
+                mask_bits[:] = 0
+                break
+            mask_bits &= self.skill_bits[row]
+        if statuses:
+            status_mask = np.zeros_like(mask_bits)
+            for status in statuses:
+                if status in self.status_bits:
+                    status_mask |= self.status_bits[status]
+            mask_bits &= status_mask
+
+        mask = np.unpackbits(mask_bits, count=self.size).astype(bool)
+        if min_score is not None:
+            mask &= self.columns[score_field] >= min_score
+        if max_score is not None:
+            mask &= self.columns[score_field] <= max_score
+        matched = np.flatnonzero(mask)
+
+        # Top (offset + limit) by partition, then sort only those
+        k = min(offset + limit, len(matched))
+        values = self.columns[sort][matched]
+        keys = -values if descending else values
+        if 0 < k < len(matched):
+            part = np.argpartition(keys, k - 1)[:k]
+            order = part[np.argsort(keys[part], kind="stable")]
+        else:
+            order = np.argsort(keys, kind="stable")[:k]
+        page = matched[order][offset:]
+
+        # Facets over the whole filtered set, not just the page
+        filtered_bits = np.packbits(mask)
+        skill_counts = _POPCOUNT[self.skill_bits & filtered_bits].sum(axis=1) if len(self.skill_keys) else np.zeros(0)
+        top_skills = np.argsort(-skill_counts, kind="stable")[:facet_limit]
+        return {
+            "job_id": self.job_id,
+            "total": int(len(matched)),
+            "results": [self.rows[i] for i in page],
+            "facets": {
+                "skills": {self.skill_names[self.skill_keys[i]]: int(skill_counts[i]) for i in top_skills if skill_counts[i]},
+                "status": {
+                    status: int(_POPCOUNT[bits & filtered_bits].sum()) for status, bits in self.status_bits.items()
+                }
+            },
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+def _select_pages(query, order):
+    """Every row of query(), read in range() pages of PAGE_SIZE ordered by order (a unique key)."""
+    rows = []
+    offset = 0
+    while True:
+        q = query()
+        for key in order:
+            q = q.order(key)
+        page = q.range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+def load_job_owner(supabase, job_id: str):
+    """The recruiter who uploaded the job (job_descriptions.user_id), or None."""
+    job = supabase.table("job_descriptions").select("user_id").eq("job_id", job_id).limit(1).execute()
+    return job.data[0].get("user_id") if job.data else None
+
+def load_job_rows(supabase, job_id: str):
+    """Rankings + analysis scores + file info + skills of one job: job-wide tables paged, the rest chunked by resume_id."""
+    rankings = _select_pages(
+        lambda: supabase.table("resume_rankings").select("resume_id, rank, total_score, status, candidate_name")
+        .eq("job_id", job_id),
+        order=("rank", "resume_id")
+    )
+    ids = [r["resume_id"] for r in rankings]
+    analyses, uploads = {}, {}
+    for i in range(0, len(ids), ID_CHUNK_SIZE):
+        chunk = ids[i : i + ID_CHUNK_SIZE]
+        for a in supabase.table("resume_analysis").select(
+            "resume_id, key_skills, overall_match_score, experience_relevance_score, projects_relevance_score"
+        ).in_("resume_id", chunk).execute().data or []:
+            analyses[a["resume_id"]] = a
+        for u in supabase.table("resume_uploads").select("resume_id, file_name, file_path").in_("resume_id", chunk).execute().data or []:
+            uploads[u["resume_id"]] = u
+
+    # Taxonomy skills from ingestion (resume_skills), else the LLM's key_skills
+    extracted = {}
+    try:
+        skills = _select_pages(
+            lambda: supabase.table("resume_skills").select("resume_id, skill").eq("job_id", job_id),
+            order=("resume_id", "skill")
+        )
+        for s in skills:
+            extracted.setdefault(s["resume_id"], []).append(s["skill"])
+    except Exception as e:
+        print(f"⚠️ resume_skills lookup failed: {e}")
+
+    rows = []
+    for r in rankings:
+        analysis = analyses.get(r["resume_id"], {})
+        upload = uploads.get(r["resume_id"], {})
+        key_skills = analysis.get("key_skills") or []
+        if isinstance(key_skills, str):
+            key_skills = [s.strip() for s in key_skills.split(",") if s.strip()]
+        rows.append({
+            "resume_id": r["resume_id"],
+            "candidate_name": r.get("candidate_name"),
+            "file_name": upload.get("file_name"),
+            "file_path": upload.get("file_path"),
+            "rank": r.get("rank"),
+            "total_score": r.get("total_score"),
+            "status": r.get("status") or "unreviewed",
+            "overall_match_score": analysis.get("overall_match_score"),
+            "experience_relevance_score": analysis.get("experience_relevance_score"),
+            "projects_relevance_score": analysis.get("projects_relevance_score"),
+            "skills": extracted.get(r["resume_id"]) or key_skills
+        })
+    return rows
+
+class ResultIndexCache:
+    """LRU of JobResultIndex by job_id; entries older than ttl_seconds are reloaded on next use."""
+
+    def __init__(self, max_jobs: int = RESULT_INDEX_MAX_JOBS, ttl_seconds: float = RESULT_INDEX_TTL_SECONDS):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, supabase, job_id: str, refresh: bool = False) -> JobResultIndex:
+        with self._lock:
+            index = self._entries.get(job_id)
+            if index is not None and not refresh and time.monotonic() - index.loaded_at < self.ttl_seconds:
+                self._entries.move_to_end(job_id)
+                return index
+        # Load outside the lock so one slow job doesn't block queries on cached ones
+        index = JobResultIndex(job_id, load_job_rows(supabase, job_id), owner_id=load_job_owner(supabase, job_id))
+        with self._lock:
+            self._entries[job_id] = index
+            self._entries.move_to_end(job_id)
+            while len(self._entries) > self.max_jobs:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, job_id: str) -> None:
+        with self._lock:
+            self._entries.pop(job_id, None)
+
+    def set_status(self, job_id: str, resume_id: str, status: str) -> None:
+        with self._lock:
+            index = self._entries.get(job_id)
+            if index is not None:
+                index.set_status(resume_id, status)
+
+result_cache = ResultIndexCache()
@@ -0,0 +1,162 @@
+import json
+import os
+import time
+
+PROCESSED_DATA_FOLDER = "processed_data"
+# Opt-in: store files (and legacy *_analysis.json / *_ranked.* artifacts) untouched for this long are deleted; 0 keeps them
+RESULT_STORE_RETENTION_DAYS = float(os.getenv("RESULT_STORE_RETENTION_DAYS", "0"))
+STORE_SUFFIX = ".results.jsonl"
+LEGACY_SUFFIXES = ("_analysis.json", "_ranked.json", "_ranked_candidates.json", "_ranked.csv")
+
+class ResultStore:
+    """
+    Append-only per-job result log: one compact JSON line per record, {"filename", "resume_id", "analysis", "rank"?}.
+    The latest line for a filename wins. Every append is flushed and fsynced, so a crash loses at most the
+    resume in flight; a torn last line is ignored on read. Readers stream the file, keeping only byte offsets.
+    """
+
+    def __init__(self, job_id: str, folder: str = PROCESSED_DATA_FOLDER):
+        self.job_id = job_id
+        self.folder = folder
+        self.path = os.path.join(folder, f"{job_id}{STORE_SUFFIX}")
+        self._tail_checked = False
+        os.makedirs(folder, exist_ok=True)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def import_legacy(self) -> bool:
+        """
+        Build the store of a job screened before it existed, from its ranked file ({job_id}_ranked.json or
+        _ranked_candidates.json) or else {job_id}_analysis.json. The legacy file is left in place.
+        False if there is none.
+        """
+        for suffix, ranked in (("_ranked.json", True), ("_ranked_candidates.json", True), ("_analysis.json", False)):
+            path = os.path.join(self.folder, f"{self.job_id}{suffix}")
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                rows = [r for r in json.load(f) if r.get("filename") and r.get("analysis")]
+            self.extend(
+                {"filename": r["filename"], "analysis": r["analysis"], **({"rank": rank} if ranked else {})}
+                for rank, r in enumerate(rows, start=1)
+            )
+            print(f"📥 Imported {len(rows)} records from {path} into {self.path}")
+            return True
+        return False
+
+    def append(self, record: dict) -> None:
+        self.extend([record])
+
+    def extend(self, records) -> None:
+        """Append several records with one fsync (ranking rewrites a whole job)."""
+        if not self._tail_checked:
+            self._truncate_torn_tail()
+            self._tail_checked = True
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate_torn_tail(self) -> None:
+        # A crash mid-append leaves a line without its newline; cut it so the next record starts on a fresh line
+        if not self.exists() or not os.path.getsize(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            # Walk back to the last newline; only the torn record is read
+            end = f.tell()
+            keep = 0
+            while end > 0:
+                start = max(0, end - 65536)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    keep = start + newline + 1
+                    break
+                end = start
+            f.truncate(keep)
+            print(f"⚠️ Dropped a torn record at the end of {self.path}")
+
+    def _scan(self):
+        """Yield (offset, record) for every complete line, in file order."""
+        if not self.exists():
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if not line.endswith(b"\n"):
+                    # Torn write from a crash mid-append
+                    break
+                try:
+                    yield start, json.loads(line)
+                except ValueError:
+                    continue
+
+    def _latest_offsets(self):
+        """{filename: (offset, rank)} of the latest record per filename, plus the total line count."""
+        latest = {}
+        lines = 0
+        for offset, record in self._scan():
+            lines += 1
+            latest[record["filename"]] = (offset, record.get("rank"))
+        return latest, lines
+
+    def _read_at(self, f, offset: int) -> dict:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+    def records(self, ranked: bool = False):
+        """Latest record per filename, streamed: in first-write order, or by rank when ranked=True."""
+        latest, _ = self._latest_offsets()
+        entries = sorted(latest.values(), key=lambda e: (e[1] is None, e[1] or 0, e[0])) if ranked \
+            else sorted(latest.values())
+        if not entries:
+            return
+        with open(self.path, "rb") as f:
+            for offset, _ in entries:
+                yield self._read_at(f, offset)
+
+    def completed(self) -> dict:
+        """{filename: latest record}, for resuming an interrupted run (POST /resume-job/{job_id})."""
+        return {record["filename"]: record for record in self.records()}
+
+    def compact(self, force: bool = False) -> bool:
+        """Rewrite the log with only the latest record per filename (when at least half of it is stale, or forced)."""
+        latest, lines = self._latest_offsets()
+        if not lines or (not force and lines < 2 * len(latest)):
+            return False
+        tmp = self.path + ".tmp"
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            for offset, _ in sorted(latest.values()):
+                src.seek(offset)
+                dst.write(src.readline())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp, self.path)
+        print(f"🗜️ Compacted {self.path}: {lines} → {len(latest)} lines")
+        return True
+
+def apply_retention(folder: str = PROCESSED_DATA_FOLDER, max_age_days: float = RESULT_STORE_RETENTION_DAYS) -> int:
+    """Delete per-job result files not modified within max_age_days. Returns how many were removed."""
+    if max_age_days <= 0 or not os.path.isdir(folder):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for name in os.listdir(folder):
+        if not name.endswith((STORE_SUFFIX, *LEGACY_SUFFIXES)):
+            continue
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            print(f"⚠️ Retention could not remove {path}: {e}")
+    if removed:
+        print(f"🧹 Removed {removed} result files older than {max_age_days:g} days from {folder}")
+    return removed
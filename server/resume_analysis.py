@@ -0,0 +1,191 @@
+import json
+import re
+
+# Keys of the per-resume analysis JSON, as stored in the job's result store (result_store.py) and read by upload_analysis_to_db
+LIST_FIELDS = {
+    "key_skills": "Key Skills",
+    "certifications_courses": "Certifications & Courses",
+    "relevant_projects": "Relevant Projects",
+    "soft_skills": "Soft Skills",
+}
+SCORE_FIELDS = {
+    "overall_match_score": "Overall Match Score",
+    "projects_relevance_score": "Projects Relevance Score",
+    "experience_relevance_score": "Experience Relevance Score",
+    "certifications_relevance_score": "Certifications Relevance Score",
+}
+
+# JSON schema sent with the request (JSON mode guarantees syntax, the schema tells the model the shape)
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{key: {"type": "array", "items": {"type": "string"}} for key in LIST_FIELDS.values()},
+        "Overall Analysis": {"type": "string"},
+        **{key: {"type": "number", "minimum": 0, "maximum": 10} for key in SCORE_FIELDS.values()},
+    },
+    "required": [*LIST_FIELDS.values(), "Overall Analysis", *SCORE_FIELDS.values()],
+}
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+def repair_json(text: str) -> str:
+    """
+    Single pass over the model output that fixes the defects we see in practice:
+    code fences, prose around the object, trailing commas, Python literals (True/None),
+    single-quoted strings and raw control characters (newlines, tabs) inside strings.
+    Output truncated mid-object is cut back to the last complete element and its brackets are closed.
+    """
+    text = _FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object in model output")
+
+    out = []
+    stack = []
+    # (length of out, open brackets) after every ',' / '{' / '[' outside strings: places to cut a truncated output
+    cut_points = []
+    quote = None
+    escaped = False
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+                if ch == "'":
+                    # \' is not a JSON escape; the quote needs none inside a double-quoted string
+                    out[-1] = ch
+                else:
+                    out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch == quote:
+                quote = None
+                out.append('"')
+            elif ch == '"':
+                # Double quote inside a single-quoted string
+                out.append('\\"')
+            elif ch < " ":
+                # Raw control characters (newlines, tabs...) are invalid inside JSON strings
+                out.append(_CONTROL_ESCAPES.get(ch) or f"\\u{ord(ch):04x}")
+            else:
+                out.append(ch)
+        elif ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            cut_points.append((len(out), tuple(stack)))
+        elif ch in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                return "".join(out)
+        elif ch == ",":
+            cut_points.append((len(out), tuple(stack)))
+            out.append(ch)
+        elif ch.isalpha():
+            word = re.match(r"[A-Za-z]+", text[i:]).group(0)
+            out.append(_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # Truncated: close as-is if that parses, else cut back to the latest point that does.
+    # A string cut off mid-way is dropped rather than kept as a partial value.
+    candidates = cut_points[::-1] if quote else [(len(out), tuple(stack))] + cut_points[::-1]
+    for length, open_brackets in candidates:
+        head = out[:length]
+        _strip_trailing_comma(head)
+        repaired = "".join(head) + "".join(reversed(open_brackets))
+        try:
+            json.loads(repaired)
+            return repaired
+        except ValueError:
+            continue
+    raise ValueError("Could not repair model output")
+
+def _strip_trailing_comma(out):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+def parse_json_object(text: str):
+    """Parse a JSON object from model output, repairing it locally if needed. Returns None if it can't be parsed."""
+    try:
+        # strict=False accepts raw control characters inside strings
+        value = json.loads(text, strict=False)
+    except (TypeError, ValueError):
+        try:
+            value = json.loads(repair_json(text or ""))
+        except ValueError:
+            return None
+    return value if isinstance(value, dict) else None
+
+class ResumeAnalysis:
+    """Validated per-resume analysis. Missing or malformed fields fall back to empty lists / 0 scores."""
+
+    __slots__ = (*LIST_FIELDS, "overall_analysis", *SCORE_FIELDS)
+
+    def __init__(self, **fields):
+        for name in LIST_FIELDS:
+            setattr(self, name, fields.get(name) or [])
+        self.overall_analysis = fields.get("overall_analysis") or ""
+        for name in SCORE_FIELDS:
+            setattr(self, name, fields.get(name) or 0)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResumeAnalysis":
+        fields = {name: _as_string_list(data.get(key)) for name, key in LIST_FIELDS.items()}
+        fields["overall_analysis"] = str(data.get("Overall Analysis") or "").strip()
+        fields.update({name: _as_score(data.get(key)) for name, key in SCORE_FIELDS.items()})
+        return cls(**fields)
+
+    @classmethod
+    def empty(cls) -> "ResumeAnalysis":
+        return cls()
+
+    def to_dict(self) -> dict:
+        data = {key: list(getattr(self, name)) for name, key in LIST_FIELDS.items()}
+        data["Overall Analysis"] = self.overall_analysis
+        data.update({key: getattr(self, name) for name, key in SCORE_FIELDS.items()})
+        return data
+
+def _as_string_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        # "Python, SQL; Docker" -> ["Python", "SQL", "Docker"]
+        return [item.strip() for item in re.split(r"[,;\n]", value) if item.strip()]
+    if isinstance(value, (list, tuple)):
+        items = []
+        for item in value:
+            if isinstance(item, dict):
+                # {"name": "...", "description": "..."} style entries
+                item = item.get("name") or item.get("title") or next(iter(item.values()), "")
+            if item is not None and str(item).strip():
+                items.append(str(item).strip())
+        return items
+    return [str(value)]
+
+def _as_score(value):
+    """Clamp to 0-10; accepts numbers, numeric strings and "7/10"."""
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, str):
+        match = re.search(r"-?\d+(?:\.\d+)?", value)
+        value = float(match.group(0)) if match else 0
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return 0
+    score = max(0.0, min(10.0, score))
+    return int(score) if score.is_integer() else score
@@ -0,0 +1,188 @@
+import re
+from collections import Counter
+
+# Canonical sections, in the order they are written out; the packing priority is separate
+SECTION_ORDER = ("summary", "skills", "experience", "projects", "certifications", "education", "other")
+ANALYSIS_PRIORITY = ("skills", "experience", "projects", "certifications", "summary", "education", "other")
+
+SECTION_HEADINGS = {
+    "summary": r"summary|professional summary|profile|career objective|objective|about me|about",
+    "skills": r"skills|technical skills|key skills|core competencies|competencies|technologies|tech stack|tools",
+    "experience": r"experience|work experience|professional experience|employment|employment history|work history|internships?",
+    "projects": r"projects|academic projects|personal projects|key projects",
+    "certifications": r"certifications?|certificates|licenses|courses|trainings?|certifications? (?:and|&) courses",
+    "education": r"education|academic background|qualifications|academics",
+    "other": r"achievements|awards|honou?rs|publications|extra ?curricular activities|activities|volunteering|languages",
+}
+# Sections that carry nothing for screening; their lines are dropped entirely
+DROPPED_HEADINGS = r"references|declaration|hobbies|interests|personal details|personal information"
+
+_HEADING_RE = {
+    section: re.compile(rf"^(?:{pattern})$", re.IGNORECASE) for section, pattern in SECTION_HEADINGS.items()
+}
+_DROPPED_RE = re.compile(rf"^(?:{DROPPED_HEADINGS})$", re.IGNORECASE)
+_BOILERPLATE_RE = re.compile(
+    r"^(?:page \d+(?: of \d+)?|\d{1,3}|references? (?:are )?available(?: upon| on)? request\.?|curriculum vitae|resume|cv)$"
+    r"|i hereby declare",
+    re.IGNORECASE
+)
+_INLINE_HEADING_RE = re.compile(r"^([A-Za-z &]{3,40}?)\s*:\s*(.+)$")
+_CONTACT_RE = re.compile(r"@|https?://|www\.|linkedin|github|\+?\d[\d\s\-()]{7,}", re.IGNORECASE)
+_BULLETS_RE = re.compile(r"^[•●▪■◦‣⁃➢–—*>\-]+\s*")
+_CID_RE = re.compile(r"\(cid:\d+\)")
+# Lines this close to a page break are where headers/footers sit
+PAGE_EDGE_LINES = 2
+# Repeated lines at least this long are dropped wherever they repeat; shorter ones (titles, dates,
+# cities) are real content and only dropped as page headers/footers
+MIN_DEDUPE_CHARS = 40
+
+def default_token_count(text: str) -> int:
+    # ~4 characters per token; ResumeCondenser should be given a real tokenizer when one is loaded
+    return len(text) // 4 + 1
+
+class ResumeCondenser:
+    """
+    Turns pdfminer/docx text into a compact, section-ordered resume that fits a token budget.
+    - cleans layout noise: (cid:N) glyphs, bullets, hyphenated line breaks, repeated headers/footers, page numbers
+    - segments into sections by heading lines (summary, skills, experience, projects, certifications, education, other)
+    - packs sections into the budget: every section first gets a fair share, leftovers go by priority
+    """
+
+    def __init__(self, count_tokens=None, budget: int = 600):
+        self.count_tokens = count_tokens or default_token_count
+        self.budget = budget
+
+    def clean_lines(self, text: str):
+        text = _CID_RE.sub("", text)
+        # "develop-\nment" -> "development"
+        text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+        pages = [
+            [line for line in (self._clean_line(raw) for raw in page.splitlines()) if line]
+            for page in text.split("\x0c")
+        ]
+        # Page headers/footers: the same line at the top or bottom edge of more than one page
+        edges = Counter(
+            key for page in pages
+            for key in {line.lower() for line in page[:PAGE_EDGE_LINES] + page[-PAGE_EDGE_LINES:]}
+        )
+        furniture = {key for key, count in edges.items() if count > 1}
+
+        seen = set()
+        lines = []
+        for page in pages:
+            for line in page:
+                key = line.lower()
+                if key in seen and (key in furniture or len(line) >= MIN_DEDUPE_CHARS or _CONTACT_RE.search(line)):
+                    continue
+                seen.add(key)
+                lines.append(line)
+        return lines
+
+    def _clean_line(self, raw: str) -> str:
+        """Normalized line, or "" for layout noise (empty, lone bullet, page number, boilerplate)."""
+        line = _BULLETS_RE.sub("- ", raw.strip()) if _BULLETS_RE.match(raw.strip()) else raw.strip()
+        line = re.sub(r"\s+", " ", line)
+        if line == "-" or _BOILERPLATE_RE.search(line):
+            return ""
+        return line
+
+    def sections(self, text: str):
+        """{"header": [...], "<section>": [...]} in document order; header holds the lines before the first heading."""
+        sections = {"header": []}
+        current = "header"
+        for line in self.clean_lines(text):
+            heading = self._heading(line)
+            inline = _INLINE_HEADING_RE.match(line) if heading is None else None
+            if inline and self._heading(inline.group(1)) is not None:
+                # "Skills: Python, SQL" starts a section and carries content
+                heading, line = self._heading(inline.group(1)), inline.group(2)
+                current = heading
+                if heading != "dropped":
+                    sections.setdefault(heading, []).append(line)
+                continue
+            if heading is not None:
+                current = heading
+                if heading != "dropped":
+                    sections.setdefault(heading, [])
+                continue
+            if current != "dropped":
+                sections.setdefault(current, []).append(line)
+        return sections
+
+    def header(self, text: str, budget: int = 80) -> str:
+        """The lines before the first section (name, contact, title), for candidate name extraction."""
+        sections = self.sections(text)
+        lines = sections["header"] or next((lines for lines in sections.values() if lines), [])
+        return "\n".join(self._fit(lines, budget))
+
+    def condense(self, text: str, budget: int = None) -> str:
+        budget = budget or self.budget
+        sections = self.sections(text)
+        # Unsectioned text (no headings found) is treated as one block
+        header = sections.pop("header")
+        if not any(sections.values()):
+            sections = {"other": header}
+        else:
+            # Lines before the first heading, minus the name and contact details, are usually a summary
+            intro = [line for line in header[1:] if not _CONTACT_RE.search(line)]
+            if intro:
+                sections.setdefault("summary", [])[:0] = intro
+        sections = {name: lines for name, lines in sections.items() if lines}
+        if not sections:
+            return ""
+
+        costs = {name: [self.count_tokens(line) for line in lines] for name, lines in sections.items()}
+        totals = {name: sum(c) + self.count_tokens(name) for name, c in costs.items()}
+        allowance = {name: 0 for name in sections}
+
+        # Fair share first, so a long experience section can't starve skills/projects/certifications
+        remaining = budget
+        share = budget // len(sections)
+        for name in sections:
+            allowance[name] = min(totals[name], share)
+            remaining -= allowance[name]
+        # Then hand out what is left by screening priority
+        for name in ANALYSIS_PRIORITY:
+            if name in sections and remaining > 0:
+                extra = min(totals[name] - allowance[name], remaining)
+                allowance[name] += extra
+                remaining -= extra
+
+        blocks = []
+        for name in SECTION_ORDER:
+            if name not in sections:
+                continue
+            heading_cost = self.count_tokens(name)
+            lines = self._fit(sections[name], allowance[name] - heading_cost, costs[name])
+            if lines:
+                blocks.append(f"## {name.capitalize()}\n" + "\n".join(lines))
+        return "\n\n".join(blocks)
+
+    def _heading(self, line: str):
+        if len(line) > 40 or len(line.split()) > 5:
+            return None
+        candidate = re.sub(r"[:\-|_•]+$", "", line).strip().strip(":").strip()
+        if _DROPPED_RE.match(candidate):
+            return "dropped"
+        for section, pattern in _HEADING_RE.items():
+            if pattern.match(candidate):
+                return section
+        return None
+
+    def _fit(self, lines, budget: int, costs=None):
+        """Whole lines in order while they fit; the first line that doesn't is cut by words."""
+        costs = costs or [self.count_tokens(line) for line in lines]
+        kept = []
+        used = 0
+        for line, cost in zip(lines, costs):
+            if used + cost <= budget:
+                kept.append(line)
+                used += cost
+                continue
+            words = line.split()
+            while words and self.count_tokens(" ".join(words)) > budget - used:
+                words = words[: len(words) * 3 // 4]
+            if len(words) > 3:
+                kept.append(" ".join(words) + " …")
+            break
+        return kept
@@ -0,0 +1,59 @@
+import hashlib
+import re
+import unicodedata
+
+HASH_CHUNK_BYTES = 1 << 20
+
+_CID_RE = re.compile(r"\(cid:\d+\)")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+def file_hash(path: str) -> str:
+    """SHA-256 of the file bytes (stored as resume_uploads.original_hash and used as the storage object name)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def normalize_text(text: str) -> str:
+    """
+    Extracted text reduced to what survives a format change: the same resume saved as .pdf and .docx
+    differs in ligatures, (cid:N) glyphs, bullets, punctuation, case and line breaks, not in its words.
+    """
+    text = unicodedata.normalize("NFKC", _CID_RE.sub(" ", text or "")).lower()
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the normalized text; empty string when nothing is left to compare."""
+    normalized = normalize_text(text)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest() if normalized else ""
+
+def dedupe_resumes(resumes):
+    """
+    Collapse exact duplicates within one upload before analysis. A resume is a duplicate of an earlier one
+    if its bytes are identical (file_hash) or its normalized text is (text_hash). Resumes need "file_hash"
+    and "text_hash" keys (read_resumes sets them). Returns (unique resumes, duplicate records).
+    """
+    by_file = {}
+    by_text = {}
+    unique = []
+    duplicates = []
+    for resume in resumes:
+        original = by_file.get(resume["file_hash"])
+        match = "file"
+        if original is None and resume["text_hash"]:
+            original = by_text.get(resume["text_hash"])
+            match = "text"
+        if original is not None:
+            duplicates.append({
+                "filename": resume["filename"],
+                "path": resume["path"],
+                "duplicate_of": original["filename"],
+                "match": match
+            })
+            continue
+        by_file[resume["file_hash"]] = resume
+        if resume["text_hash"]:
+            by_text.setdefault(resume["text_hash"], resume)
+        unique.append(resume)
+    return unique, duplicates
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from supabase import create_client
+import os
+from dotenv import load_dotenv
+from result_index import SCORE_COLUMNS, result_cache
+from routes.search_analytics import get_current_user
+
+load_dotenv()
+
+router = APIRouter()
+
+supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+# Served from the per-job columnar cache (result_index.py); only the first query of a job reads Supabase
+@router.get("/results/{job_id}")
+def query_results(
+    job_id: str,
+    skill: list[str] = Query(default=[]),
+    status: list[str] = Query(default=[]),
+    score_field: str = "total_score",
+    min_score: float | None = None,
+    max_score: float | None = None,
+    sort: str = "total_score",
+    order: str = "desc",
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    facet_limit: int = Query(20, ge=0, le=200),
+    refresh: bool = False,
+    user_id: str = Depends(get_current_user)
+):
+    if sort not in SCORE_COLUMNS or score_field not in SCORE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort and score_field must be one of {', '.join(SCORE_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    try:
+        index = result_cache.get(supabase, job_id, refresh=refresh)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    # Another recruiter's job looks the same as a missing one
+    if not index.size or index.owner_id != user_id:
+        raise HTTPException(status_code=404, detail="No rankings found for this job")
+    return index.query(
+        skills=skill, statuses=status, score_field=score_field, min_score=min_score, max_score=max_score,
+        sort=sort, descending=order == "desc", limit=limit, offset=offset, facet_limit=facet_limit
+    )
@@ -1,13 +1,70 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from supabase import create_client
+import jwt
 import os
+import threading
 from dotenv import load_dotenv
+from search_index import SearchIndex, MAX_RESULTS
 
 load_dotenv()
 
 router = APIRouter()
 
 supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+search_index = SearchIndex()
+_owners_backfilled = False
+_backfill_lock = threading.Lock()
+
+def get_current_user(authorization: str = Header(...)):
+    try:
+        token = authorization.split(" ")[-1]
+        decoded = jwt.decode(token, options={"verify_signature": False})
+        user_id = decoded.get("sub")
+    except Exception:
+        raise HTTPException(status_code=401, detail="Invalid or missing token")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid or missing token")
+    return user_id
+
+def _backfill_owners():
+    """Documents indexed before they had an owner get their job's recruiter (job_descriptions.user_id), once per process."""
+    global _owners_backfilled
+    with _backfill_lock:
+        if _owners_backfilled:
+            return
+        job_ids = search_index.unowned_jobs()
+        for i in range(0, len(job_ids), 100):
+            jobs = supabase.table("job_descriptions").select("job_id, user_id").in_("job_id", job_ids[i : i + 100]).execute()
+            for job in jobs.data or []:
+                if job.get("user_id"):
+                    search_index.set_job_owner(job["job_id"], job["user_id"])
+        _owners_backfilled = True
+
+# Plain def: SQLite calls block, so FastAPI runs this in its threadpool
+@router.get("/search")
+def search_resumes(
+    q: str = "",
+    job_id: str | None = None,
+    skill: list[str] = Query(default=[]),
+    min_score: float | None = Query(None, ge=0, le=10),
+    max_score: float | None = Query(None, ge=0, le=10),
+    match: str = "all",
+    limit: int = Query(20, ge=1, le=MAX_RESULTS),
+    user_id: str = Depends(get_current_user)
+):
+    """Search the caller's screened resumes only; without job_id, across all of the caller's jobs."""
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="match must be 'all' or 'any'")
+    if not q.strip() and not (job_id or skill or min_score is not None or max_score is not None):
+        raise HTTPException(status_code=400, detail="Give a query or at least one filter")
+    try:
+        _backfill_owners()
+        return search_index.search(
+            user_id, q, job_id=job_id, skills=skill, min_score=min_score, max_score=max_score,
+            limit=limit, match_all=match == "all"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/compare-candidates")
 async def compare_candidates(resume_ids: list[str] = Query(...)):
@@ -25,59 +82,20 @@ async def compare_candidates(resume_ids: list[str] = Query(...)):
 @router.get("/history")
 async def get_resume_history(resume_id: str):
     try:
-        original = supabase.table("resume_uploads").select("original_hash").eq("resume_id", resume_id).execute()
+        original = supabase.table("resume_uploads").select("*").eq("resume_id", resume_id).execute()
         if not original.data:
             raise HTTPException(status_code=404, detail="Resume not found")
 
-        hash_value = original.data[0]["original_hash"]
-        if not hash_value:
+        # Same file (byte hash) or the same resume in another format (normalized-text hash)
+        hashes = [
+            f"{column}.eq.{original.data[0][column]}"
+            for column in ("original_hash", "text_hash")
+            if original.data[0].get(column)
+        ]
+        if not hashes:
             return {"history": []}
 
-        history = supabase.table("resume_uploads").select("resume_id, job_id").eq("original_hash", hash_value).execute()
+        history = supabase.table("resume_uploads").select("resume_id, job_id").or_(",".join(hashes)).execute()
         return {"history": history.data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-@router.get("/export")
-async def export_results(job_id: str, format: str = "csv"):
-    try:
-        rankings = supabase.table("resume_rankings").select("*").eq("job_id", job_id).order("rank").execute().data
-        results = []
-
-        for rank in rankings:
-            rid = rank["resume_id"]
-            analysis = supabase.table("resume_analysis").select("*").eq("resume_id", rid).execute().data
-            upload = supabase.table("resume_uploads").select("*").eq("resume_id", rid).execute().data
-            rank["analysis"] = analysis[0] if analysis else {}
-            rank["upload"] = upload[0] if upload else {}
-            results.append(rank)
-
-        if not results:
-            raise HTTPException(status_code=404, detail="No rankings found for this job")
-
-        if format == "csv":
-            import csv
-            from fastapi.responses import StreamingResponse
-            from io import StringIO
-
-            csv_file = StringIO()
-            fieldnames = ["resume_id", "job_id", "total_score", "rank"]
-            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in results:
-                writer.writerow({
-                    "resume_id": row["resume_id"],
-                    "job_id": row["job_id"],
-                    "total_score": row["total_score"],
-                    "rank": row["rank"]
-                })
-            csv_file.seek(0)
-            from fastapi.responses import StreamingResponse
-
-            headers = {    "Content-Disposition": f"attachment; filename=screening_{job_id}.csv"}
-            return StreamingResponse(csv_file, media_type="text/csv", headers=headers)
-
-        else:
-            return results
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,129 @@
+import os
+import time
+import numpy as np
+
+from job_spec import matched_skills, skill_match_score
+from resume_analysis import ResumeAnalysis
+
+CASCADE_MODES = ("off", "local", "small")
+SMALL_MODEL_NAME = os.getenv("GROQ_SMALL_MODEL_NAME", "llama-3.1-8b-instant")
+
+# Screening Tier of resumes the first pass kept from the large model; they rank after every escalated resume
+FAST_TIER = "fast"
+
+# all-MiniLM-L6-v2 cosine between a job description and a resume: ~0.15 unrelated, ~0.65 a close match
+SEMANTIC_FLOOR = 0.15
+SEMANTIC_CEILING = 0.65
+
+class CascadeConfig:
+    """
+    Per-job cascade settings (stored in job_descriptions.cascade_config).
+    - mode: "off" (every resume to the large model), "local" (embedding + skill match first pass),
+      "small" (small model first pass)
+    - reject_below: first-pass score (0-10) under which a resume is not escalated
+    - escalate_top: the best N first-pass resumes are always escalated, whatever their score
+    """
+
+    __slots__ = ("mode", "reject_below", "escalate_top")
+
+    def __init__(self, mode: str = "off", reject_below: float = 4.0, escalate_top: int = 5):
+        self.mode = mode if mode in CASCADE_MODES else "off"
+        self.reject_below = min(max(float(reject_below), 0.0), 10.0)
+        self.escalate_top = max(int(escalate_top), 0)
+
+    @classmethod
+    def from_env(cls) -> "CascadeConfig":
+        return cls(
+            mode=os.getenv("SCREENING_CASCADE_MODE", "off").lower(),
+            reject_below=float(os.getenv("SCREENING_CASCADE_REJECT_BELOW", "4.0")),
+            escalate_top=int(os.getenv("SCREENING_CASCADE_ESCALATE_TOP", "5"))
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CascadeConfig":
+        default = cls.from_env()
+        data = data or {}
+        return cls(
+            mode=str(data.get("mode") or default.mode).lower(),
+            reject_below=data.get("reject_below", default.reject_below),
+            escalate_top=data.get("escalate_top", default.escalate_top)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def to_dict(self) -> dict:
+        return {"mode": self.mode, "reject_below": self.reject_below, "escalate_top": self.escalate_top}
+
+def local_scores(embed_model, requirements: str, resume_texts, job_spec=None, full_texts=None):
+    """
+    First-pass 0-10 scores for all resumes at once: embedding similarity to the requirements,
+    averaged with the deterministic skill match when a job spec is available.
+    """
+    embeddings = embed_model.encode([requirements, *resume_texts], batch_size=32, normalize_embeddings=True)
+    cosine = embeddings[1:] @ embeddings[0]
+    semantic = np.clip((cosine - SEMANTIC_FLOOR) / (SEMANTIC_CEILING - SEMANTIC_FLOOR), 0.0, 1.0) * 10
+    if job_spec is None or job_spec.is_empty():
+        return [round(float(s), 2) for s in semantic]
+    full_texts = full_texts or resume_texts
+    skills = np.array([skill_match_score(job_spec, [], text) for text in full_texts])
+    return [round(float(s), 2) for s in (semantic + skills) / 2]
+
+def select_escalations(scores, config: CascadeConfig):
+    """Indices to send to the large model: everything at or above reject_below, plus the top escalate_top."""
+    escalate = {i for i, score in enumerate(scores) if score >= config.reject_below}
+    ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    escalate.update(ranked[: config.escalate_top])
+    return escalate
+
+def fast_pass_analysis(score: float, resume_text: str, job_spec=None) -> dict:
+    """
+    Analysis for a resume the local first pass screened out (no LLM call). The LLM score columns stay 0:
+    the fast score is on another scale and is kept separately as "Fast Pass Score".
+    """
+    matched = matched_skills(job_spec.required_skills + job_spec.optional_skills, [], resume_text) if job_spec else []
+    return ResumeAnalysis(
+        key_skills=matched,
+        overall_analysis=f"Screened out by the fast pass (match {score:.1f}/10); not reviewed by the full model."
+    ).to_dict()
+
+class CascadeStats:
+    """Escalation rate and time/token savings of one screening run."""
+
+    def __init__(self, config: CascadeConfig):
+        self.config = config
+        self.resumes = 0
+        self.escalated = 0
+        self.first_pass_seconds = 0.0
+        self.large_seconds = 0.0
+        self.large_calls = 0
+        self.large_tokens = 0
+        self._started = time.perf_counter()
+
+    def record_large(self, seconds: float, tokens: int) -> None:
+        self.large_calls += 1
+        self.large_seconds += seconds
+        self.large_tokens += tokens
+
+    def summary(self) -> dict:
+        skipped = self.resumes - self.escalated
+        avg_seconds = self.large_seconds / self.large_calls if self.large_calls else 0.0
+        avg_tokens = self.large_tokens / self.large_calls if self.large_calls else 0.0
+        # What the skipped resumes would have cost on the large model, minus what the first pass cost
+        seconds_saved = skipped * avg_seconds - self.first_pass_seconds
+        full_estimate = self.resumes * avg_seconds
+        actual = self.first_pass_seconds + self.large_seconds
+        return {
+            **self.config.to_dict(),
+            "resumes": self.resumes,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.resumes, 3) if self.resumes else 0.0,
+            "first_pass_seconds": round(self.first_pass_seconds, 2),
+            "large_model_seconds": round(self.large_seconds, 2),
+            "avg_large_model_seconds": round(avg_seconds, 2),
+            "estimated_seconds_saved": round(seconds_saved, 2),
+            "estimated_tokens_saved": int(skipped * avg_tokens),
+            "estimated_speedup": round(full_estimate / actual, 2) if actual else 1.0,
+            "wall_seconds": round(time.perf_counter() - self._started, 2)
+        }
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+from skill_taxonomy import canonical_skill
+
+# On-disk inverted index (SQLite FTS5) over screened resumes, filled as each job finishes
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", os.path.join("processed_data", "search_index.sqlite3"))
+# BM25 column weights: resume text, skills, analysis text, filter tags (never scored)
+BM25_WEIGHTS = (1.0, 3.0, 2.0, 0.0)
+MAX_RESULTS = 100
+
+_SCHEMA = """
+create table if not exists documents (
+    id integer primary key,
+    resume_id text not null unique,
+    job_id text not null,
+    user_id text,
+    filename text,
+    overall_match_score real,
+    final_score real,
+    indexed_at real
+);
+create index if not exists documents_job_idx on documents (job_id);
+create index if not exists documents_user_idx on documents (user_id);
+create index if not exists documents_score_idx on documents (overall_match_score);
+create virtual table if not exists documents_fts using fts5(
+    resume_text, skills, analysis, tags, tokenize = 'porter unicode61'
+);
+"""
+_QUERY_TOKEN_RE = re.compile(r"[\w+#.]+")
+_ANALYSIS_TEXT_FIELDS = ("Overall Analysis", "Relevant Projects", "Certifications & Courses", "Soft Skills")
+
+def job_tag(job_id: str) -> str:
+    return "j" + re.sub(r"[^0-9a-zA-Z]", "", job_id).lower()
+
+def user_tag(user_id: str) -> str:
+    return "u" + re.sub(r"[^0-9a-zA-Z]", "", user_id).lower()
+
+def skill_tag(skill: str) -> str:
+    # Hex digest: one token whatever punctuation the skill has (c++, ci/cd, .net)
+    return "s" + hashlib.md5(canonical_skill(skill).encode("utf-8")).hexdigest()[:16]
+
+def fts_query(query: str, match_all: bool = True):
+    """User keywords as an FTS5 expression: every token quoted (no operator injection), AND-ed or OR-ed."""
+    tokens = ['"' + token.replace('"', '""') + '"' for token in _QUERY_TOKEN_RE.findall(query or "")]
+    return (" AND " if match_all else " OR ").join(tokens) or None
+
+class SearchIndex:
+    """
+    BM25 keyword search over resume text, skills and analysis fields with job / skill / score filters.
+    One row per resume_id; re-indexing a job replaces its rows, so indexing is incremental per job.
+    Every document belongs to the recruiter (user_id) who screened it, and every search is scoped to one.
+    Owner, job and skill filters are tokens of the zero-weight tags column, so FTS5 intersects their
+    posting lists with the keywords' and only scores the intersection instead of filtering after ranking.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            columns = {row[1] for row in conn.execute("pragma table_info(documents)")}
+            if columns and "user_id" not in columns:
+                # Index files created before documents had an owner
+                conn.execute("alter table documents add column user_id text")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        # WAL: searches keep reading while a finishing job writes
+        conn.execute("pragma journal_mode = wal")
+        return conn
+
+    def index_job(self, job_id: str, user_id: str, documents) -> int:
+        """documents: [{"resume_id", "filename", "text", "analysis"}] of a job screened by user_id. Returns the number indexed."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            for doc in documents:
+                analysis = doc.get("analysis") or {}
+                skills = list(dict.fromkeys(
+                    canonical_skill(s) for s in [*analysis.get("Extracted Skills", []), *analysis.get("Key Skills", [])] if str(s).strip()
+                ))
+                tags = " ".join([user_tag(user_id), job_tag(job_id), *(skill_tag(s) for s in skills)])
+                analysis_text = "\n".join(
+                    value if isinstance(value, str) else "\n".join(map(str, value))
+                    for value in (analysis.get(field) or "" for field in _ANALYSIS_TEXT_FIELDS)
+                )
+                values = (
+                    job_id, user_id, doc.get("filename"), analysis.get("Overall Match Score") or 0,
+                    analysis.get("Final Score") or 0, now
+                )
+
+                row = conn.execute("select id from documents where resume_id = ?", (doc["resume_id"],)).fetchone()
+                if row:
+                    doc_id = row[0]
+                    conn.execute(
+                        "update documents set job_id = ?, user_id = ?, filename = ?, overall_match_score = ?, final_score = ?, indexed_at = ? where id = ?",
+                        (*values, doc_id)
+                    )
+                    conn.execute("delete from documents_fts where rowid = ?", (doc_id,))
+                else:
+                    doc_id = conn.execute(
+                        "insert into documents (resume_id, job_id, user_id, filename, overall_match_score, final_score, indexed_at) values (?, ?, ?, ?, ?, ?, ?)",
+                        (doc["resume_id"], *values)
+                    ).lastrowid
+
+                conn.execute(
+                    "insert into documents_fts (rowid, resume_text, skills, analysis, tags) values (?, ?, ?, ?, ?)",
+                    (doc_id, doc.get("text") or "", " ".join(skills), analysis_text, tags)
+                )
+        return len(documents)
+
+    def delete_job(self, job_id: str) -> int:
+        with closing(self._connect()) as conn, conn:
+            ids = [(row[0],) for row in conn.execute("select id from documents where job_id = ?", (job_id,))]
+            conn.executemany("delete from documents_fts where rowid = ?", ids)
+            conn.executemany("delete from documents where id = ?", ids)
+        return len(ids)
+
+    def unowned_jobs(self):
+        """job_ids of documents indexed before documents had an owner."""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("select distinct job_id from documents where user_id is null")]
+
+    def set_job_owner(self, job_id: str, user_id: str) -> int:
+        """Give a job's unowned documents their owner (column and tag token)."""
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute("select id from documents where job_id = ? and user_id is null", (job_id,)).fetchall()
+            for (doc_id,) in rows:
+                tags = conn.execute("select tags from documents_fts where rowid = ?", (doc_id,)).fetchone()
+                conn.execute(
+                    "update documents_fts set tags = ? where rowid = ?",
+                    (f"{user_tag(user_id)} {tags[0] if tags else job_tag(job_id)}", doc_id)
+                )
+                conn.execute("update documents set user_id = ? where id = ?", (user_id, doc_id))
+        return len(rows)
+
+    def search(self, user_id: str, query: str = "", job_id: str = None, skills=None, min_score: float = None,
+               max_score: float = None, limit: int = 20, match_all: bool = True) -> dict:
+        """
+        Keyword query over user_id's resumes ranked by BM25 (best first), restricted by the filters.
+        Skill filters are AND-ed. Without keywords, filtered resumes come back by Overall Match Score.
+        """
+        started = time.perf_counter()
+        keywords = fts_query(query, match_all)
+        tags = [user_tag(user_id)] + ([job_tag(job_id)] if job_id else []) + [skill_tag(s) for s in skills or []]
+        terms = ([f"({keywords})"] if keywords else []) + [f'tags : "{tag}"' for tag in tags]
+        where, params = ["documents_fts match ?"], [" AND ".join(terms)]
+        if min_score is not None:
+            where.append("d.overall_match_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("d.overall_match_score <= ?")
+            params.append(max_score)
+
+        columns = "d.resume_id, d.job_id, d.filename, d.overall_match_score, d.final_score"
+        if keywords:
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+            sql = (
+                f"select {columns}, bm25(documents_fts, {weights}) as rank, "
+                "snippet(documents_fts, 0, '[', ']', '…', 16) "
+                "from documents_fts join documents d on d.id = documents_fts.rowid "
+                f"where {' and '.join(where)} order by rank limit ?"
+            )
+        else:
+            sql = (
+                f"select {columns}, null, null from documents_fts join documents d on d.id = documents_fts.rowid "
+                f"where {' and '.join(where)} order by d.overall_match_score desc limit ?"
+            )
+        params.append(min(max(int(limit), 1), MAX_RESULTS))
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        results = [
+            {
+                "resume_id": resume_id,
+                "job_id": job,
+                "filename": filename,
+                "overall_match_score": overall,
+                "final_score": final,
+                # FTS5 bm25() is lower-is-better; flip it so higher means more relevant
+                "relevance": round(-rank, 4) if rank is not None else None,
+                "snippet": snippet
+            }
+            for resume_id, job, filename, overall, final, rank, snippet in rows
+        ]
+        return {"results": results, "took_ms": round((time.perf_counter() - started) * 1000, 2)}
@@ -0,0 +1,162 @@
+import json
+import os
+import re
+from pathlib import Path
+
+# {category: {canonical skill: [aliases]}}; only the aliases are matched, so ambiguous names
+# ("Go", "R") are listed under unambiguous spellings instead of themselves
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "skill_taxonomy.json"
+TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH") or str(DEFAULT_TAXONOMY_PATH)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    """Lowercase with whitespace runs collapsed; punctuation is kept (c++, c#, .net, ci/cd, node.js)."""
+    return _WHITESPACE_RE.sub(" ", (text or "").lower())
+
+def normalize_skill(skill: str) -> str:
+    """'ReactJS' / 'React.js' / ' react.js ' -> 'react.js'; keeps symbols that matter (c++, c#, .net, next.js)."""
+    skill = str(skill).strip().lower()
+    skill = re.sub(r"[\s_\-]+", " ", skill)
+    skill = re.sub(r"(?<=\w)\.?js$", ".js", skill).strip()
+    return skill
+
+def load_taxonomy(path: str = None) -> dict:
+    with open(path or TAXONOMY_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every alias of the taxonomy: one pass over the resume text finds all
+    aliases at once, in time linear in the text length plus the number of matches.
+    Overlapping matches resolve leftmost-longest ("node.js" wins over "js"), and a match only counts
+    on word boundaries ("java" does not match inside "javascript").
+    """
+
+    def __init__(self, taxonomy: dict):
+        self.categories = {}
+        # Whole skill names (canonical names, their ".js"-less form, aliases) -> canonical, for lookup()
+        self._names = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for category, skills in taxonomy.items():
+            for canonical, aliases in skills.items():
+                self.categories[canonical] = category
+                key = normalize_skill(canonical)
+                self._names.setdefault(key, canonical)
+                if key.endswith(".js"):
+                    self._names.setdefault(key[:-3], canonical)
+                for alias in aliases:
+                    alias = normalize(alias).strip()
+                    if alias:
+                        self._names.setdefault(normalize_skill(alias), canonical)
+                        self._add(alias, canonical)
+        self._build()
+
+    def lookup(self, name: str):
+        """Canonical skill a whole skill name refers to ("Express" -> "Express.js", "Go" -> "Go"), or None."""
+        return self._names.get(normalize_skill(name))
+
+    def _add(self, alias: str, canonical: str) -> None:
+        node = 0
+        for ch in alias:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(alias), canonical))
+
+    def _build(self) -> None:
+        # Breadth-first fail links; each node also inherits the outputs of its fail target
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    def matches(self, text: str):
+        """[(start, end, canonical)] in the normalized text, non-overlapping, in order."""
+        text = normalize(text)
+        found = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, canonical in self._out[node]:
+                start, end = i - length + 1, i + 1
+                if _bounded(text, start, end):
+                    found.append((start, end, canonical))
+
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        kept = []
+        last_end = 0
+        for start, end, canonical in found:
+            if start >= last_end:
+                kept.append((start, end, canonical))
+                last_end = end
+        return kept
+
+    def extract(self, text: str):
+        """Canonical skills found in the text, in order of first mention."""
+        return list(dict.fromkeys(canonical for _, _, canonical in self.matches(text)))
+
+    def facets(self, skills):
+        """{category: [skills]} for a list of canonical skills."""
+        grouped = {}
+        for skill in skills:
+            grouped.setdefault(self.categories.get(skill, "other"), []).append(skill)
+        return grouped
+
+def _bounded(text: str, start: int, end: int) -> bool:
+    # Alias edges that are letters/digits must not continue into a neighbouring word
+    if text[start].isalnum() and start > 0 and text[start - 1].isalnum():
+        return False
+    if text[end - 1].isalnum() and end < len(text) and text[end].isalnum():
+        return False
+    return True
+
+_matcher = None
+
+def get_matcher() -> SkillMatcher:
+    """Process-wide matcher, built once from TAXONOMY_PATH."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+def extract_skills(text: str):
+    return get_matcher().extract(text)
+
+def canonical_skill(name: str) -> str:
+    """Filter/storage key of a skill: the taxonomy's canonical name when it knows the name ("JS" -> javascript)."""
+    matcher = get_matcher()
+    known = matcher.lookup(name)
+    if known is None:
+        found = matcher.extract(name)
+        known = found[0] if found else None
+    return normalize_skill(known or name)
+
+def store_resume_skills(supabase, job_id: str, resume_skills) -> None:
+    """Normalized skills per upload for filtering/faceting; resume_skills is [(resume_id, [canonical skills])]."""
+    matcher = get_matcher()
+    rows = [
+        {"resume_id": resume_id, "job_id": job_id, "skill": skill, "category": matcher.categories.get(skill, "other")}
+        for resume_id, skills in resume_skills
+        for skill in skills
+    ]
+    if not rows:
+        return
+    try:
+        supabase.table("resume_skills").upsert(rows, on_conflict="resume_id,skill").execute()
+    except Exception as e:
+        print(f"⚠️ Could not store extracted skills for {job_id}: {e}")
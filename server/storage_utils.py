@@ -1,6 +1,7 @@
 # File: storage_utils.py
 import os
 import uuid
+import hashlib
 import mimetypes
 from pathlib import Path
 from supabase import create_client
@@ -18,12 +19,43 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Resume files live at resumes/{CONTENT_PREFIX}/{sha256}{ext}; resume_uploads.file_path maps each job's copy to it
+CONTENT_PREFIX = "objects"
+
+def _object_exists(file_hash: str, storage_path: str) -> bool:
+    """True if an earlier upload (any job) already stored these bytes at storage_path."""
+    try:
+        result = supabase.table("resume_uploads").select("file_path").eq("original_hash", file_hash).limit(5).execute()
+    except Exception as e:
+        print(f"⚠️ Content hash lookup failed: {e}")
+        return False
+    return any((row.get("file_path") or "").endswith(storage_path) for row in result.data or [])
+
+# PostgREST returns at most max-rows rows per request (1000 by default)
+PAGE_SIZE = 1000
+
+def job_uploads(job_id: str) -> dict:
+    """{file_name: resume_id} of the resume_uploads rows a job already has (paged)."""
+    uploads = {}
+    offset = 0
+    while True:
+        page = supabase.table("resume_uploads").select("resume_id, file_name").eq("job_id", job_id) \
+            .order("resume_id").range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        for row in page:
+            uploads.setdefault(row["file_name"], row["resume_id"])
+        if len(page) < PAGE_SIZE:
+            return uploads
+        offset += PAGE_SIZE
+
 def upload_resume_info_to_db(
     file_name: str,
     file_path: str,
     job_id: str,
     user_id: str,
     candidate_name: str = "Unknown",
+    file_hash: str = None,
+    text_hash: str = None,
+    minhash=None,
 ):
     resume_id = str(uuid.uuid4())
 
@@ -38,32 +70,48 @@ def upload_resume_info_to_db(
     if not content_type:
         content_type = "application/octet-stream"
 
-    storage_path = f"{job_id}/{file_name}"
-    
-    try:
-        supabase.storage.from_("resumes").upload(
-            path=storage_path,
-            file=file_content,
-            file_options={"content-type": content_type},
-        )
-    except Exception as e:
-        print(f"🚨 Upload failed: {e}")
-        return None
+    # Content-addressed: identical files share one object across jobs and are uploaded once
+    file_hash = file_hash or hashlib.sha256(file_content).hexdigest()
+    storage_path = f"{CONTENT_PREFIX}/{file_hash}{Path(file_name).suffix.lower()}"
+
+    if not _object_exists(file_hash, storage_path):
+        try:
+            supabase.storage.from_("resumes").upload(
+                path=storage_path,
+                file=file_content,
+                file_options={"content-type": content_type},
+            )
+        except Exception as e:
+            # Uploaded concurrently by another job; the object is the same bytes
+            if "Duplicate" not in str(e) and "already exists" not in str(e):
+                print(f"🚨 Upload failed: {e}")
+                return None
+    else:
+        print(f"♻️ {file_name} already stored as {storage_path}, skipping upload")
 
     public_url = f"{SUPABASE_URL}/storage/v1/object/public/resumes/{storage_path}"
 
     try:
-        supabase.table("resume_uploads").insert(
-            {
-                "resume_id": resume_id,
-                "user_id": user_id,
-                "job_id": job_id,
-                "file_name": file_name,
-                "file_path": public_url,
-                "candidate_name": candidate_name,
-            }
-        ).execute()
-        
+        row = {
+            "resume_id": resume_id,
+            "user_id": user_id,
+            "job_id": job_id,
+            "file_name": file_name,
+            "file_path": public_url,
+            "candidate_name": candidate_name,
+            "original_hash": file_hash,
+            "text_hash": text_hash,
+            "minhash": [int(v) for v in minhash] if minhash is not None else None,
+        }
+        try:
+            supabase.table("resume_uploads").insert(row).execute()
+        except Exception as e:
+            # Schema without migrations/003 and 004; the byte hash still links history
+            print(f"⚠️ text_hash/minhash not stored: {e}")
+            row.pop("text_hash")
+            row.pop("minhash")
+            supabase.table("resume_uploads").insert(row).execute()
+
         print(f"📥 Saved metadata in DB for {file_name}")
         return resume_id
 
@@ -4,6 +4,10 @@ from core.stress_service import StressService
 # Update: Import the correct Groq-based Whisper service
 from core.groq_whisper_service import GroqWhisperService
 from core.report_service import ReportService
+from core.question_cache import QuestionCacheService
+from core.session_cache import session_question_cache, final_report_cache
+from core.progress_service import ProgressAggregator
+from core.session_cleanup import SessionDeletionService
 from fastapi import Depends
 
 def get_supabase():
@@ -19,5 +23,25 @@ def get_whisper_service():
 def get_stress_service(whisper_service=Depends(get_whisper_service)):
     return StressService(whisper_service=whisper_service)
 
-def get_report_service(supabase=Depends(get_supabase), groq_service=Depends(get_groq_service)):
-    return ReportService(supabase=supabase, groq_service=groq_service)
\ No newline at end of file
+def get_progress_aggregator(supabase=Depends(get_supabase)):
+    return ProgressAggregator(supabase=supabase)
+
+def get_report_service(supabase=Depends(get_supabase), groq_service=Depends(get_groq_service), progress=Depends(get_progress_aggregator)):
+    return ReportService(supabase=supabase, groq_service=groq_service, report_cache=final_report_cache, progress=progress)
+
+def get_question_cache(supabase=Depends(get_supabase)):
+    return QuestionCacheService(supabase=supabase)
+
+def get_session_cache():
+    return session_question_cache
+
+def get_report_cache():
+    return final_report_cache
+
+def get_session_deletion_service(supabase=Depends(get_supabase), progress=Depends(get_progress_aggregator)):
+    return SessionDeletionService(
+        supabase=supabase,
+        session_cache=session_question_cache,
+        report_cache=final_report_cache,
+        progress=progress
+    )
\ No newline at end of file
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
-from api.dependencies import get_supabase
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel, Field
+from api.dependencies import get_supabase, get_session_deletion_service
+from core.rate_limiter import limiter_metrics
+from utils.supabase_utils import select_in
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
+from collections import Counter
+from datetime import datetime, timedelta
+import asyncio
 import uuid
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -9,75 +15,134 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+ADMIN_SESSIONS_DEFAULT_LIMIT = 50
+ADMIN_SESSIONS_MAX_LIMIT = 200
+
+def _parse_cursor(cursor: Optional[str]):
+    """Cursor format: '<start_time>|<session_id>' of the last row on the previous page."""
+    if not cursor:
+        return None, None
+    try:
+        before_start, before_id = cursor.rsplit("|", 1)
+        uuid.UUID(before_id)
+        return before_start, before_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor. Use next_cursor from the previous page.")
+
 @router.get("/sessions")
-async def get_all_sessions(supabase=Depends(get_supabase)) -> List[Dict]:
+async def get_all_sessions(
+    limit: int = Query(ADMIN_SESSIONS_DEFAULT_LIMIT, ge=1, le=ADMIN_SESSIONS_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    status: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    start_from: Optional[str] = Query(None, description="ISO timestamp, inclusive lower bound on start_time"),
+    start_to: Optional[str] = Query(None, description="ISO timestamp, exclusive upper bound on start_time"),
+    supabase=Depends(get_supabase)
+) -> Dict:
     """
-    Retrieve all mock interview sessions with details: question count, answer count, average stress.
-    Uses a single query if admin_get_session_overview() exists, else falls back to N queries.
+    Retrieve mock interview sessions, newest first, with question count, answer count and average stress.
+    Keyset-paginated on (start_time, id). Uses admin_get_session_overview() if it exists
+    (see migrations/005_admin_session_overview.sql), else falls back to a page query plus three paged grouped reads.
     """
     try:
+        if user_id:
+            try:
+                uuid.UUID(user_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid user_id format. Must be a valid UUID.")
+        before_start, before_id = _parse_cursor(cursor)
+
+        # Fetch one extra row to know whether another page exists
+        page_size = limit + 1
+        rows = None
+
         # Try fast SQL function first
         try:
-            response = supabase.rpc("admin_get_session_overview").execute()
+            response = supabase.rpc("admin_get_session_overview", {
+                "p_limit": page_size,
+                "p_before_start": before_start,
+                "p_before_id": before_id,
+                "p_status": status,
+                "p_user_id": user_id,
+                "p_start_from": start_from,
+                "p_start_to": start_to
+            }).execute()
             # Check if data exists in response
             if hasattr(response, 'data') and response.data is not None:
-                logger.info(f"Retrieved {len(response.data)} sessions using admin_get_session_overview()")
-                return response.data
+                rows = response.data
+                logger.info(f"Retrieved {len(rows)} sessions using admin_get_session_overview()")
         except Exception as e:
-            logger.warning(f"admin_get_session_overview() RPC not found or failed, using slow fallback: {str(e)}")
-
-        # SLOW fallback: manual enhancement (N+1 queries)
-        sessions = supabase.table("mock_interview_sessions").select("*").order("start_time", desc=True).execute()
-        if not sessions.data:
-            logger.info("No sessions found")
-            return []
-
-        enhanced_sessions = []
-        for session in sessions.data:
-            session_id = session["id"]
-            
-            # Fetch question count
-            questions = supabase.table("mock_interview_questions").select("id", count="exact").eq("session_id", session_id).execute()
-            question_count = questions.count or 0
-
-            # Fetch answer count
-            answers = supabase.table("mock_interview_answers").select("id", count="exact").eq("session_id", session_id).execute()
-            answer_count = answers.count or 0
-
-            # Average stress
-            stress_data = supabase.table("mock_interview_stress_analysis").select("stress_score").eq("session_id", session_id).execute()
-            # Fix: Filter out None values before calculating
-            stress_scores = [
-                entry["stress_score"] 
-                for entry in (stress_data.data or []) 
-                if entry.get("stress_score") is not None
-            ]
-            average_stress = sum(stress_scores) / len(stress_scores) if stress_scores else None
-
-            enhanced_session = {
-                "id": session["id"],
-                "user_id": session.get("user_id"),
-                "resume_id": session.get("resume_id"),
-                "start_time": session.get("start_time"),
-                "end_time": session.get("end_time"),
-                "status": session.get("status"),
-                "overall_score": session.get("overall_score"),
-                "question_count": question_count,
-                "answer_count": answer_count,
-                "average_stress": average_stress,
-            }
-            enhanced_sessions.append(enhanced_session)
-
-        logger.info(f"Retrieved {len(enhanced_sessions)} sessions with enhanced details (fallback mode)")
-        return enhanced_sessions
+            logger.warning(f"admin_get_session_overview() RPC not found or failed, using fallback: {str(e)}")
+
+        if rows is None:
+            rows = _get_sessions_fallback(supabase, page_size, before_start, before_id, status, user_id, start_from, start_to)
+            logger.info(f"Retrieved {len(rows)} sessions with enhanced details (fallback mode)")
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1]['start_time']}|{rows[-1]['id']}" if has_more and rows else None
+        return {"sessions": rows, "next_cursor": next_cursor}
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error retrieving sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving sessions: {str(e)}")
 
+def _get_sessions_fallback(supabase, page_size, before_start, before_id, status, user_id, start_from, start_to) -> List[Dict]:
+    """One page of sessions plus three grouped queries for the counts/averages (instead of 3 per session)."""
+    query = supabase.table("mock_interview_sessions").select("*")
+    if status:
+        query = query.eq("status", status)
+    if user_id:
+        query = query.eq("user_id", user_id)
+    if start_from:
+        query = query.gte("start_time", start_from)
+    if start_to:
+        query = query.lt("start_time", start_to)
+    if before_start:
+        query = query.or_(f'start_time.lt."{before_start}",and(start_time.eq."{before_start}",id.lt.{before_id})')
+    sessions = query.order("start_time", desc=True).order("id", desc=True).limit(page_size).execute()
+    if not sessions.data:
+        logger.info("No sessions found")
+        return []
+
+    session_ids = [session["id"] for session in sessions.data]
+    # ~9 rows per session: a 200-session page is past PostgREST's row cap, so these reads are paged
+    order = ("session_id", "question_number")
+    questions = select_in(supabase, "mock_interview_questions", "session_id", "session_id", session_ids, order)
+    answers = select_in(supabase, "mock_interview_answers", "session_id", "session_id", session_ids, order)
+    stress_data = select_in(supabase, "mock_interview_stress_analysis", "session_id, stress_score", "session_id", session_ids, order)
+
+    question_counts = Counter(row["session_id"] for row in questions)
+    answer_counts = Counter(row["session_id"] for row in answers)
+    stress_scores: Dict[str, List[float]] = {}
+    for entry in stress_data:
+        # Fix: Filter out None values before calculating
+        if entry.get("stress_score") is not None:
+            stress_scores.setdefault(entry["session_id"], []).append(entry["stress_score"])
+
+    enhanced_sessions = []
+    for session in sessions.data:
+        session_id = session["id"]
+        scores = stress_scores.get(session_id)
+        enhanced_sessions.append({
+            "id": session_id,
+            "user_id": session.get("user_id"),
+            "resume_id": session.get("resume_id"),
+            "start_time": session.get("start_time"),
+            "end_time": session.get("end_time"),
+            "status": session.get("status"),
+            "overall_score": session.get("overall_score"),
+            "question_count": question_counts.get(session_id, 0),
+            "answer_count": answer_counts.get(session_id, 0),
+            "average_stress": sum(scores) / len(scores) if scores else None,
+        })
+    return enhanced_sessions
+
 
 @router.delete("/session/{session_id}")
-async def delete_session(session_id: str, supabase=Depends(get_supabase)):
+async def delete_session(session_id: str, supabase=Depends(get_supabase), deletion_service=Depends(get_session_deletion_service)):
     """
     Delete a specific session and its related data (questions, answers, stress analysis, reports, files).
     """
@@ -95,45 +160,97 @@ async def delete_session(session_id: str, supabase=Depends(get_supabase)):
             raise HTTPException(status_code=404, detail="Session not found")
 
         logger.info(f"Session {session_id} found, proceeding with deletion")
+        deletion_service.delete_sessions([session_id])
 
-        # Fetch audio files (for deletion)
-        answers = supabase.table("mock_interview_answers").select("audio_url").eq("session_id", session_id).execute()
-        audio_paths = [a.get("audio_url") for a in (answers.data or []) if a.get("audio_url")]
+        logger.info(f"Deleted session {session_id}")
+        return {"status": "Session deleted", "session_id": session_id}
 
-        # Fetch questions (for video deletion - kept for cleanup of legacy data)
-        questions = supabase.table("mock_interview_questions").select("question_number").eq("session_id", session_id).execute()
-        question_numbers = [q["question_number"] for q in (questions.data or [])]
+    except Exception as e:
+        logger.error(f"Error deleting session {session_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error deleting session: {str(e)}")
 
-        # Delete related rows manually (safeguard against missing CASCADE)
-        supabase.table("mock_interview_questions").delete().eq("session_id", session_id).execute()
-        supabase.table("mock_interview_answers").delete().eq("session_id", session_id).execute()
-        supabase.table("mock_interview_stress_analysis").delete().eq("session_id", session_id).execute()
-        supabase.table("mock_interview_reports").delete().eq("session_id", session_id).execute()
+PURGE_BATCH_SIZE = 100
+PURGE_CONCURRENCY = 4
+PURGE_SELECT_PAGE = 1000
 
-        # Delete session
-        supabase.table("mock_interview_sessions").delete().eq("id", session_id).execute()
+class PurgeSessionsPayload(BaseModel):
+    session_ids: Optional[List[str]] = None
+    older_than_days: Optional[int] = Field(None, ge=1)
+    status: Optional[str] = None
+    dry_run: bool = False
 
-        # Delete audio files
-        for audio_path in audio_paths:
-            try:
-                supabase.storage.from_("mock.interview.answers").remove([audio_path])
-                logger.info(f"Deleted audio file: {audio_path}")
-            except Exception as e:
-                logger.warning(f"Failed to delete audio file {audio_path}: {str(e)}")
-
-        # Delete video files (Legacy cleanup)
-        for q_num in question_numbers:
-            video_path = f"videos/{session_id}/{q_num}/video.webm"
+@router.post("/sessions/purge")
+async def purge_sessions(
+    payload: PurgeSessionsPayload,
+    supabase=Depends(get_supabase),
+    deletion_service=Depends(get_session_deletion_service)
+):
+    """
+    Bulk-delete sessions by explicit id list and/or age (older than N days), optionally filtered by status.
+    Deletes run in batches of PURGE_BATCH_SIZE with at most PURGE_CONCURRENCY batches in flight.
+    """
+    if not payload.session_ids and payload.older_than_days is None:
+        raise HTTPException(status_code=400, detail="Provide session_ids and/or older_than_days.")
+    try:
+        for session_id in payload.session_ids or []:
             try:
-                supabase.storage.from_("mock.interview.videos").remove([video_path])
-                logger.info(f"Deleted video file: {video_path}")
-            except Exception as e:
-                # Ignore video deletion errors as we aren't using them anymore
-                pass
+                uuid.UUID(session_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid session_id format: {session_id}")
 
-        logger.info(f"Deleted session {session_id}")
-        return {"status": "Session deleted", "session_id": session_id}
+        session_ids = list(dict.fromkeys(payload.session_ids or []))
+        if payload.older_than_days is not None:
+            cutoff = (datetime.utcnow() - timedelta(days=payload.older_than_days)).isoformat()
+            seen = set(session_ids)
+            session_ids.extend(sid for sid in _select_session_ids(supabase, cutoff, payload.status) if sid not in seen)
+
+        if payload.dry_run or not session_ids:
+            return {"status": "Dry run" if payload.dry_run else "Nothing to delete", "matched": len(session_ids), "deleted": 0}
+
+        semaphore = asyncio.Semaphore(PURGE_CONCURRENCY)
 
+        async def _delete_batch(batch: List[str]) -> Dict:
+            async with semaphore:
+                return await asyncio.to_thread(deletion_service.delete_sessions, batch)
+
+        batches = [session_ids[i : i + PURGE_BATCH_SIZE] for i in range(0, len(session_ids), PURGE_BATCH_SIZE)]
+        results = await asyncio.gather(*(_delete_batch(batch) for batch in batches), return_exceptions=True)
+
+        deleted = sum(r["sessions"] for r in results if isinstance(r, dict))
+        failed_batches = [str(r) for r in results if isinstance(r, Exception)]
+        for error in failed_batches:
+            logger.error(f"Session purge batch failed: {error}")
+
+        logger.info(f"Purged {deleted}/{len(session_ids)} sessions in {len(batches)} batches")
+        return {
+            "status": "Sessions purged" if not failed_batches else "Sessions partially purged",
+            "matched": len(session_ids),
+            "deleted": deleted,
+            "failed_batches": len(failed_batches)
+        }
+
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        logger.error(f"Error deleting session {session_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error deleting session: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error purging sessions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error purging sessions: {str(e)}")
+
+def _select_session_ids(supabase, cutoff: str, status: Optional[str]) -> List[str]:
+    """All session ids with start_time before cutoff, fetched in pages."""
+    session_ids = []
+    offset = 0
+    while True:
+        query = supabase.table("mock_interview_sessions").select("id").lt("start_time", cutoff)
+        if status:
+            query = query.eq("status", status)
+        page = query.order("start_time").order("id").range(offset, offset + PURGE_SELECT_PAGE - 1).execute()
+        rows = page.data or []
+        session_ids.extend(row["id"] for row in rows)
+        if len(rows) < PURGE_SELECT_PAGE:
+            return session_ids
+        offset += PURGE_SELECT_PAGE
+
+@router.get("/rate-limits")
+async def get_rate_limits() -> Dict:
+    """Per-limiter counters for this process: calls, retries, 429s, throttle/backoff seconds, current rate and circuit state."""
+    return limiter_metrics()
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, Body, File, UploadFile
+from fastapi import APIRouter, HTTPException, Depends, Body, File, UploadFile, Query, BackgroundTasks
 from pydantic import BaseModel
-from api.dependencies import get_supabase, get_groq_service, get_whisper_service, get_report_service
+from api.dependencies import get_supabase, get_groq_service, get_whisper_service, get_report_service, get_question_cache, get_session_cache, get_report_cache, get_progress_aggregator
 from utils.supabase_utils import upload_file, download_file
 from utils.pdf_utils import extract_text_from_pdf
-from models.schemas import Question, NextQuestionResponse, FinalReportResponse, UserSummaryResponse
+from models.schemas import Question, NextQuestionResponse, SessionQuestionsResponse, FinalReportResponse, UserSummaryResponse
+from config.settings import settings
 import os
 from datetime import datetime
 import logging
@@ -43,7 +44,14 @@ async def test_supabase(supabase=Depends(get_supabase)):
         raise HTTPException(status_code=500, detail=f"Supabase error: {str(e)}")
 
 @router.post("/upload-resume/{mock_user_id}")
-async def upload_resume(mock_user_id: str, file: UploadFile = File(...), supabase=Depends(get_supabase)):
+async def upload_resume(
+    mock_user_id: str,
+    file: UploadFile = File(...),
+    pregenerate: bool = Query(settings.QUESTION_PREGENERATE_ON_UPLOAD, description="Start text extraction and question generation in the background"),
+    supabase=Depends(get_supabase),
+    groq_service=Depends(get_groq_service),
+    question_cache=Depends(get_question_cache)
+):
     try:
         try:
             uuid.UUID(mock_user_id)
@@ -72,8 +80,7 @@ async def upload_resume(mock_user_id: str, file: UploadFile = File(...), supabas
         file_extension = file.filename.rsplit(".", 1)[1]
         unique_filename = f"{base_filename}_{timestamp}.{file_extension}"
         file_path = f"{mock_user_id}/{unique_filename}"
-        file.file.seek(0)
-        upload_file("mock.interview.resumes", file_path, file.file.read())
+        upload_file("mock.interview.resumes", file_path, file_content)
 
         response = supabase.table("mock_interview_resumes").insert({
             "user_id": mock_user_id,
@@ -82,6 +89,10 @@ async def upload_resume(mock_user_id: str, file: UploadFile = File(...), supabas
 
         resume_id = response.data[0]["id"]
         logger.info(f"Resume uploaded for user {mock_user_id}: {file_path}, resume_id: {resume_id}")
+
+        if pregenerate:
+            question_cache.schedule_pregeneration(resume_id, file_content, groq_service)
+            logger.info(f"Scheduled question pre-generation for resume_id: {resume_id}")
         return {
             "status": "Resume uploaded",
             "resume_id": resume_id,
@@ -92,7 +103,17 @@ async def upload_resume(mock_user_id: str, file: UploadFile = File(...), supabas
         raise HTTPException(status_code=500, detail=f"Error uploading resume: {str(e)}")
 
 @router.post("/generate-questions/{mock_user_id}/{resume_id}")
-async def generate_questions(mock_user_id: str, resume_id: str, supabase=Depends(get_supabase), groq_service=Depends(get_groq_service)):
+async def generate_questions(
+    mock_user_id: str,
+    resume_id: str,
+    background_tasks: BackgroundTasks,
+    rotate: bool = Query(False, description="Cycle through cached question sets for this resume instead of reusing the latest one"),
+    supabase=Depends(get_supabase),
+    groq_service=Depends(get_groq_service),
+    question_cache=Depends(get_question_cache),
+    session_cache=Depends(get_session_cache),
+    progress=Depends(get_progress_aggregator)
+):
     try:
         try:
             uuid.UUID(mock_user_id)
@@ -105,20 +126,32 @@ async def generate_questions(mock_user_id: str, resume_id: str, supabase=Depends
             logger.warning(f"Invalid resume_id format: {resume_id}")
             raise HTTPException(status_code=400, detail="Invalid resume_id format. Must be a valid UUID.")
 
+        await question_cache.wait_for_pregeneration(resume_id)
+
         resume_data = supabase.table("mock_interview_resumes").select("*").eq("id", resume_id).execute()
         if not resume_data.data:
             logger.warning(f"Resume not found for resume_id: {resume_id}")
             raise HTTPException(status_code=404, detail="Resume not found")
-
-        file_path = resume_data.data[0]["file_path"]
-        file_response = download_file("mock.interview.resumes", file_path)
-
-        with open("temp.pdf", "wb") as f:
-            f.write(file_response)
-        resume_text = extract_text_from_pdf(file_response)
-        os.remove("temp.pdf")
-
-        questions = groq_service.generate_interview_questions(resume_text)
+        resume_row = resume_data.data[0]
+
+        # Pre-generated resumes already carry their hash/text, so a cache hit needs no download
+        content_hash = resume_row.get("content_hash")
+        resume_text = resume_row.get("resume_text")
+        file_response = None
+        if not content_hash:
+            file_response = download_file("mock.interview.resumes", resume_row["file_path"])
+            content_hash = question_cache.content_hash(file_response)
+
+        # Reuse a cached set for identical resumes; only extract + call the LLM on a miss
+        questions = question_cache.get_questions(content_hash, rotate=rotate)
+        if questions is None:
+            if not resume_text:
+                if file_response is None:
+                    file_response = download_file("mock.interview.resumes", resume_row["file_path"])
+                resume_text = extract_text_from_pdf(file_response)
+            # Limiter throttling/backoff blocks, so Groq calls run in a worker thread, not on the event loop
+            questions = await asyncio.to_thread(groq_service.generate_interview_questions, resume_text)
+            question_cache.store_questions(content_hash, questions)
 
         session_response = supabase.table("mock_interview_sessions").insert({
             "user_id": mock_user_id,
@@ -126,14 +159,21 @@ async def generate_questions(mock_user_id: str, resume_id: str, supabase=Depends
         }).execute()
         session_id = session_response.data[0]["id"]
 
-        for idx, question in enumerate(questions, start=1):
-            supabase.table("mock_interview_questions").insert({
+        # Single multi-row insert instead of one round trip per question
+        question_rows = [
+            {
                 "session_id": session_id,
                 "question_text": question["text"],
                 "category": question["category"],
                 "question_number": idx,
                 "is_answered": False
-            }).execute()
+            }
+            for idx, question in enumerate(questions, start=1)
+        ]
+        supabase.table("mock_interview_questions").insert(question_rows).execute()
+        # Prime the session cache so the first next-question call needs no query
+        session_cache.put(session_id, question_rows)
+        background_tasks.add_task(progress.refresh_session, session_id)
 
         logger.info(f"Generated {len(questions)} questions for session {session_id}")
         return {"status": "Questions generated", "session_id": session_id, "questions": [q["text"] for q in questions]}
@@ -142,7 +182,7 @@ async def generate_questions(mock_user_id: str, resume_id: str, supabase=Depends
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
 @router.get("/next-question/{session_id}/{question_number}", response_model=NextQuestionResponse)
-async def get_next_question(session_id: str, question_number: int, supabase=Depends(get_supabase)):
+async def get_next_question(session_id: str, question_number: int, supabase=Depends(get_supabase), session_cache=Depends(get_session_cache)):
     try:
         try:
             uuid.UUID(session_id)
@@ -150,31 +190,21 @@ async def get_next_question(session_id: str, question_number: int, supabase=Depe
             logger.warning(f"Invalid session_id format: {session_id}")
             raise HTTPException(status_code=400, detail="Invalid session_id format. Must be a valid UUID.")
 
-        # ROBUST FIX: Use list fetch to avoid 500 error on empty result
-        result = supabase.table("mock_interview_questions")\
-            .select("*")\
-            .eq("session_id", session_id)\
-            .eq("question_number", question_number)\
-            .execute()
+        # All questions + total count are loaded once per session, then served from memory
+        questions = session_cache.load(supabase, session_id)
+        question_data = questions.get(question_number)
 
-        if not result.data or len(result.data) == 0:
+        if not question_data:
             logger.info(f"Question {question_number} not found for session {session_id}. Assuming end of interview.")
             raise HTTPException(status_code=404, detail="End of interview")
 
-        question_data = result.data[0]
-
-        total_result = supabase.table("mock_interview_questions")\
-            .select("id", count="exact")\
-            .eq("session_id", session_id)\
-            .execute()
-        
         logger.info(f"Retrieved question {question_number} for session {session_id}")
         return {
             "status": "Question retrieved",
             "question": question_data["question_text"],
             "category": question_data["category"],
             "question_number": question_number,
-            "total_questions": total_result.count or 0
+            "total_questions": len(questions)
         }
 
     except HTTPException as he:
@@ -183,14 +213,54 @@ async def get_next_question(session_id: str, question_number: int, supabase=Depe
         logger.error(f"Error retrieving question: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving question: {str(e)}")
 
+@router.get("/questions/{session_id}", response_model=SessionQuestionsResponse)
+async def get_session_questions(session_id: str, supabase=Depends(get_supabase), session_cache=Depends(get_session_cache)):
+    """Return every question in the session at once so the frontend can prefetch."""
+    try:
+        try:
+            uuid.UUID(session_id)
+        except ValueError:
+            logger.warning(f"Invalid session_id format: {session_id}")
+            raise HTTPException(status_code=400, detail="Invalid session_id format. Must be a valid UUID.")
+
+        questions = session_cache.load(supabase, session_id)
+        if not questions:
+            logger.warning(f"No questions found for session {session_id}")
+            raise HTTPException(status_code=404, detail="No questions found for this session")
+
+        logger.info(f"Retrieved {len(questions)} questions for session {session_id}")
+        return {
+            "status": "Questions retrieved",
+            "session_id": session_id,
+            "total_questions": len(questions),
+            "questions": [
+                {
+                    "question_number": number,
+                    "question": q["question_text"],
+                    "category": q["category"]
+                }
+                for number, q in sorted(questions.items())
+            ]
+        }
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error retrieving questions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving questions: {str(e)}")
+
 @router.post("/submit-answer/{session_id}/{question_number}")
 async def submit_answer(
     session_id: str,
     question_number: int,
+    background_tasks: BackgroundTasks,
     payload: AnswerPayload | None = Body(None, embed=True),
     supabase=Depends(get_supabase),
     groq_service=Depends(get_groq_service),
-    whisper_service=Depends(get_whisper_service)
+    whisper_service=Depends(get_whisper_service),
+    session_cache=Depends(get_session_cache),
+    report_cache=Depends(get_report_cache),
+    progress=Depends(get_progress_aggregator)
 ):
     # Build audio path
     audio_path = f"answers/{session_id}/{question_number}/audio.webm"
@@ -225,27 +295,22 @@ async def submit_answer(
     temp_audio_path = f"temp_answer_{session_id}_{question_number}_audio.webm"
     
     try:
-        # Fetch question text using Robust Select (List) instead of Single
-        q_result = supabase.table("mock_interview_questions")\
-            .select("question_text")\
-            .eq("session_id", session_id)\
-            .eq("question_number", question_number)\
-            .execute()
-            
-        if not q_result.data or len(q_result.data) == 0:
+        # Question text comes from the session cache (one query per session at most)
+        question_data = session_cache.load(supabase, session_id).get(question_number)
+        if not question_data:
             logger.warning(f"Question not found for session {session_id} Q{question_number}")
             raise HTTPException(status_code=404, detail="Question not found")
         
-        question_text = q_result.data[0]["question_text"]
+        question_text = question_data["question_text"]
 
         # Transcribe audio
         with open(temp_audio_path, "wb") as f:
             f.write(audio_response)
         
-        final_answer_text = whisper_service.transcribe_audio(temp_audio_path)
+        final_answer_text = await asyncio.to_thread(whisper_service.transcribe_audio, temp_audio_path)
         
         # Evaluate answer
-        evaluation = groq_service.evaluate_answer(question_text, final_answer_text)
+        evaluation = await asyncio.to_thread(groq_service.evaluate_answer, question_text, final_answer_text)
         score = evaluation["score"]
         feedback = evaluation["feedback"]
 
@@ -260,11 +325,13 @@ async def submit_answer(
         
         # Save answer
         supabase.table("mock_interview_answers").upsert(answer_data, on_conflict="session_id,question_number").execute()
+        report_cache.invalidate(session_id)
 
         # Mark as answered
         supabase.table("mock_interview_questions").update({
             "is_answered": True
         }).eq("session_id", session_id).eq("question_number", question_number).execute()
+        background_tasks.add_task(progress.refresh_session, session_id)
 
         logger.info(f"Answer submitted for {session_id} Q{question_number}. Score: {score}")
         return {
@@ -287,7 +354,11 @@ async def submit_answer(
 
 
 @router.get("/final-report/{session_id}", response_model=FinalReportResponse)
-async def get_final_report(session_id: str, report_service=Depends(get_report_service)):
+async def get_final_report(
+    session_id: str,
+    refresh: bool = Query(False, description="Regenerate the report even if the stored one is up to date"),
+    report_service=Depends(get_report_service)
+):
     try:
         try:
             uuid.UUID(session_id)
@@ -296,7 +367,7 @@ async def get_final_report(session_id: str, report_service=Depends(get_report_se
             raise HTTPException(status_code=400, detail="Invalid session_id format. Must be a valid UUID.")
 
         logger.info(f"Generating final report for session {session_id}")
-        report = report_service.generate_final_report(session_id)
+        report = await asyncio.to_thread(report_service.generate_final_report, session_id, refresh=refresh)
         logger.info(f"Final report generated for session {session_id}")
         return report
     except Exception as e:
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from api.dependencies import get_supabase, get_whisper_service
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from api.dependencies import get_supabase, get_whisper_service, get_report_cache, get_progress_aggregator
 import logging
 import os
 import uuid
@@ -7,6 +7,11 @@ import asyncio
 import tempfile
 
 from utils.supabase_utils import download_file
+from config.settings import settings
+from core.acoustic_stress import analyze_audio, AcousticDecodeError
+from core.stress_scoring import (
+    words_per_minute, wpm_stress, stress_level, average_stress as average_stress_score, LOW_STRESS, NOT_ANALYZED
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,13 +25,17 @@ router = APIRouter(prefix="/stress", tags=["stress"])
 async def analyze_stress(
     session_id: str,
     question_number: int,
-    duration: float = Query(60.0, description="Duration of the audio recording in seconds"),
+    background_tasks: BackgroundTasks,
+    duration: float = Query(60.0, description="Duration of the audio recording in seconds (WPM engine only)"),
     supabase=Depends(get_supabase),
     whisper_service=Depends(get_whisper_service),
+    report_cache=Depends(get_report_cache),
+    progress=Depends(get_progress_aggregator),
 ):
     """
-    Analyze stress based on audio transcription and speaking speed (WPM).
-    Duration should be provided by the frontend for accuracy.
+    Analyze stress from the answer audio.
+    - wpm engine (default, or fallback if the audio can't be decoded): transcription speed; duration should be provided by the frontend.
+    - acoustic engine (STRESS_ENGINE=acoustic, not yet calibrated): local pause/pitch/energy/speaking-rate analysis, duration measured from the audio.
     """
     # Short buffer to ensure file availability
     await asyncio.sleep(2)
@@ -48,43 +57,38 @@ async def analyze_stress(
         logger.warning(f"Audio not found: {e}")
         raise HTTPException(status_code=404, detail="Audio not found in bucket")
 
-    # Write audio to a temp file for whisper
-    with tempfile.TemporaryDirectory() as tmp:
-        aud_file = os.path.join(tmp, "audio.webm")
-        with open(aud_file, "wb") as f:
-            f.write(raw_audio)
-
-        # Transcribe audio
-        # whisper_service is now GroqWhisperService from dependencies
-        transcript = whisper_service.transcribe_audio(aud_file)
-        
-        # Calculate metrics
-        word_count = len(transcript.split())
-        
-        # Sanity check duration to avoid division by zero
-        if duration < 1.0: 
-            duration = 60.0
-
-        wpm = (word_count / duration) * 60
-
-    # Heuristic stress scoring based on WPM
-    # Normal speaking rate is ~130-150 wpm.
-    # Too fast (>160) or too slow (<120) can indicate stress/nervousness.
-    stress = 50.0 # Base neutral score
-    
-    if wpm > 160:
-        stress += (wpm - 160) * 0.5
-    elif wpm < 110:
-        stress += (110 - wpm) * 0.5
-        
-    # Cap stress between 0 and 100
-    stress = max(0.0, min(100.0, stress))
-
-    level = (
-        "High" if stress > 70 else
-        "Moderate" if stress > 40 else
-        "Low"
-    )
+    # Local acoustic engine: decode once, no transcription call, true duration from the audio itself
+    engine = "wpm"
+    wpm = None
+    features = None
+    if settings.STRESS_ENGINE == "acoustic":
+        try:
+            result = await asyncio.to_thread(analyze_audio, raw_audio)
+            engine = "acoustic"
+            stress = result["score"]
+            features = result["features"]
+            individual_scores = result["individual_scores"]
+        except AcousticDecodeError as e:
+            logger.warning(f"Acoustic stress analysis unavailable, falling back to WPM: {e}")
+
+    if engine == "wpm":
+        # Write audio to a temp file for whisper
+        with tempfile.TemporaryDirectory() as tmp:
+            aud_file = os.path.join(tmp, "audio.webm")
+            with open(aud_file, "wb") as f:
+                f.write(raw_audio)
+
+            # Transcribe audio
+            # whisper_service is now GroqWhisperService from dependencies
+            transcript = await asyncio.to_thread(whisper_service.transcribe_audio, aud_file)
+            
+            word_count = len(transcript.split())
+
+        wpm = float(words_per_minute(word_count, duration))
+        stress = float(wpm_stress(wpm))
+        individual_scores = [{"metric": "wpm", "value": wpm, "score": stress}]
+
+    level = stress_level(stress)
 
     # Upsert into Supabase
     try:
@@ -94,19 +98,21 @@ async def analyze_stress(
                 "question_number": question_number,
                 "stress_score": stress,
                 "stress_level": level,
-                "individual_scores": [{"metric": "wpm", "value": wpm, "score": stress}],
+                "individual_scores": individual_scores,
             }, 
             on_conflict="session_id,question_number"
         ).execute()
+        report_cache.invalidate(session_id)
+        background_tasks.add_task(progress.refresh_session, session_id)
     except Exception as e:
         logger.error(f"Database error saving stress analysis: {e}")
         # We don't raise here to return the result to the user anyway
 
     logger.info(
         f"Stress analysis complete for {session_id}@Q{question_number}: "
-        f"{stress:.1f} ({level}) - WPM: {wpm:.1f}"
+        f"{stress:.1f} ({level}) - engine: {engine}"
     )
-    return {"stress_score": stress, "stress_level": level, "wpm": wpm}
+    return {"stress_score": stress, "stress_level": level, "wpm": wpm, "engine": engine, "features": features}
 
 @router.get("/average-stress/{session_id}")
 async def average_stress(session_id: str, supabase=Depends(get_supabase)):
@@ -129,25 +135,20 @@ async def average_stress(session_id: str, supabase=Depends(get_supabase)):
         # Return a neutral default instead of 404 to prevent frontend breakage
         return {
             "average_stress": 50.0,
-            "average_stress_level": "Not Analyzed",
+            "average_stress_level": NOT_ANALYZED,
             "individual_scores": []
         }
 
     scores = [e["stress_score"] for e in entries if e["stress_score"] is not None]
-    
-    if not scores:
+    avg = average_stress_score(scores)
+    if avg is None:
         return {
             "average_stress": 0.0,
-            "average_stress_level": "Low",
+            "average_stress_level": LOW_STRESS,
             "individual_scores": []
         }
 
-    avg = sum(scores) / len(scores)
-    level = (
-        "High" if avg > 70 else
-        "Moderate" if avg > 40 else
-        "Low"
-    )
+    level = stress_level(avg)
 
     logger.info(f"Average stress for {session_id}: {avg:.1f} ({level})")
     return {
@@ -0,0 +1,39 @@
+"""
+Benchmark for core/stress_scoring.py: scalar per-row scoring vs one vectorized pass.
+The heuristics' invariants (bounds, monotonicity, level ordering) are tested in tests/test_stress_scoring.py.
+Usage: python benchmark_stress_scoring.py [rows]
+"""
+import sys
+import time
+import numpy as np
+
+from core.stress_scoring import rescore_rows
+
+def run(rows: int):
+    rng = np.random.default_rng(0)
+
+    data = [
+        {"individual_scores": [{"metric": "wpm", "value": float(v)}]} if i % 2 else
+        {"individual_scores": [
+            {"metric": "speaking_rate", "value": float(v) / 30},
+            {"metric": "pause_ratio", "value": float(rng.uniform(0, 1))},
+            {"metric": "pitch_variability", "value": float(rng.uniform(0, 8))},
+            {"metric": "energy_variability", "value": float(rng.uniform(0, 30))}
+        ]}
+        for i, v in enumerate(rng.uniform(60, 240, rows))
+    ]
+
+    start = time.perf_counter()
+    for row in data:
+        rescore_rows([row])
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rescore_rows(data)
+    vectorized = time.perf_counter() - start
+
+    print(f"📊 {rows} rows - per-row: {scalar:.3f}s ({rows / scalar:,.0f} rows/s), "
+          f"batch: {vectorized:.3f}s ({rows / vectorized:,.0f} rows/s), speedup x{scalar / vectorized:.1f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -19,4 +19,32 @@ class Settings:
     # Fix: Centralize model name to prevent "Decommissioned" errors
     GROQ_MODEL_NAME = os.getenv("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
 
+    # Question set cache: reuse generated questions for identical resumes
+    QUESTION_CACHE_ENABLED = os.getenv("QUESTION_CACHE_ENABLED", "true").lower() == "true"
+    QUESTION_CACHE_MAX_SETS = int(os.getenv("QUESTION_CACHE_MAX_SETS", "3"))
+    # Opt-in: extract text + generate questions in the background as soon as a resume is uploaded
+    QUESTION_PREGENERATE_ON_UPLOAD = os.getenv("QUESTION_PREGENERATE_ON_UPLOAD", "false").lower() == "true"
+
+    # In-process cache of each session's question list (TTL + LRU)
+    SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "1800"))
+    SESSION_CACHE_MAX_SESSIONS = int(os.getenv("SESSION_CACHE_MAX_SESSIONS", "1024"))
+
+    # In-process cache of generated final reports (also validated against mock_interview_reports.fingerprint)
+    REPORT_CACHE_TTL_SECONDS = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "600"))
+    REPORT_CACHE_MAX_SESSIONS = int(os.getenv("REPORT_CACHE_MAX_SESSIONS", "512"))
+
+    # "wpm" = Whisper transcript speed, "acoustic" = local NumPy signal analysis (falls back to WPM if the audio
+    # can't be decoded). Acoustic stays opt-in until its bands are calibrated against recorded answers.
+    STRESS_ENGINE = os.getenv("STRESS_ENGINE", "wpm").lower()
+
+    # Shared Groq rate limiting / retry policy (core/rate_limiter.py), per process
+    GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+    GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+    GROQ_WHISPER_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_WHISPER_REQUESTS_PER_MINUTE", "20"))
+    GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+    GROQ_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("GROQ_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    GROQ_CIRCUIT_RESET_SECONDS = float(os.getenv("GROQ_CIRCUIT_RESET_SECONDS", "30"))
+    # Share of each budget that batch calls (re-scoring, resume screening) leave free for interactive ones
+    GROQ_INTERACTIVE_RESERVE = float(os.getenv("GROQ_INTERACTIVE_RESERVE", "0.3"))
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,205 @@
+# Local acoustic stress engine: decode the answer audio once into a NumPy buffer, extract
+# duration / pause ratio / pitch variability / energy / speaking rate with vectorized framing,
+# and combine them into a 0-100 stress score. No external API is involved.
+from typing import Dict, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from core.stress_scoring import acoustic_penalties, clamp_score, NEUTRAL_STRESS
+import numpy as np
+import shutil
+import subprocess
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.04
+HOP_SECONDS = 0.01
+MIN_PITCH_HZ = 75
+MAX_PITCH_HZ = 400
+MIN_PAUSE_SECONDS = 0.25
+# Syllable nuclei: energy peaks at least this far apart, standing this far above the dips around them
+MIN_SYLLABLE_SPACING_SECONDS = 0.1
+SYLLABLE_PROMINENCE_DB = 3.0
+SYLLABLE_BASE_WINDOW_SECONDS = 0.25
+
+class AcousticDecodeError(Exception):
+    """Raised when the audio cannot be decoded (ffmpeg missing or invalid input)."""
+
+def _ffmpeg_exe() -> str:
+    # moviepy pulls in imageio-ffmpeg, which ships a static ffmpeg binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        exe = shutil.which("ffmpeg")
+        if not exe:
+            raise AcousticDecodeError("ffmpeg is not available (install imageio-ffmpeg or ffmpeg)")
+        return exe
+
+def decode_audio(audio: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any ffmpeg-readable audio (webm/opus, mp3, wav...) to mono float32 samples in [-1, 1]."""
+    if not audio:
+        raise AcousticDecodeError("Empty audio")
+    try:
+        result = subprocess.run(
+            [_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+             "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+            input=audio,
+            capture_output=True,
+            check=True,
+            timeout=30
+        )
+    except subprocess.CalledProcessError as e:
+        raise AcousticDecodeError(f"ffmpeg failed: {e.stderr.decode(errors='ignore').strip()}")
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise AcousticDecodeError(f"ffmpeg failed: {str(e)}")
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+def frame_signal(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """(n_frames, frame_len) strided view of the signal, zero-padded to at least one frame."""
+    frame_len = int(FRAME_SECONDS * sample_rate)
+    hop = int(HOP_SECONDS * sample_rate)
+    if len(samples) < frame_len:
+        samples = np.pad(samples, (0, frame_len - len(samples)))
+    return sliding_window_view(samples, frame_len)[::hop]
+
+def _pitch_per_frame(frames: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """f0 and normalized autocorrelation peak strength per frame (FFT autocorrelation, all frames at once)."""
+    frame_len = frames.shape[1]
+    windowed = (frames - frames.mean(axis=1, keepdims=True)) * np.hanning(frame_len)
+    spectrum = np.fft.rfft(windowed, n=2 * frame_len, axis=1)
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2, axis=1)[:, :frame_len]
+    autocorr /= np.maximum(autocorr[:, :1], 1e-10)
+
+    min_lag = int(sample_rate / MAX_PITCH_HZ)
+    max_lag = min(int(sample_rate / MIN_PITCH_HZ), frame_len - 1)
+    lags = np.argmax(autocorr[:, min_lag:max_lag], axis=1) + min_lag
+    strength = autocorr[np.arange(len(lags)), lags]
+    return sample_rate / lags, strength
+
+def syllable_peaks(energy_db: np.ndarray, speech: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Frame indices of syllable nuclei: maxima of the smoothed energy envelope inside speech that rise
+    SYLLABLE_PROMINENCE_DB above the lowest point on both sides (within SYLLABLE_BASE_WINDOW_SECONDS),
+    kept greedily from the strongest down so no two are closer than MIN_SYLLABLE_SPACING_SECONDS.
+    """
+    envelope = np.convolve(energy_db, np.ones(7) / 7, mode="same")
+    if len(envelope) < 3:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.flatnonzero(
+        (envelope[1:-1] > envelope[:-2])
+        & (envelope[1:-1] >= envelope[2:])
+        & speech[1:-1]
+        & (envelope[1:-1] > threshold + 3.0)
+    ) + 1
+    if not len(candidates):
+        return candidates
+
+    # Lowest envelope point within the window to the left / right of every frame
+    window = int(SYLLABLE_BASE_WINDOW_SECONDS / HOP_SECONDS)
+    padded = np.pad(envelope, window, mode="edge")
+    left_base = sliding_window_view(padded[:-window], window + 1).min(axis=1)
+    right_base = sliding_window_view(padded[window:], window + 1).min(axis=1)
+    prominence = envelope[candidates] - np.maximum(left_base[candidates], right_base[candidates])
+    candidates = candidates[prominence >= SYLLABLE_PROMINENCE_DB]
+
+    min_spacing = int(round(MIN_SYLLABLE_SPACING_SECONDS / HOP_SECONDS))
+    kept = []
+    for index in candidates[np.argsort(-envelope[candidates], kind="stable")]:
+        if all(abs(index - other) >= min_spacing for other in kept):
+            kept.append(index)
+    return np.sort(np.array(kept, dtype=np.int64))
+
+def extract_features(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Dict[str, float]:
+    duration = len(samples) / sample_rate
+    frames = frame_signal(samples, sample_rate)
+
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    energy_db = 20 * np.log10(rms + 1e-10)
+
+    # Adaptive speech threshold: well above the noise floor, and not absurdly far below the loudest frame.
+    # With no quiet frames at all (continuous speech) the 10th percentile is speech itself, so the
+    # threshold never rises above 6 dB under the loudest frame.
+    noise_floor = np.percentile(energy_db, 10)
+    peak_db = energy_db.max()
+    threshold = max(min(noise_floor + 6.0, peak_db - 6.0), peak_db - 40.0, -55.0)
+    speech = energy_db > threshold
+
+    if not speech.any():
+        return {
+            "duration_seconds": duration,
+            "speech_seconds": 0.0,
+            "pause_ratio": 1.0,
+            "pitch_mean_hz": 0.0,
+            "pitch_variability_semitones": 0.0,
+            "energy_db": float(energy_db.mean()),
+            "energy_variability_db": 0.0,
+            "speaking_rate": 0.0
+        }
+
+    # Pauses are silent runs of at least MIN_PAUSE_SECONDS between the first and last speech frame;
+    # shorter gaps are ordinary inter-syllable silence and count as speaking time
+    speech_idx = np.flatnonzero(speech)
+    active = speech[speech_idx[0]:speech_idx[-1] + 1]
+    edges = np.diff(np.concatenate(([0], (~active).astype(np.int8), [0])))
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    run_lengths = run_ends - run_starts
+    pause_frames = run_lengths[run_lengths >= int(MIN_PAUSE_SECONDS / HOP_SECONDS)].sum()
+    pause_ratio = pause_frames / len(active)
+    speech_seconds = (len(active) - pause_frames) * HOP_SECONDS
+
+    f0, strength = _pitch_per_frame(frames, sample_rate)
+    voiced = speech & (strength > 0.3)
+    if voiced.sum() >= 3:
+        voiced_f0 = f0[voiced]
+        semitones = 12 * np.log2(voiced_f0 / np.median(voiced_f0))
+        pitch_mean = float(voiced_f0.mean())
+        pitch_variability = float(semitones.std())
+    else:
+        pitch_mean, pitch_variability = 0.0, 0.0
+
+    # Speaking rate is syllables over the span from first to last speech frame; pauses are scored
+    # separately through pause_ratio, so they must not also inflate the rate
+    peaks = syllable_peaks(energy_db, speech, threshold)
+    active_seconds = len(active) * HOP_SECONDS
+    speaking_rate = len(peaks) / active_seconds if active_seconds > 0 else 0.0
+
+    return {
+        "duration_seconds": duration,
+        "speech_seconds": float(speech_seconds),
+        "pause_ratio": float(pause_ratio),
+        "pitch_mean_hz": pitch_mean,
+        "pitch_variability_semitones": pitch_variability,
+        "energy_db": float(energy_db[speech].mean()),
+        "energy_variability_db": float(energy_db[speech].std()),
+        "speaking_rate": float(speaking_rate)
+    }
+
+def score_features(features: Dict[str, float]) -> Tuple[float, List[Dict]]:
+    """Score the extracted features with the shared acoustic heuristic (core/stress_scoring.py)."""
+    if features["speech_seconds"] <= 0:
+        return NEUTRAL_STRESS, [{"metric": "speech_detected", "value": 0.0, "score": 0.0}]
+
+    values = {
+        "speaking_rate": features["speaking_rate"],
+        "pause_ratio": features["pause_ratio"],
+        "pitch_variability": features["pitch_variability_semitones"],
+        "energy_variability": features["energy_variability_db"]
+    }
+    penalties = acoustic_penalties(**values)
+    stress = float(clamp_score(NEUTRAL_STRESS + sum(penalties.values())))
+    return stress, [
+        *({"metric": metric, "value": value, "score": float(penalties[metric])} for metric, value in values.items()),
+        {"metric": "duration", "value": features["duration_seconds"], "score": 0.0}
+    ]
+
+def analyze_audio(audio: bytes) -> Dict:
+    """Decode once, extract features, score. Raises AcousticDecodeError if the audio cannot be decoded."""
+    samples = decode_audio(audio)
+    features = extract_features(samples)
+    score, individual_scores = score_features(features)
+    logger.info(
+        f"Acoustic stress - duration: {features['duration_seconds']:.1f}s, rate: {features['speaking_rate']:.2f} syl/s, "
+        f"pauses: {features['pause_ratio']:.2f}, pitch var: {features['pitch_variability_semitones']:.2f} st, score: {score:.1f}"
+    )
+    return {"score": score, "features": features, "individual_scores": individual_scores}
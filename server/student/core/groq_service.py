@@ -1,15 +1,56 @@
 from groq import Groq
 from config.settings import settings
+from core.rate_limiter import get_limiter, estimate_tokens, INTERACTIVE
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
 class GroqService:
-    def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+    # Bump whenever the question prompt or parser changes so cached sets are regenerated
+    QUESTION_PROMPT_VERSION = "v1"
+
+    # Fallback question sets (never cached)
+    DEFAULT_QUESTIONS = [
+        {"text": "Tell me about yourself.", "category": "hr"},
+        {"text": "Describe a challenging project you worked on.", "category": "technical"},
+        {"text": "Why do you want to work here?", "category": "hr"}
+    ]
+    ERROR_QUESTIONS = [
+        {"text": "Could not generate specific questions. Please tell us about your experience.", "category": "general"}
+    ]
+
+    def __init__(self, priority: str = INTERACTIVE):
+        # Retries are owned by the shared limiter, not the SDK
+        self.client = Groq(api_key=settings.GROQ_API_KEY, max_retries=0)
         # Use the model defined in settings (e.g., llama-3.3-70b-versatile)
         self.model = settings.GROQ_MODEL_NAME
+        self.limiter = get_limiter(
+            "groq-chat",
+            requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE,
+            max_retries=settings.GROQ_MAX_RETRIES,
+            failure_threshold=settings.GROQ_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.GROQ_CIRCUIT_RESET_SECONDS,
+            interactive_reserve=settings.GROQ_INTERACTIVE_RESERVE
+        )
+        # Live interview calls are interactive; offline jobs construct the service with BATCH
+        self.priority = priority
+
+    def chat(self, messages: list, max_tokens: int, **kwargs):
+        """
+        Chat completion through the shared rate limiter (budgets, retries with backoff, circuit breaker).
+        Blocks while throttled or backing off: async routes call it through asyncio.to_thread.
+        """
+        return self.limiter.call(
+            self.client.chat.completions.create,
+            messages=messages,
+            model=self.model,
+            max_tokens=max_tokens,
+            estimated_tokens=estimate_tokens(messages, max_tokens),
+            priority=self.priority,
+            **kwargs
+        )
 
     def generate_interview_questions(self, resume_text: str) -> list:
         """Generate interview questions based on resume text."""
@@ -46,12 +87,11 @@ Format each section with the following headings and numbered questions:
 Ensure each question starts with a number, followed by a period and a space (e.g., "1. "), and do not include any additional text outside of the specified format.
 """
         try:
-            completion = self.client.chat.completions.create(
+            completion = self.chat(
                 messages=[
                     {"role": "system", "content": "You are a helpful AI assistant that generates interview questions based on resumes."},
                     {"role": "user", "content": prompt}
                 ],
-                model=self.model,
                 max_tokens=1024
             )
             response_text = completion.choices[0].message.content
@@ -91,23 +131,20 @@ Ensure each question starts with a number, followed by a period and a space (e.g
             if not questions:
                 logger.warning("No questions parsed from AI response. Returning defaults.")
                 # Fallback questions if parsing fails completely
-                return [
-                    {"text": "Tell me about yourself.", "category": "hr"},
-                    {"text": "Describe a challenging project you worked on.", "category": "technical"},
-                    {"text": "Why do you want to work here?", "category": "hr"}
-                ]
+                return list(self.DEFAULT_QUESTIONS)
 
             return questions
 
         except Exception as e:
             logger.error(f"Error generating questions: {str(e)}")
             # Return safe fallback so the app doesn't crash
-            return [
-                {"text": "Could not generate specific questions. Please tell us about your experience.", "category": "general"}
-            ]
+            return list(self.ERROR_QUESTIONS)
 
     def evaluate_answer(self, question_text: str, answer_text: str) -> dict:
-        """Evaluate a candidate's answer using Groq API and return a score and feedback."""
+        """
+        Evaluate a candidate's answer using Groq API and return a score and feedback.
+        "evaluated" is False when the score is a placeholder (API error or unparseable reply).
+        """
         prompt = f"""
 You are an AI interviewer evaluating a candidate's answer for a Software Engineer role.
 
@@ -126,12 +163,11 @@ Score: [number]
 Feedback: [your feedback]
 """
         try:
-            completion = self.client.chat.completions.create(
+            completion = self.chat(
                 messages=[
                     {"role": "system", "content": "You are a helpful AI assistant that evaluates interview answers."},
                     {"role": "user", "content": prompt}
                 ],
-                model=self.model,
                 max_tokens=256
             )
             response_text = completion.choices[0].message.content.strip()
@@ -145,7 +181,8 @@ Feedback: [your feedback]
                 logger.warning(f"Strict parsing failed for response: {response_text[:50]}...")
                 return {
                     "score": 5, 
-                    "feedback": "Could not parse specific feedback, but answer was recorded."
+                    "feedback": "Could not parse specific feedback, but answer was recorded.",
+                    "evaluated": False
                 }
 
             score = int(score_match.group(1))
@@ -154,11 +191,12 @@ Feedback: [your feedback]
             # Normalize score
             score = max(1, min(10, score))
 
-            return {"score": score, "feedback": feedback}
+            return {"score": score, "feedback": feedback, "evaluated": True}
             
         except Exception as e:
             logger.error(f"Error evaluating answer: {str(e)}")
             return {
                 "score": 0, 
-                "feedback": "An error occurred while evaluating the answer."
+                "feedback": "An error occurred while evaluating the answer.",
+                "evaluated": False
             }
\ No newline at end of file
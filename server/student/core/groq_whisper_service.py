@@ -1,5 +1,6 @@
 from groq import Groq
 from config.settings import settings
+from core.rate_limiter import get_limiter
 import logging
 
 # Configure logger
@@ -7,9 +8,18 @@ logger = logging.getLogger(__name__)
 
 class GroqWhisperService:
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Retries are owned by the shared limiter, not the SDK
+        self.client = Groq(api_key=settings.GROQ_API_KEY, max_retries=0)
         # Using Groq's optimized Whisper model
         self.model = "whisper-large-v3-turbo"
+        self.limiter = get_limiter(
+            "groq-whisper",
+            requests_per_minute=settings.GROQ_WHISPER_REQUESTS_PER_MINUTE,
+            max_retries=settings.GROQ_MAX_RETRIES,
+            failure_threshold=settings.GROQ_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.GROQ_CIRCUIT_RESET_SECONDS,
+            interactive_reserve=settings.GROQ_INTERACTIVE_RESERVE
+        )
 
     def transcribe_audio(self, audio_file_path: str) -> str:
         """
@@ -21,15 +31,18 @@ class GroqWhisperService:
         Returns:
             str: Transcribed text.
         """
-        try:
+        def _transcribe():
+            # Reopened on every attempt so a retry re-sends the whole file
             with open(audio_file_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
+                return self.client.audio.transcriptions.create(
                     file=audio_file,
                     model=self.model,
                     # response_format="text" returns the string directly
                     response_format="text"
                 )
-            return transcription
+
+        try:
+            return self.limiter.call(_transcribe)
         except Exception as e:
             logger.error(f"Error transcribing audio with Groq Whisper: {str(e)}")
             raise Exception(f"Error transcribing audio with Groq Whisper: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,222 @@
+from models.schemas import UserSummaryResponse
+from utils.supabase_utils import select_in
+from datetime import datetime
+from typing import List, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+def compute_session_stats(questions: List[Dict], answers: List[Dict], stress_rows: List[Dict]) -> Dict:
+    """
+    Per-session aggregates used by the user summary.
+    Category scores use the stress score if available, otherwise the inverted answer score (5.0 if neither).
+    """
+    answers_by_number = {a["question_number"]: a for a in answers}
+    stress_by_number = {s["question_number"]: s for s in stress_rows}
+
+    stress_scores = [s["stress_score"] for s in stress_rows if s["stress_score"] is not None]
+    answer_scores = [a["score"] for a in answers if a["score"] is not None]
+
+    category_stats: Dict[str, Dict] = {}
+    for question in questions:
+        answer = answers_by_number.get(question["question_number"])
+        stress = stress_by_number.get(question["question_number"])
+        score = stress["stress_score"] if stress and stress["stress_score"] is not None else (10 - answer["score"] if answer and answer["score"] is not None else 5.0)
+        data = category_stats.setdefault(question["category"], {"total_score": 0.0, "count": 0})
+        data["total_score"] += score
+        data["count"] += 1
+
+    return {
+        "total_questions": len(questions),
+        "questions_attempted": len(answers),
+        "average_stress": sum(stress_scores) / len(stress_scores) if stress_scores else 0.0,
+        "average_answer_score": sum(answer_scores) / len(answer_scores) if answer_scores else None,
+        "category_stats": category_stats
+    }
+
+def merge_category_stats(totals: Dict[str, Dict], delta: Dict[str, Dict], sign: int = 1) -> Dict[str, Dict]:
+    """Add (sign=1) or subtract (sign=-1) one session's category sums from running totals. Empty categories are dropped."""
+    merged = {category: dict(data) for category, data in totals.items()}
+    for category, data in delta.items():
+        entry = merged.setdefault(category, {"total_score": 0.0, "count": 0})
+        entry["total_score"] += sign * data["total_score"]
+        entry["count"] += sign * data["count"]
+    return {category: data for category, data in merged.items() if data["count"] > 0}
+
+def build_user_summary(mock_user_id: str, session_trend: List[Dict], category_stats: Dict[str, Dict]) -> UserSummaryResponse:
+    """Assemble the response from per-session stats (ordered by start_time) and category running sums."""
+    average_stress_trend = [entry["average_stress"] for entry in session_trend]
+    answer_scores = [entry["average_answer_score"] for entry in session_trend if entry.get("average_answer_score") is not None]
+
+    weakest_question_types = {
+        category: {
+            "average_score": data["total_score"] / data["count"],
+            "question_count": data["count"]
+        }
+        for category, data in category_stats.items() if data["count"] > 0
+    }
+
+    # Difference between first and last session
+    progress = {
+        "stress_improvement": average_stress_trend[0] - average_stress_trend[-1] if len(average_stress_trend) > 1 else 0.0,
+        "answer_score_improvement": answer_scores[-1] - answer_scores[0] if len(answer_scores) > 1 else 0.0
+    }
+
+    return UserSummaryResponse(
+        mock_user_id=mock_user_id,
+        total_sessions=len(session_trend),
+        average_stress_trend=average_stress_trend,
+        weakest_question_types=weakest_question_types,
+        progress_over_time=progress
+    )
+
+class ProgressAggregator:
+    """
+    Materialized per-user progress, kept in two tables:
+    - mock_interview_session_stats: one row per session (averages, counts, category sums)
+    - mock_interview_user_stats: one row per user (category running sums + ordered per-session trend)
+    Writers call refresh_session(), which rewrites the session row and recomputes the user row from
+    all session rows (refresh_users); the user summary is then a single-row read.
+    A user row is created lazily from a full recomputation (store_user) the first time a summary is requested.
+    """
+    SESSION_TABLE = "mock_interview_session_stats"
+    USER_TABLE = "mock_interview_user_stats"
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    def get_user_summary(self, mock_user_id: str) -> Optional[UserSummaryResponse]:
+        """Return the materialized summary, or None if the user has no aggregate row yet."""
+        try:
+            result = self.supabase.table(self.USER_TABLE)\
+                .select("session_trend, category_stats")\
+                .eq("user_id", mock_user_id)\
+                .execute()
+        except Exception as e:
+            logger.warning(f"Progress aggregate read failed for {mock_user_id}: {str(e)}")
+            return None
+        if not result.data:
+            return None
+        row = result.data[0]
+        return build_user_summary(mock_user_id, row.get("session_trend") or [], row.get("category_stats") or {})
+
+    def store_user(self, mock_user_id: str, session_rows: List[Dict]) -> None:
+        """Write a full recomputation: every session stats row plus the user aggregate row."""
+        category_stats: Dict[str, Dict] = {}
+        for row in session_rows:
+            category_stats = merge_category_stats(category_stats, row["category_stats"])
+        now = datetime.utcnow().isoformat()
+        try:
+            if session_rows:
+                self.supabase.table(self.SESSION_TABLE).upsert(
+                    [{**row, "updated_at": now} for row in session_rows],
+                    on_conflict="session_id"
+                ).execute()
+            self.supabase.table(self.USER_TABLE).upsert({
+                "user_id": mock_user_id,
+                "category_stats": category_stats,
+                "session_trend": [self._trend_entry(row) for row in session_rows],
+                "updated_at": now
+            }, on_conflict="user_id").execute()
+            logger.info(f"Stored progress aggregates for {mock_user_id} ({len(session_rows)} sessions)")
+        except Exception as e:
+            logger.warning(f"Failed to store progress aggregates for {mock_user_id}: {str(e)}")
+
+    def refresh_session(self, session_id: str) -> None:
+        """Recompute one session's stats row, then recompute its user's totals from all session rows."""
+        try:
+            session = self.supabase.table("mock_interview_sessions").select(
+                "id, user_id, start_time, "
+                "mock_interview_questions(question_number, category), "
+                "mock_interview_answers(question_number, score), "
+                "mock_interview_stress_analysis(question_number, stress_score)"
+            ).eq("id", session_id).execute()
+            if not session.data:
+                return
+            session_data = session.data[0]
+            mock_user_id = session_data["user_id"]
+
+            stats = compute_session_stats(
+                session_data.get("mock_interview_questions") or [],
+                session_data.get("mock_interview_answers") or [],
+                session_data.get("mock_interview_stress_analysis") or []
+            )
+            self.supabase.table(self.SESSION_TABLE).upsert({
+                "session_id": session_id,
+                "user_id": mock_user_id,
+                "start_time": session_data.get("start_time"),
+                **stats,
+                "updated_at": datetime.utcnow().isoformat()
+            }, on_conflict="session_id").execute()
+            self.refresh_users([mock_user_id])
+        except Exception as e:
+            logger.warning(f"Failed to refresh progress aggregates for session {session_id}: {str(e)}")
+
+    def remove_sessions(self, session_ids: List[str]) -> None:
+        """Drop deleted sessions' stats rows and recompute their users' totals (three round trips for any batch)."""
+        if not session_ids:
+            return
+        try:
+            previous = self.supabase.table(self.SESSION_TABLE)\
+                .select("user_id")\
+                .in_("session_id", session_ids)\
+                .execute()
+            if not previous.data:
+                return
+            self.supabase.table(self.SESSION_TABLE).delete().in_("session_id", session_ids).execute()
+            self.refresh_users([row["user_id"] for row in previous.data])
+        except Exception as e:
+            logger.warning(f"Failed to remove {len(session_ids)} sessions from progress aggregates: {str(e)}")
+
+    def refresh_users(self, user_ids: List[str]) -> None:
+        """
+        Recompute the users' aggregate rows from mock_interview_session_stats.
+        Totals are never patched with deltas: concurrent refreshes and a failure between writes
+        both converge on the next refresh. refresh_user_progress() does it in one locked transaction.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return
+        try:
+            self.supabase.rpc("refresh_user_progress", {"p_user_ids": user_ids}).execute()
+            return
+        except Exception as e:
+            logger.warning(f"refresh_user_progress() RPC not found or failed, recomputing in Python: {str(e)}")
+
+        existing = self.supabase.table(self.USER_TABLE).select("user_id").in_("user_id", user_ids).execute()
+        user_ids = [row["user_id"] for row in existing.data or []]
+        if not user_ids:
+            # No aggregate yet; the next summary read recomputes and stores the full history
+            return
+        # Users with hundreds of sessions pass PostgREST's row cap, so this read is paged
+        rows = select_in(
+            self.supabase, self.SESSION_TABLE,
+            "session_id, user_id, start_time, average_stress, average_answer_score, category_stats",
+            "user_id", user_ids, order=("start_time", "session_id")
+        )
+        sessions_by_user: Dict[str, List[Dict]] = {user_id: [] for user_id in user_ids}
+        for row in rows:
+            sessions_by_user[row["user_id"]].append(row)
+
+        now = datetime.utcnow().isoformat()
+        updates = []
+        for user_id, session_rows in sessions_by_user.items():
+            category_stats: Dict[str, Dict] = {}
+            for row in session_rows:
+                category_stats = merge_category_stats(category_stats, row.get("category_stats") or {})
+            updates.append({
+                "user_id": user_id,
+                "category_stats": category_stats,
+                "session_trend": [self._trend_entry(row) for row in session_rows],
+                "updated_at": now
+            })
+        self.supabase.table(self.USER_TABLE).upsert(updates, on_conflict="user_id").execute()
+
+    @staticmethod
+    def _trend_entry(session_row: Dict) -> Dict:
+        return {
+            "session_id": session_row["session_id"],
+            "start_time": session_row.get("start_time"),
+            "average_stress": session_row["average_stress"],
+            "average_answer_score": session_row["average_answer_score"]
+        }
@@ -0,0 +1,133 @@
+from config.settings import settings
+from core.groq_service import GroqService
+from utils.pdf_utils import extract_text_from_pdf
+from datetime import datetime
+from typing import List, Dict, Optional
+import hashlib
+import logging
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+# resume_id -> in-flight pre-generation task (per process)
+_pending_pregenerations: Dict[str, asyncio.Task] = {}
+
+class QuestionCacheService:
+    """
+    Stores generated question sets in mock_interview_question_sets, keyed by
+    resume content hash + prompt version, so identical resumes skip the LLM call.
+    """
+    TABLE = "mock_interview_question_sets"
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+        self.prompt_version = GroqService.QUESTION_PROMPT_VERSION
+        self.max_sets = max(1, settings.QUESTION_CACHE_MAX_SETS)
+        self.enabled = settings.QUESTION_CACHE_ENABLED
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """SHA-256 of the raw resume bytes."""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def is_cacheable(questions: List[Dict]) -> bool:
+        """Fallback sets returned on LLM/parse errors must never be cached."""
+        return bool(questions) and questions not in (GroqService.DEFAULT_QUESTIONS, GroqService.ERROR_QUESTIONS)
+
+    def get_questions(self, content_hash: str, rotate: bool = False) -> Optional[List[Dict]]:
+        """
+        Return a cached question set for this resume, or None if a new set should be generated.
+        - rotate=False: reuse the most recently used set.
+        - rotate=True: return None until max_sets sets exist, then cycle through the least recently used.
+        """
+        if not self.enabled:
+            return None
+        try:
+            result = self.supabase.table(self.TABLE)\
+                .select("id, questions")\
+                .eq("content_hash", content_hash)\
+                .eq("prompt_version", self.prompt_version)\
+                .order("last_used_at", desc=not rotate)\
+                .execute()
+        except Exception as e:
+            logger.warning(f"Question cache lookup failed, generating fresh questions: {str(e)}")
+            return None
+
+        sets = result.data or []
+        if not sets or (rotate and len(sets) < self.max_sets):
+            return None
+
+        chosen = sets[0]
+        try:
+            self.supabase.table(self.TABLE).update({
+                "last_used_at": datetime.utcnow().isoformat()
+            }).eq("id", chosen["id"]).execute()
+        except Exception as e:
+            logger.warning(f"Failed to touch question set {chosen['id']}: {str(e)}")
+
+        logger.info(f"Question cache hit for {content_hash[:12]} (set {chosen['id']}, rotate={rotate})")
+        return chosen["questions"]
+
+    def store_questions(self, content_hash: str, questions: List[Dict]) -> None:
+        """Save a freshly generated set. Failures are logged, never raised."""
+        if not self.enabled or not self.is_cacheable(questions):
+            return
+        now = datetime.utcnow().isoformat()
+        try:
+            self.supabase.table(self.TABLE).insert({
+                "content_hash": content_hash,
+                "prompt_version": self.prompt_version,
+                "questions": questions,
+                "created_at": now,
+                "last_used_at": now
+            }).execute()
+            logger.info(f"Cached {len(questions)} questions for {content_hash[:12]}")
+        except Exception as e:
+            logger.warning(f"Failed to cache question set for {content_hash[:12]}: {str(e)}")
+
+    def pregenerate_questions(self, resume_id: str, content: bytes, groq_service) -> None:
+        """
+        Extract resume text and warm the question cache ahead of generate_questions.
+        Stores content_hash/resume_text on the resume row so the session can be built without re-downloading the PDF.
+        The LLM call is skipped when the question cache is disabled.
+        """
+        content_hash = self.content_hash(content)
+        resume_text = extract_text_from_pdf(content)
+        try:
+            self.supabase.table("mock_interview_resumes").update({
+                "content_hash": content_hash,
+                "resume_text": resume_text
+            }).eq("id", resume_id).execute()
+        except Exception as e:
+            logger.warning(f"Failed to store extracted text for resume {resume_id}: {str(e)}")
+
+        if not self.enabled:
+            # Nowhere to keep the set: generate_questions would call the LLM again anyway
+            logger.info(f"Question pre-generation skipped for resume {resume_id}: QUESTION_CACHE_ENABLED is off")
+            return
+        if self.get_questions(content_hash) is not None:
+            logger.info(f"Pre-generation skipped for resume {resume_id}: question set already cached")
+            return
+        questions = groq_service.generate_interview_questions(resume_text)
+        self.store_questions(content_hash, questions)
+        logger.info(f"Pre-generated {len(questions)} questions for resume {resume_id}")
+
+    def schedule_pregeneration(self, resume_id: str, content: bytes, groq_service) -> None:
+        """Run pregenerate_questions in a worker thread without blocking the upload response."""
+        async def _run():
+            try:
+                await asyncio.to_thread(self.pregenerate_questions, resume_id, content, groq_service)
+            except Exception as e:
+                logger.error(f"Question pre-generation failed for resume {resume_id}: {str(e)}")
+            finally:
+                _pending_pregenerations.pop(resume_id, None)
+
+        _pending_pregenerations[resume_id] = asyncio.get_running_loop().create_task(_run())
+
+    async def wait_for_pregeneration(self, resume_id: str) -> None:
+        """If a pre-generation for this resume is still running, wait for it instead of duplicating the LLM call."""
+        task = _pending_pregenerations.get(resume_id)
+        if task is not None:
+            logger.info(f"Waiting for in-flight question pre-generation for resume {resume_id}")
+            await asyncio.shield(task)
\ No newline at end of file
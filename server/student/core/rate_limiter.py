@@ -0,0 +1,369 @@
+# Shared rate limiting and retry policy for Groq calls (chat completions and Whisper).
+# Stdlib only, so the recruiter pipeline (server/process_resumes.py) can load the same implementation.
+#
+# Each named limiter combines:
+# - two token buckets: requests/minute and tokens/minute, consumed before every attempt
+# - priority classes: interactive calls are served first and keep a reserved share of each budget;
+#   batch calls also draw from their own buckets refilled at (1 - reserve) of the rate, so they soak
+#   up idle quota without ever taking the reserved share of the throughput from live traffic
+# Budgets live in process memory: separate processes (the student API, the recruiter pipeline)
+# each get their own and do not coordinate.
+# - adaptive rate: a 429 halves the refill rate, every success recovers a little of it (AIMD)
+# - jittered exponential backoff that honors Retry-After / x-ratelimit-reset-* hints
+# - a circuit breaker that fails fast after repeated failures instead of queueing more calls
+# - counters for throttle time, backoff time, retries and rejections, plus p50/p99 queue wait per class
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+import random
+import re
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITY_CLASSES = (INTERACTIVE, BATCH)
+# Queue waits kept per class for the percentiles
+QUEUE_WAIT_SAMPLES = 1000
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# SDK exceptions without a status code that are still worth retrying (groq and openai share these names)
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "Timeout", "ConnectionError"}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+class TokenBucket:
+    """Token bucket. Not locked itself; PriorityScheduler serializes access."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def shortfall(self, amount: float, floor: float = 0.0) -> float:
+        """Seconds until amount can be taken while leaving at least floor in the bucket (0 if it can now)."""
+        self._refill()
+        missing = amount + floor - self._tokens
+        return max(0.0, missing / self.refill_per_second)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) budget after the fact, e.g. estimated vs actual token usage."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def set_rate(self, refill_per_second: float) -> None:
+        self._refill()
+        self.refill_per_second = refill_per_second
+
+class PriorityScheduler:
+    """
+    Admits calls against a set of token buckets by priority class.
+    - interactive: may use the whole bucket, and any waiting interactive call blocks new batch admissions
+    - batch: may only take budget above reserved_fraction of each bucket's capacity, and must also
+      cover the amount from a batch bucket refilled at (1 - reserved_fraction) of the shared rate, so
+      sustained batch load gets at most that share of the throughput, not just of the burst
+    Records how long each call waited for admission.
+    """
+
+    def __init__(self, buckets: List[TokenBucket], reserved_fraction: float = 0.3):
+        self.buckets = buckets
+        self.reserved_fraction = min(max(reserved_fraction, 0.0), 0.9)
+        share = 1.0 - self.reserved_fraction
+        self.batch_buckets = [TokenBucket(b.capacity * share, b.refill_per_second * share) for b in buckets]
+        self._cond = threading.Condition()
+        self._waiting = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._waits = {priority: deque(maxlen=QUEUE_WAIT_SAMPLES) for priority in PRIORITY_CLASSES}
+        self._admitted = {priority: 0 for priority in PRIORITY_CLASSES}
+
+    def acquire(self, amounts: List[float], priority: str = INTERACTIVE) -> float:
+        """Block until every bucket can cover its amount for this class, take it, and return the time waited."""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        batch = priority == BATCH
+        floors = [b.capacity * self.reserved_fraction if batch else 0.0 for b in self.buckets]
+        # Anything larger than what the class may ever hold is let through once the bucket is that full
+        amounts = [min(float(a), b.capacity - f) for a, b, f in zip(amounts, self.buckets, floors)]
+        checks = list(zip(amounts, self.buckets, floors))
+        if batch:
+            checks += [(min(a, b.capacity), b, 0.0) for a, b in zip(amounts, self.batch_buckets)]
+
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    if batch and self._waiting[INTERACTIVE]:
+                        self._cond.wait()
+                        continue
+                    delay = max(b.shortfall(a, f) for a, b, f in checks)
+                    if delay == 0:
+                        for amount, bucket, _ in checks:
+                            bucket.take(amount)
+                        break
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[priority] -= 1
+                # Wake batch callers parked behind interactive ones
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self._waits[priority].append(waited)
+            self._admitted[priority] += 1
+        return waited
+
+    def adjust(self, bucket: TokenBucket, amount: float, priority: str = INTERACTIVE) -> None:
+        with self._cond:
+            bucket.adjust(amount)
+            if priority == BATCH:
+                self.batch_buckets[self.buckets.index(bucket)].adjust(amount)
+            self._cond.notify_all()
+
+    def set_rates(self, rates: List[float]) -> None:
+        share = 1.0 - self.reserved_fraction
+        with self._cond:
+            for bucket, batch_bucket, rate in zip(self.buckets, self.batch_buckets, rates):
+                bucket.set_rate(rate)
+                batch_bucket.set_rate(rate * share)
+
+    def queue_stats(self) -> Dict[str, Dict]:
+        with self._cond:
+            samples = {priority: sorted(waits) for priority, waits in self._waits.items()}
+            admitted = dict(self._admitted)
+            waiting = dict(self._waiting)
+
+        def percentile(values: List[float], q: float) -> float:
+            return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else 0.0
+
+        return {
+            priority: {
+                "admitted": admitted[priority],
+                "waiting": waiting[priority],
+                "p50_wait_ms": percentile(values, 0.50),
+                "p99_wait_ms": percentile(values, 0.99)
+            }
+            for priority, values in samples.items()
+        }
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures, lets one trial call through after reset_seconds."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                raise CircuitOpenError("Circuit open after repeated API failures")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+def estimate_tokens(messages=None, max_tokens: int = 0, text: str = "") -> int:
+    """Rough budget for a call: ~4 characters per prompt token plus the completion limit."""
+    chars = len(text) + sum(len(str(m.get("content", ""))) for m in messages or [])
+    return chars // 4 + max_tokens
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Seconds from a Retry-After value ('7', '7.5') or an x-ratelimit-reset value ('1m2.5s', '250ms')."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+def retry_hint(error: Exception) -> Optional[float]:
+    """Server-suggested wait in seconds from the error's response headers, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = headers.get(header)
+        if value:
+            seconds = _parse_duration(str(value))
+            if seconds is not None:
+                return seconds
+    return None
+
+def is_retryable(error: Exception) -> bool:
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+class RateLimiter:
+    """Request/token budgets, retries and circuit breaker for one API (see module comment)."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 6000,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        interactive_reserve: float = 0.3
+    ):
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests_per_second = requests_per_minute / 60.0
+        self.tokens_per_second = tokens_per_minute / 60.0
+        self.requests = TokenBucket(requests_per_minute, self.requests_per_second)
+        self.tokens = TokenBucket(tokens_per_minute, self.tokens_per_second)
+        self.scheduler = PriorityScheduler([self.requests, self.tokens], interactive_reserve)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        # Fraction of the configured rate currently allowed (adaptive, 0.1-1.0)
+        self._rate_factor = 1.0
+        self._metrics = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "circuit_rejections": 0,
+            "throttle_seconds": 0.0,
+            "backoff_seconds": 0.0
+        }
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., Any], *args, estimated_tokens: int = 0, priority: str = INTERACTIVE, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) within the budgets for its priority class, retrying retryable errors.
+        Raises CircuitOpenError while the breaker is open, otherwise the last error once retries are exhausted.
+        """
+        self._count("calls")
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("circuit_rejections")
+                raise
+
+            throttled = self.scheduler.acquire([1, estimated_tokens], priority)
+            if throttled:
+                self._count("throttle_seconds", throttled)
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                if status == 429:
+                    # Throttling is handled by the adaptive rate, not the breaker
+                    self._count("rate_limited")
+                    self._scale_rate(0.5)
+                    self.breaker.record_success()
+                elif is_retryable(e):
+                    self.breaker.record_failure()
+                else:
+                    # The API answered (e.g. 400); it is up, the request itself is bad
+                    self.breaker.record_success()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                hint = retry_hint(e)
+                # Full jitter, but never earlier than the server asked for
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                if hint is not None:
+                    delay = max(delay, min(hint, self.max_delay))
+                attempt += 1
+                self._count("retries")
+                self._count("backoff_seconds", delay)
+                logger.warning(f"[{self.name}] {type(e).__name__} (attempt {attempt}/{self.max_retries}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            self._count("successes")
+            self._scale_rate(1.05)
+            usage = getattr(getattr(result, "usage", None), "total_tokens", None)
+            if usage is not None and estimated_tokens:
+                self.scheduler.adjust(self.tokens, estimated_tokens - usage, priority)
+            return result
+
+    def _scale_rate(self, factor: float) -> None:
+        with self._lock:
+            previous = self._rate_factor
+            self._rate_factor = max(0.1, min(1.0, self._rate_factor * factor))
+            if self._rate_factor == previous:
+                return
+            rate_factor = self._rate_factor
+        self.scheduler.set_rates([self.requests_per_second * rate_factor, self.tokens_per_second * rate_factor])
+        if factor < 1:
+            logger.warning(f"[{self.name}] Rate limited, reducing to {rate_factor:.0%} of the configured budget")
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._metrics[key] += amount
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+            rate_factor = self._rate_factor
+        return {
+            **metrics,
+            "rate_factor": rate_factor,
+            "requests_per_minute": self.requests_per_second * 60 * rate_factor,
+            "tokens_per_minute": self.tokens_per_second * 60 * rate_factor,
+            "circuit_state": self.breaker.state,
+            "queues": self.scheduler.queue_stats()
+        }
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name: str, **config) -> RateLimiter:
+    """Process-wide limiter for name; config only applies when it is first created."""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(name, **config)
+        return _limiters[name]
+
+def limiter_metrics() -> Dict[str, Dict]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.metrics() for limiter in limiters}
@@ -1,6 +1,14 @@
-from models.schemas import QuestionReport, FinalReportResponse, UserSummaryResponse, SessionStats
-from typing import List, Dict
+from models.schemas import QuestionReport, FinalReportResponse, UserSummaryResponse
+from utils.supabase_utils import select_in
+from core.progress_service import compute_session_stats, merge_category_stats, build_user_summary
+from core.stress_scoring import (
+    average_stress as average_stress_score, stress_level, stress_penalty_factor, HIGH_STRESS_THRESHOLD, NOT_ANALYZED
+)
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import logging
 
 # Configure logging
@@ -8,11 +16,18 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 class ReportService:
-    def __init__(self, supabase, groq_service):
+    # Bump when the report prompt changes so stored reports are regenerated
+    REPORT_PROMPT_VERSION = "v3"
+    # Columns that may be missing from older mock_interview_reports schemas
+    OPTIONAL_REPORT_COLUMNS = ("average_stress_score", "average_stress_level", "fingerprint")
+
+    def __init__(self, supabase, groq_service, report_cache=None, progress=None):
         self.supabase = supabase
         self.groq_service = groq_service
+        self.report_cache = report_cache
+        self.progress = progress
 
-    def generate_final_report(self, session_id: str) -> FinalReportResponse:
+    def generate_final_report(self, session_id: str, refresh: bool = False) -> FinalReportResponse:
         logger.info(f"Generating final report for session_id: {session_id}")
         try:
             # Validate session_id format (must be a valid UUID)
@@ -23,53 +38,47 @@ class ReportService:
                 logger.error(f"Invalid session_id format: {session_id}")
                 raise ValueError("Invalid session_id format. Must be a valid UUID.")
 
-            # Check if the session exists and fetch user details
-            logger.debug(f"Fetching session with id: {session_id}")
-            session = self.supabase.table("mock_interview_sessions").select(
-                "*, user_id:mock_interview_users(user_id:users(user_id, name, email, role))"
-            ).eq("id", session_id).execute()
-            if not session.data:
-                logger.error(f"No session found with session_id: {session_id}")
-                raise Exception(f"No session found with session_id: {session_id}")
-            session_data = session.data[0]
+            # Fetch session, user details, questions, stress data, answers and any stored report in one round trip
+            session_data, questions_data, stress_rows, answer_rows, stored_report = self._fetch_session_bundle(session_id)
             user_data = session_data.get("user_id", {})
             user_name = user_data.get("name", "Unknown User") if user_data else "Unknown User"
             user_role = user_data.get("role", "candidate") if user_data else "candidate"
 
-            # Fetch questions
-            logger.debug(f"Fetching questions for session_id: {session_id}")
-            questions = self.supabase.table("mock_interview_questions").select("*").eq("session_id", session_id).order("question_number").execute()
-            if not questions.data:
+            if not questions_data:
                 logger.error(f"No questions found for session_id: {session_id}")
                 raise Exception(f"No questions found for session_id: {session_id}")
-            logger.debug(f"Fetched {len(questions.data)} questions")
-
-            # Fetch stress data
-            logger.debug(f"Fetching stress data for session_id: {session_id}")
-            stress_data = self.supabase.table("mock_interview_stress_analysis").select("*").eq("session_id", session_id).execute()
-            if not stress_data.data:
+            questions_data = sorted(questions_data, key=lambda q: q["question_number"])
+            logger.debug(f"Fetched {len(questions_data)} questions")
+
+            # In-memory hit only while its inputs are unchanged: answers can be re-scored by another
+            # worker or rescore_answers.py without this process's cache being invalidated
+            fingerprint = self._report_fingerprint(questions_data, answer_rows, stress_rows)
+            if self.report_cache is not None and not refresh:
+                cached = self.report_cache.get(session_id)
+                if cached is not None and cached[0] == fingerprint:
+                    logger.info(f"Serving cached final report for session_id: {session_id}")
+                    return cached[1]
+
+            if not stress_rows:
                 logger.warning(f"No stress analysis data found for session_id: {session_id}")
                 stress_dict = {}
                 stress_scores = []
                 average_stress = 0.0
-                average_stress_level = "Not Analyzed"
+                average_stress_level = NOT_ANALYZED
             else:
-                stress_dict = {entry["question_number"]: entry for entry in stress_data.data}
-                stress_scores = [entry["stress_score"] for entry in stress_data.data if entry["stress_score"] is not None]
-                average_stress = sum(stress_scores) / len(stress_scores) if stress_scores else 0.0
-                average_stress_level = "High Stress" if average_stress > 60 else "Moderate Stress" if average_stress > 30 else "Low Stress"
+                stress_dict = {entry["question_number"]: entry for entry in stress_rows}
+                stress_scores = [entry["stress_score"] for entry in stress_rows if entry["stress_score"] is not None]
+                average_stress = average_stress_score(stress_scores) or 0.0
+                average_stress_level = stress_level(average_stress)
             logger.info(f"Average stress for session {session_id}: {average_stress} ({average_stress_level})")
 
-            # Fetch answers
-            logger.debug(f"Fetching answers for session_id: {session_id}")
-            answers = self.supabase.table("mock_interview_answers").select("*").eq("session_id", session_id).execute()
-            answers_dict = {entry["question_number"]: entry for entry in answers.data} if answers.data else {}
-            logger.debug(f"Fetched {len(answers.data) if answers.data else 0} answers")
+            answers_dict = {entry["question_number"]: entry for entry in answer_rows}
+            logger.debug(f"Fetched {len(answer_rows)} answers")
 
             # Generate question reports
             question_reports: List[QuestionReport] = []
             answer_scores = []
-            for question in questions.data:
+            for question in questions_data:
                 question_number = question["question_number"]
                 answer = answers_dict.get(question_number, {})
                 stress = stress_dict.get(question_number, {})
@@ -83,7 +92,8 @@ class ReportService:
                     score=answer.get("score", None),
                     feedback=answer.get("feedback", "No feedback available"),
                     stress_score=stress.get("stress_score", None),
-                    stress_level=stress.get("stress_level", "Not analyzed")
+                    # Derived from the score so rows written with older label sets read consistently
+                    stress_level=stress_level(stress.get("stress_score"))
                 )
                 question_reports.append(question_report)
                 if answer.get("score") is not None:
@@ -91,14 +101,26 @@ class ReportService:
 
             # Calculate final score with stress adjustment
             avg_answer_score = sum(answer_scores) / len(answer_scores) if answer_scores else 5.0
-            final_score = avg_answer_score
-            if average_stress > 60:
-                final_score *= 0.8  # 20% penalty for high stress
-            elif average_stress > 30:
-                final_score *= 0.9  # 10% penalty for moderate stress
+            final_score = avg_answer_score * float(stress_penalty_factor(average_stress))
             logger.info(f"Final score for session {session_id}: {final_score} (base: {avg_answer_score}, adjusted for stress: {average_stress})")
 
-            # Generate summary and recommendation using Grok with detailed prompts
+            # Reuse the stored report if the inputs it was built from are unchanged
+            if stored_report and stored_report.get("fingerprint") == fingerprint and not refresh:
+                logger.info(f"Stored report for session_id {session_id} is up to date, skipping regeneration")
+                report = FinalReportResponse(
+                    session_id=session_id,
+                    questions=question_reports,
+                    average_stress=average_stress,
+                    average_stress_level=average_stress_level,
+                    overall_summary=stored_report["overall_summary"],
+                    final_score=final_score,
+                    recommendation=stored_report["recommendation"]
+                )
+                if self.report_cache is not None:
+                    self.report_cache.put(session_id, (fingerprint, report))
+                return report
+
+            # Generate summary and recommendation with a single structured Groq call
             logger.debug(f"Generating summary and recommendation for session_id: {session_id}")
             # Prepare detailed data for the prompt
             question_summary = "\n".join([
@@ -106,35 +128,15 @@ class ReportService:
                 f"Stress {qr.stress_score if qr.stress_score is not None else 'N/A'} ({qr.stress_level})"
                 for qr in question_reports
             ])
-            summary_prompt = f"""
-You are an AI interviewer summarizing a mock interview session for a Software Engineer role.
-
-Candidate Details:
-- Name: {user_name}
-- Role: {user_role}
-
-Session Details:
-- Total Questions: {len(questions.data)}
-- Questions Answered: {len(answers_dict)}
-- Average Stress: {average_stress:.1f} ({average_stress_level})
-- Average Answer Score: {avg_answer_score:.1f}
-- Final Score (adjusted for stress): {final_score:.1f}
-
-Performance Breakdown:
-{question_summary}
-
-Provide a concise 2-3 sentence summary of the candidate's performance. Highlight their strengths in answer quality, 
-areas impacted by stress, and overall readiness for a Software Engineer role.
-"""
-            recommendation_prompt = f"""
-You are an AI interviewer providing actionable feedback for a mock interview candidate.
+            report_prompt = f"""
+You are an AI interviewer reviewing a mock interview session for a Software Engineer role.
 
 Candidate Details:
 - Name: {user_name}
 - Role: {user_role}
 
 Session Details:
-- Total Questions: {len(questions.data)}
+- Total Questions: {len(questions_data)}
 - Questions Answered: {len(answers_dict)}
 - Average Stress: {average_stress:.1f} ({average_stress_level})
 - Average Answer Score: {avg_answer_score:.1f}
@@ -143,47 +145,19 @@ Session Details:
 Performance Breakdown:
 {question_summary}
 
-Provide a 1-2 sentence actionable recommendation to help the candidate improve their interview performance. 
-Focus on stress management or answer quality based on their performance.
+Return a JSON object with exactly two string fields:
+- "summary": a concise 2-3 sentence summary of the candidate's performance. Highlight their strengths in answer quality,
+  areas impacted by stress, and overall readiness for a Software Engineer role.
+- "recommendation": a 1-2 sentence actionable recommendation to help the candidate improve their interview performance.
+  Focus on stress management or answer quality based on their performance.
 """
-            # Default values in case Grok API fails
-            overall_summary = "Performance summary could not be generated due to an error."
-            recommendation = "Recommendation could not be generated due to an error."
-            try:
-                # Attempt summary generation with Grok
-                # Update: Use dynamic model from the service
-                summary_completion = self.groq_service.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are a helpful AI assistant that summarizes interview performance."},
-                        {"role": "user", "content": summary_prompt}
-                    ],
-                    model=self.groq_service.model, # Use correct model
-                    max_tokens=150,
-                    temperature=0.7
-                )
-                overall_summary = summary_completion.choices[0].message.content.strip()
-                logger.info(f"Generated summary: {overall_summary}")
-            except Exception as e:
-                logger.error(f"Failed to generate summary via Grok API: {str(e)}")
-                overall_summary = f"{user_name} completed {len(answers_dict)} out of {len(questions.data)} questions with an average answer score of {avg_answer_score:.1f}. Stress levels were {average_stress_level.lower()} (average stress: {average_stress:.1f})."
-
-            try:
-                # Attempt recommendation generation with Grok
-                # Update: Use dynamic model from the service
-                recommendation_completion = self.groq_service.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are a helpful AI assistant that provides interview recommendations."},
-                        {"role": "user", "content": recommendation_prompt}
-                    ],
-                    model=self.groq_service.model, # Use correct model
-                    max_tokens=150,
-                    temperature=0.7
-                )
-                recommendation = recommendation_completion.choices[0].message.content.strip()
-                logger.info(f"Generated recommendation: {recommendation}")
-            except Exception as e:
-                logger.error(f"Failed to generate recommendation via Grok API: {str(e)}")
-                if average_stress > 60:
+            overall_summary, recommendation = self._generate_summary_and_recommendation(report_prompt)
+            # A template fallback is saved without a fingerprint (and not cached), so the next request retries the LLM
+            generated = bool(overall_summary and recommendation)
+            if not overall_summary:
+                overall_summary = f"{user_name} completed {len(answers_dict)} out of {len(questions_data)} questions with an average answer score of {avg_answer_score:.1f}. Stress levels were {average_stress_level.lower()} (average stress: {average_stress:.1f})."
+            if not recommendation:
+                if average_stress > HIGH_STRESS_THRESHOLD:
                     recommendation = "Consider practicing stress management techniques, such as deep breathing, to reduce high stress during interviews."
                 elif avg_answer_score < 6:
                     recommendation = "Focus on improving answer quality by practicing common Software Engineer interview questions and structuring your responses clearly."
@@ -199,6 +173,7 @@ Focus on stress management or answer quality based on their performance.
                 "recommendation": recommendation,
                 "average_stress_score": average_stress,
                 "average_stress_level": average_stress_level,
+                "fingerprint": fingerprint if generated else None,
                 "created_at": datetime.utcnow().isoformat()
             }
             try:
@@ -210,27 +185,27 @@ Focus on stress management or answer quality based on their performance.
                 logger.info(f"Successfully upserted report to mock_interview_reports for session_id: {session_id}")
             except Exception as e:
                 logger.error(f"Upsert failed: {str(e)}")
-                # Fallback: Try upsert without stress columns if they are missing in schema
-                if "column" in str(e).lower() and ("average_stress_score" in str(e).lower() or "average_stress_level" in str(e).lower()):
-                    logger.warning(f"Columns average_stress_score/average_stress_level not found in mock_interview_reports, saving without them")
+                # Fallback: Try upsert without optional columns if they are missing in schema
+                if "column" in str(e).lower() and any(col in str(e).lower() for col in self.OPTIONAL_REPORT_COLUMNS):
+                    logger.warning(f"Optional columns {self.OPTIONAL_REPORT_COLUMNS} not all present in mock_interview_reports, saving without them")
                     reduced_report_data = {
-                        "session_id": session_id,
-                        "overall_summary": overall_summary,
-                        "final_score": final_score,
-                        "recommendation": recommendation,
-                        "created_at": datetime.utcnow().isoformat()
+                        key: value for key, value in report_data.items()
+                        if key not in self.OPTIONAL_REPORT_COLUMNS
                     }
                     self.supabase.table("mock_interview_reports").upsert(
                         reduced_report_data,
                         on_conflict=["session_id"]
                     ).execute()
-                    logger.info(f"Successfully upserted report (without stress columns) for session_id: {session_id}")
+                    logger.info(f"Successfully upserted report (without optional columns) for session_id: {session_id}")
                 else:
                     logger.error(f"Failed to upsert report into mock_interview_reports: {str(e)}")
                     raise Exception(f"Failed to save report to database: {str(e)}")
 
+            if self.progress is not None:
+                self.progress.refresh_session(session_id)
+
             logger.info(f"Successfully generated final report for session_id: {session_id}")
-            return FinalReportResponse(
+            report = FinalReportResponse(
                 session_id=session_id,
                 questions=question_reports,
                 average_stress=average_stress,
@@ -239,11 +214,117 @@ Focus on stress management or answer quality based on their performance.
                 final_score=final_score,
                 recommendation=recommendation
             )
+            if self.report_cache is not None and generated:
+                self.report_cache.put(session_id, (fingerprint, report))
+            return report
 
         except Exception as e:
             logger.error(f"Failed to generate final report for session_id {session_id}: {str(e)}")
             raise Exception(f"Failed to generate final report: {str(e)}")
 
+    SESSION_BUNDLE_SELECT = (
+        "*, user_id:mock_interview_users(user_id:users(user_id, name, email, role)), "
+        "mock_interview_questions(*), mock_interview_answers(*), mock_interview_stress_analysis(*), "
+        "mock_interview_reports(*)"
+    )
+
+    @staticmethod
+    def _single_row(value) -> Optional[Dict]:
+        """Embedded one-to-one relations come back as an object or a one-element list depending on the FK."""
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value or None
+
+    def _report_fingerprint(self, questions: List[Dict], answers: List[Dict], stress_rows: List[Dict]) -> str:
+        """Hash of every input the report is derived from; changes whenever an answer or stress row changes."""
+        payload = {
+            "version": self.REPORT_PROMPT_VERSION,
+            "questions": sorted((q["question_number"], q["question_text"], q["category"]) for q in questions),
+            "answers": sorted(
+                (a["question_number"], a.get("score"), a.get("feedback"), a.get("answer_text"), a.get("audio_url"))
+                for a in answers
+            ),
+            "stress": sorted((s["question_number"], s.get("stress_score"), s.get("stress_level")) for s in stress_rows)
+        }
+        return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+    def _fetch_session_bundle(self, session_id: str) -> Tuple[Dict, List[Dict], List[Dict], List[Dict], Optional[Dict]]:
+        """
+        Return (session, questions, stress rows, answers, stored report) for a session.
+        Uses one embedded select; if the embedding is unavailable, falls back to five concurrent queries.
+        """
+        try:
+            session = self.supabase.table("mock_interview_sessions").select(
+                self.SESSION_BUNDLE_SELECT
+            ).eq("id", session_id).execute()
+        except Exception as e:
+            logger.warning(f"Embedded session select failed, using concurrent queries: {str(e)}")
+            session = None
+
+        if session is not None:
+            if not session.data:
+                logger.error(f"No session found with session_id: {session_id}")
+                raise Exception(f"No session found with session_id: {session_id}")
+            session_data = session.data[0]
+            return (
+                session_data,
+                session_data.pop("mock_interview_questions", None) or [],
+                session_data.pop("mock_interview_stress_analysis", None) or [],
+                session_data.pop("mock_interview_answers", None) or [],
+                self._single_row(session_data.pop("mock_interview_reports", None))
+            )
+
+        def _rows(table: str):
+            return self.supabase.table(table).select("*").eq("session_id", session_id).execute().data or []
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            session_future = pool.submit(
+                lambda: self.supabase.table("mock_interview_sessions").select(
+                    "*, user_id:mock_interview_users(user_id:users(user_id, name, email, role))"
+                ).eq("id", session_id).execute()
+            )
+            questions_future = pool.submit(_rows, "mock_interview_questions")
+            stress_future = pool.submit(_rows, "mock_interview_stress_analysis")
+            answers_future = pool.submit(_rows, "mock_interview_answers")
+            report_future = pool.submit(_rows, "mock_interview_reports")
+            session = session_future.result()
+            if not session.data:
+                logger.error(f"No session found with session_id: {session_id}")
+                raise Exception(f"No session found with session_id: {session_id}")
+            return (
+                session.data[0],
+                questions_future.result(),
+                stress_future.result(),
+                answers_future.result(),
+                self._single_row(report_future.result())
+            )
+
+    def _generate_summary_and_recommendation(self, prompt: str) -> Tuple[str, str]:
+        """One JSON-mode Groq call for both fields. Returns empty strings for anything that could not be generated."""
+        try:
+            completion = self.groq_service.chat(
+                messages=[
+                    {"role": "system", "content": "You are a helpful AI assistant that summarizes interview performance and provides recommendations. Respond with JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=300,
+                temperature=0.7,
+                response_format={"type": "json_object"}
+            )
+            content = json.loads(completion.choices[0].message.content)
+            overall_summary = str(content.get("summary") or "").strip()
+            recommendation = str(content.get("recommendation") or "").strip()
+            logger.info(f"Generated summary: {overall_summary}")
+            logger.info(f"Generated recommendation: {recommendation}")
+            return overall_summary, recommendation
+        except Exception as e:
+            logger.error(f"Failed to generate summary/recommendation via Groq API: {str(e)}")
+            return "", ""
+
+    def _rows_for_sessions(self, table: str, columns: str, session_ids: List[str]) -> List[Dict]:
+        """Every row of table for the sessions: chunked in_() filters, each paged past PostgREST's row cap."""
+        return select_in(self.supabase, table, columns, "session_id", session_ids, order=("session_id", "question_number"))
+
     def generate_user_summary(self, mock_user_id: str) -> UserSummaryResponse:
         """Generate a summary of a user's interview performance across all sessions."""
         logger.info(f"Generating user summary for mock_user_id: {mock_user_id}")
@@ -256,6 +337,13 @@ Focus on stress management or answer quality based on their performance.
                 logger.error(f"Invalid mock_user_id format: {mock_user_id}")
                 raise ValueError("Invalid mock_user_id format. Must be a valid UUID.")
 
+            # Materialized aggregates are kept current by the answer/stress/report writers
+            if self.progress is not None:
+                summary = self.progress.get_user_summary(mock_user_id)
+                if summary is not None:
+                    logger.info(f"Served user summary from progress aggregates for mock_user_id: {mock_user_id}")
+                    return summary
+
             # Fetch user details to verify role
             user = self.supabase.table("mock_interview_users").select(
                 "*, user_id:users(user_id, name, email, role)"
@@ -284,87 +372,52 @@ Focus on stress management or answer quality based on their performance.
                     progress_over_time={}
                 )
 
-            total_sessions = len(sessions.data)
-            session_stats = []
-            average_stress_trend = []
-            category_data = {}  # To track scores and counts per question type
-            progress_over_time = {"stress": [], "answer_score": []}
-
+            session_ids = [session["id"] for session in sessions.data]
+
+            # Fetch questions, answers and stress rows for every session at once (constant round trips)
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                questions_future = pool.submit(self._rows_for_sessions, "mock_interview_questions", "session_id, question_number, category", session_ids)
+                answers_future = pool.submit(self._rows_for_sessions, "mock_interview_answers", "session_id, question_number, score", session_ids)
+                stress_future = pool.submit(self._rows_for_sessions, "mock_interview_stress_analysis", "session_id, question_number, stress_score", session_ids)
+                all_questions = questions_future.result()
+                all_answers = answers_future.result()
+                all_stress = stress_future.result()
+
+            # Group rows by session; compute_session_stats indexes each session by question_number
+            questions_by_session: Dict[str, List[Dict]] = {}
+            for question in all_questions:
+                questions_by_session.setdefault(question["session_id"], []).append(question)
+            answers_by_session: Dict[str, List[Dict]] = {}
+            for answer in all_answers:
+                answers_by_session.setdefault(answer["session_id"], []).append(answer)
+            stress_by_session: Dict[str, List[Dict]] = {}
+            for entry in all_stress:
+                stress_by_session.setdefault(entry["session_id"], []).append(entry)
+
+            session_rows = []
             for session in sessions.data:
                 session_id = session["id"]
-                start_time = session["start_time"]
-
-                # Fetch questions, answers, and stress data for the session
-                questions = self.supabase.table("mock_interview_questions").select("*").eq("session_id", session_id).order("question_number").execute()
-                total_questions = len(questions.data) if questions.data else 0
-
-                answers = self.supabase.table("mock_interview_answers").select("*").eq("session_id", session_id).execute()
-                questions_attempted = len(answers.data) if answers.data else 0
-
-                stress_data = self.supabase.table("mock_interview_stress_analysis").select("*").eq("session_id", session_id).execute()
-                stress_scores = [entry["stress_score"] for entry in stress_data.data if entry["stress_score"] is not None] if stress_data.data else []
-                average_stress = sum(stress_scores) / len(stress_scores) if stress_scores else 0.0
-                average_stress_trend.append(average_stress)
-
-                answer_scores = [entry["score"] for entry in answers.data if entry["score"] is not None]
-                average_answer_score = sum(answer_scores) / len(answer_scores) if answer_scores else None
-
-                # Track performance by question category
-                for question in questions.data:
-                    category = question["category"]
-                    question_number = question["question_number"]
-                    answer = next((a for a in answers.data if a["question_number"] == question_number), None)
-                    stress = next((s for s in stress_data.data if s["question_number"] == question_number), None)
-
-                    # Use stress score if available, otherwise use inverted answer score
-                    score = stress["stress_score"] if stress and stress["stress_score"] is not None else (10 - answer["score"] if answer and answer["score"] is not None else 5.0)
-                    
-                    # Update category data
-                    if category not in category_data:
-                        category_data[category] = {"total_score": 0.0, "count": 0}
-                    category_data[category]["total_score"] += score
-                    category_data[category]["count"] += 1
-
-                session_stats.append(SessionStats(
-                    session_id=session_id,
-                    created_at=start_time,
-                    average_stress=average_stress,
-                    average_answer_score=average_answer_score,
-                    questions_attempted=questions_attempted,
-                    total_questions=total_questions
-                ))
-                progress_over_time["stress"].append(average_stress)
-                if average_answer_score is not None:
-                    progress_over_time["answer_score"].append(average_answer_score)
-
-            # Compute weakest question types with additional context
-            weakest_question_types = {
-                category: {
-                    "average_score": data["total_score"] / data["count"],
-                    "question_count": data["count"]
-                }
-                for category, data in category_data.items()
-            }
-
-            # Compute progress over time (difference between first and last session)
-            progress = {}
-            if len(progress_over_time["stress"]) > 1:
-                progress["stress_improvement"] = progress_over_time["stress"][0] - progress_over_time["stress"][-1]
-            else:
-                progress["stress_improvement"] = 0.0
-            if len(progress_over_time["answer_score"]) > 1:
-                progress["answer_score_improvement"] = progress_over_time["answer_score"][-1] - progress_over_time["answer_score"][0]
-            else:
-                progress["answer_score_improvement"] = 0.0
+                session_rows.append({
+                    "session_id": session_id,
+                    "user_id": mock_user_id,
+                    "start_time": session["start_time"],
+                    **compute_session_stats(
+                        questions_by_session.get(session_id, []),
+                        answers_by_session.get(session_id, []),
+                        stress_by_session.get(session_id, [])
+                    )
+                })
+
+            category_stats: Dict[str, Dict] = {}
+            for row in session_rows:
+                category_stats = merge_category_stats(category_stats, row["category_stats"])
+
+            # Materialize so later reads are a single-row lookup
+            if self.progress is not None:
+                self.progress.store_user(mock_user_id, session_rows)
 
             logger.info(f"Successfully generated user summary for mock_user_id: {mock_user_id}")
-            return UserSummaryResponse(
-                mock_user_id=mock_user_id,
-                total_sessions=total_sessions,
-                average_stress_trend=average_stress_trend,
-                weakest_question_types=weakest_question_types,
-                progress_over_time=progress
-            )
+            return build_user_summary(mock_user_id, session_rows, category_stats)
 
         except Exception as e:
             logger.error(f"Failed to generate user summary for mock_user_id {mock_user_id}: {str(e)}")
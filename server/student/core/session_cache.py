@@ -0,0 +1,78 @@
+from config.settings import settings
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TTLLRUCache:
+    """
+    Small thread-safe in-process cache.
+    Entries expire after ttl_seconds; the least recently used key is evicted beyond max_entries.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> Any:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+class SessionQuestionCache(TTLLRUCache):
+    """Per-process cache of a session's questions as {question_number: question_row}, keyed by session_id."""
+
+    def put(self, session_id: str, questions: List[Dict]) -> Dict[int, Dict]:
+        return super().put(session_id, {q["question_number"]: q for q in questions})
+
+    def load(self, supabase, session_id: str) -> Dict[int, Dict]:
+        """Return the session's questions, fetching them in one query on a miss. Empty sessions are not cached."""
+        questions = self.get(session_id)
+        if questions is not None:
+            return questions
+
+        result = supabase.table("mock_interview_questions")\
+            .select("question_number, question_text, category")\
+            .eq("session_id", session_id)\
+            .order("question_number")\
+            .execute()
+        if not result.data:
+            return {}
+        logger.debug(f"Cached {len(result.data)} questions for session {session_id}")
+        return self.put(session_id, result.data)
+
+session_question_cache = SessionQuestionCache(
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+    max_entries=settings.SESSION_CACHE_MAX_SESSIONS
+)
+
+# session_id -> (fingerprint, FinalReportResponse); invalidated whenever an answer or stress row is written here,
+# and only served while the fingerprint still matches the session's rows
+final_report_cache = TTLLRUCache(
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS,
+    max_entries=settings.REPORT_CACHE_MAX_SESSIONS
+)
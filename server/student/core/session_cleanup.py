@@ -0,0 +1,81 @@
+from typing import List, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SessionDeletionService:
+    """
+    Batched cascade delete for interview sessions.
+    Table rows go in one admin_delete_sessions() transaction (falls back to one in_() delete per table),
+    storage objects in one multi-path remove() per bucket.
+    """
+    ANSWERS_BUCKET = "mock.interview.answers"
+    VIDEOS_BUCKET = "mock.interview.videos"
+    # Supabase storage accepts at most 1000 paths per remove() call
+    STORAGE_REMOVE_CHUNK = 1000
+    CHILD_TABLES = (
+        "mock_interview_questions",
+        "mock_interview_answers",
+        "mock_interview_stress_analysis",
+        "mock_interview_reports"
+    )
+
+    def __init__(self, supabase, session_cache=None, report_cache=None, progress=None):
+        self.supabase = supabase
+        self.session_cache = session_cache
+        self.report_cache = report_cache
+        self.progress = progress
+
+    def delete_sessions(self, session_ids: List[str]) -> Dict:
+        """Delete the given sessions, their child rows and their storage objects. Returns counts."""
+        if not session_ids:
+            return {"sessions": 0, "audio_files": 0, "video_paths": 0}
+
+        # Collect storage paths before the rows disappear
+        answers = self.supabase.table("mock_interview_answers").select("audio_url").in_("session_id", session_ids).execute()
+        audio_paths = [a["audio_url"] for a in (answers.data or []) if a.get("audio_url")]
+
+        # Legacy video paths (kept for cleanup of old sessions)
+        questions = self.supabase.table("mock_interview_questions").select("session_id, question_number").in_("session_id", session_ids).execute()
+        video_paths = [f"videos/{q['session_id']}/{q['question_number']}/video.webm" for q in (questions.data or [])]
+
+        # Remove the sessions from materialized progress before their rows disappear
+        if self.progress is not None:
+            self.progress.remove_sessions(session_ids)
+
+        self._delete_rows(session_ids)
+
+        for session_id in session_ids:
+            if self.session_cache is not None:
+                self.session_cache.invalidate(session_id)
+            if self.report_cache is not None:
+                self.report_cache.invalidate(session_id)
+
+        self._remove_objects(self.ANSWERS_BUCKET, audio_paths)
+        # Ignore video deletion errors as we aren't using them anymore
+        self._remove_objects(self.VIDEOS_BUCKET, video_paths, quiet=True)
+
+        logger.info(f"Deleted {len(session_ids)} sessions ({len(audio_paths)} audio files)")
+        return {"sessions": len(session_ids), "audio_files": len(audio_paths), "video_paths": len(video_paths)}
+
+    def _delete_rows(self, session_ids: List[str]) -> None:
+        try:
+            self.supabase.rpc("admin_delete_sessions", {"p_session_ids": session_ids}).execute()
+            return
+        except Exception as e:
+            logger.warning(f"admin_delete_sessions() RPC not found or failed, deleting table by table: {str(e)}")
+
+        # Delete related rows manually (safeguard against missing CASCADE)
+        for table in self.CHILD_TABLES:
+            self.supabase.table(table).delete().in_("session_id", session_ids).execute()
+        self.supabase.table("mock_interview_sessions").delete().in_("id", session_ids).execute()
+
+    def _remove_objects(self, bucket: str, paths: List[str], quiet: bool = False) -> None:
+        for i in range(0, len(paths), self.STORAGE_REMOVE_CHUNK):
+            chunk = paths[i : i + self.STORAGE_REMOVE_CHUNK]
+            try:
+                self.supabase.storage.from_(bucket).remove(chunk)
+                logger.info(f"Removed {len(chunk)} objects from {bucket}")
+            except Exception as e:
+                if not quiet:
+                    logger.warning(f"Failed to remove {len(chunk)} objects from {bucket}: {str(e)}")
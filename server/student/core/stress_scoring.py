@@ -0,0 +1,117 @@
+# Single source of truth for stress scoring: thresholds, labels, the WPM and acoustic
+# heuristics, and the report's stress penalty. All functions are pure and accept scalars
+# or NumPy arrays, so historical rows can be re-scored in one vectorized pass.
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+NEUTRAL_STRESS = 50.0
+HIGH_STRESS_THRESHOLD = 70.0
+MODERATE_STRESS_THRESHOLD = 40.0
+
+HIGH_STRESS = "High Stress"
+MODERATE_STRESS = "Moderate Stress"
+LOW_STRESS = "Low Stress"
+NOT_ANALYZED = "Not Analyzed"
+
+# WPM heuristic: normal speaking speed is approx 110-160 WPM
+WPM_FAST = 160.0
+WPM_SLOW = 110.0
+WPM_WEIGHT = 0.5
+DEFAULT_DURATION_SECONDS = 60.0
+
+# Acoustic heuristic bands (see core/acoustic_stress.py for the features)
+RATE_FAST, RATE_SLOW, RATE_WEIGHT = 5.5, 2.5, 8.0
+PAUSE_LIMIT, PAUSE_WEIGHT = 0.35, 60.0
+PITCH_AGITATED, PITCH_MONOTONE, PITCH_HIGH_WEIGHT, PITCH_LOW_WEIGHT = 4.0, 1.5, 5.0, 4.0
+ENERGY_VARIABILITY_LIMIT, ENERGY_WEIGHT = 12.0, 1.5
+
+def clamp_score(score):
+    return np.clip(score, 0.0, 100.0)
+
+def words_per_minute(word_count, duration):
+    """Durations under 1s are treated as missing and replaced by the 60s default."""
+    duration = np.asarray(duration, dtype=float)
+    duration = np.where(duration < 1.0, DEFAULT_DURATION_SECONDS, duration)
+    return np.asarray(word_count, dtype=float) / duration * 60.0
+
+def wpm_stress(wpm):
+    """Neutral 50, plus a penalty for speaking too fast (nervous energy) or too slow (hesitation)."""
+    wpm = np.asarray(wpm, dtype=float)
+    penalty = np.where(wpm > WPM_FAST, (wpm - WPM_FAST) * WPM_WEIGHT, 0.0) \
+        + np.where(wpm < WPM_SLOW, (WPM_SLOW - wpm) * WPM_WEIGHT, 0.0)
+    return clamp_score(NEUTRAL_STRESS + penalty)
+
+def acoustic_penalties(speaking_rate, pause_ratio, pitch_variability, energy_variability) -> Dict[str, np.ndarray]:
+    """Per-feature penalties for the acoustic engine."""
+    rate = np.asarray(speaking_rate, dtype=float)
+    pause = np.asarray(pause_ratio, dtype=float)
+    pitch = np.asarray(pitch_variability, dtype=float)
+    energy = np.asarray(energy_variability, dtype=float)
+    return {
+        "speaking_rate": np.where(rate > RATE_FAST, (rate - RATE_FAST) * RATE_WEIGHT, 0.0)
+        + np.where(rate < RATE_SLOW, (RATE_SLOW - rate) * RATE_WEIGHT, 0.0),
+        "pause_ratio": np.maximum(0.0, pause - PAUSE_LIMIT) * PAUSE_WEIGHT,
+        "pitch_variability": np.where(pitch > PITCH_AGITATED, (pitch - PITCH_AGITATED) * PITCH_HIGH_WEIGHT, 0.0)
+        + np.where((pitch > 0) & (pitch < PITCH_MONOTONE), (PITCH_MONOTONE - pitch) * PITCH_LOW_WEIGHT, 0.0),
+        "energy_variability": np.maximum(0.0, energy - ENERGY_VARIABILITY_LIMIT) * ENERGY_WEIGHT
+    }
+
+def acoustic_stress(speaking_rate, pause_ratio, pitch_variability, energy_variability):
+    penalties = acoustic_penalties(speaking_rate, pause_ratio, pitch_variability, energy_variability)
+    return clamp_score(NEUTRAL_STRESS + sum(penalties.values()))
+
+def stress_levels(scores) -> np.ndarray:
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores > HIGH_STRESS_THRESHOLD, scores > MODERATE_STRESS_THRESHOLD],
+        [HIGH_STRESS, MODERATE_STRESS],
+        default=LOW_STRESS
+    )
+
+def stress_level(score: Optional[float]) -> str:
+    if score is None:
+        return NOT_ANALYZED
+    return str(stress_levels(score))
+
+def average_stress(scores: Sequence[Optional[float]]) -> Optional[float]:
+    """Mean of the non-null scores, or None if there are none."""
+    values = np.array([s for s in scores if s is not None], dtype=float)
+    return float(values.mean()) if values.size else None
+
+def stress_penalty_factor(average):
+    """Final report score multiplier: 20% penalty for high stress, 10% for moderate."""
+    average = np.asarray(average, dtype=float)
+    return np.select(
+        [average > HIGH_STRESS_THRESHOLD, average > MODERATE_STRESS_THRESHOLD],
+        [0.8, 0.9],
+        default=1.0
+    )
+
+def _metric(row: Dict, *names: str) -> Optional[float]:
+    """First value among the given metric names in a row's individual_scores."""
+    values = {entry.get("metric"): entry.get("value") for entry in row.get("individual_scores") or [] if isinstance(entry, dict)}
+    return next((values[name] for name in names if values.get(name) is not None), None)
+
+def rescore_rows(rows: List[Dict]) -> List[Dict]:
+    """
+    Re-score stored mock_interview_stress_analysis rows from their individual_scores metrics
+    (acoustic or WPM) in one vectorized pass per engine. Rows without usable metrics are returned unchanged.
+    """
+    acoustic_metrics = ("speaking_rate", "pause_ratio", "pitch_variability", "energy_variability")
+    acoustic_idx = [i for i, row in enumerate(rows) if _metric(row, "speaking_rate") is not None]
+    acoustic_set = set(acoustic_idx)
+    wpm_idx = [i for i, row in enumerate(rows) if i not in acoustic_set and _metric(row, "wpm", "audio_speaking_speed") is not None]
+
+    scores: Dict[int, float] = {}
+    if acoustic_idx:
+        columns = [np.array([_metric(rows[i], name) or 0.0 for i in acoustic_idx], dtype=float) for name in acoustic_metrics]
+        scores.update(zip(acoustic_idx, acoustic_stress(*columns).tolist()))
+    if wpm_idx:
+        wpm = np.array([_metric(rows[i], "wpm", "audio_speaking_speed") for i in wpm_idx], dtype=float)
+        scores.update(zip(wpm_idx, wpm_stress(wpm).tolist()))
+
+    levels = dict(zip(scores, stress_levels(list(scores.values())).tolist())) if scores else {}
+    return [
+        {**row, "stress_score": scores[i], "stress_level": levels[i]} if i in scores else row
+        for i, row in enumerate(rows)
+    ]
@@ -1,4 +1,7 @@
 from typing import Dict
+from config.settings import settings
+from core.acoustic_stress import analyze_audio, AcousticDecodeError
+from core.stress_scoring import words_per_minute, wpm_stress, stress_level as score_level
 import logging
 
 # Configure logging
@@ -13,42 +16,29 @@ class StressService:
         """
         Analyze stress based on uploaded audio file and provided duration.
         - audio_path: path to the audio file
-        - duration: duration in seconds (default 60s if unavailable)
+        - duration: duration in seconds (default 60s if unavailable; ignored by the acoustic engine)
         """
+        if settings.STRESS_ENGINE == "acoustic":
+            try:
+                with open(audio_path, "rb") as f:
+                    result = analyze_audio(f.read())
+                return {
+                    "score": result["score"],
+                    "level": score_level(result["score"]),
+                    "individual_scores": result["individual_scores"]
+                }
+            except AcousticDecodeError as e:
+                logger.warning(f"Acoustic stress analysis unavailable, falling back to WPM: {str(e)}")
+
         try:
             # 1. Transcribe audio
             transcription = self.whisper_service.transcribe_audio(audio_path)
             word_count = len(transcription.split())
 
-            # 2. Calculate speaking speed (words per minute)
-            # Sanity check duration to avoid division by zero
-            if duration < 1.0:
-                duration = 60.0  # Fallback default
-            
-            wpm = (word_count / duration) * 60
-
-            # 3. Calculate audio-based stress score (Heuristic)
-            # Normal speaking speed is approx 130-150 WPM.
-            # Significant deviations (too fast or too slow) indicate stress/nervousness.
-            
-            stress = 50.0  # Start at neutral baseline
-            
-            if wpm > 160:
-                # Penalty for speaking too fast (nervous energy)
-                stress += (wpm - 160) * 0.5
-            elif wpm < 110:
-                # Penalty for speaking too slow (hesitation/uncertainty)
-                stress += (110 - wpm) * 0.5
-            
-            # Clamp score between 0 and 100
-            stress = max(0.0, min(100.0, stress))
-
-            # 4. Determine Stress Level
-            stress_level = (
-                "High Stress" if stress > 70 else
-                "Moderate Stress" if stress > 40 else
-                "Low Stress"
-            )
+            # 2. Calculate speaking speed (words per minute) and the heuristic score
+            wpm = float(words_per_minute(word_count, duration))
+            stress = float(wpm_stress(wpm))
+            stress_level = score_level(stress)
 
             logger.info(f"Stress Analysis - WPM: {wpm:.1f}, Score: {stress:.1f} ({stress_level})")
 
@@ -63,4 +53,4 @@ class StressService:
         except Exception as e:
             logger.error(f"Error analyzing stress: {str(e)}")
             # Propagate error so the caller knows analysis failed
-            raise Exception(f"Error analyzing stress: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error analyzing stress: {str(e)}")
@@ -0,0 +1,14 @@
+-- Cached interview question sets, keyed by resume content hash + prompt version.
+-- Used by core/question_cache.py (QuestionCacheService).
+
+create table if not exists mock_interview_question_sets (
+    id              uuid primary key default gen_random_uuid(),
+    content_hash    text not null,
+    prompt_version  text not null,
+    questions       jsonb not null,
+    created_at      timestamptz not null default now(),
+    last_used_at    timestamptz not null default now()
+);
+
+create index if not exists idx_question_sets_lookup
+    on mock_interview_question_sets (content_hash, prompt_version, last_used_at);
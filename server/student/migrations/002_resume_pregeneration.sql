@@ -0,0 +1,5 @@
+-- Extracted text and content hash stored at upload time when question
+-- pre-generation is enabled (QUESTION_PREGENERATE_ON_UPLOAD / ?pregenerate=true).
+
+alter table mock_interview_resumes add column if not exists content_hash text;
+alter table mock_interview_resumes add column if not exists resume_text text;
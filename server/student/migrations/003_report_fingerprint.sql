@@ -0,0 +1,4 @@
+-- Fingerprint of the questions/answers/stress rows a stored report was built from.
+-- ReportService.generate_final_report reuses the stored report while it matches.
+
+alter table mock_interview_reports add column if not exists fingerprint text;
@@ -0,0 +1,25 @@
+-- Materialized per-user progress used by GET /interview/user-summary.
+-- Kept by core/progress_service.py (ProgressAggregator): a session's row is rewritten when its answers or
+-- stress rows change, and the user's row is recomputed from the session rows (see 007_progress_recompute.sql).
+
+create table if not exists mock_interview_session_stats (
+    session_id            uuid primary key references mock_interview_sessions(id) on delete cascade,
+    user_id               uuid not null,
+    start_time            timestamptz,
+    total_questions       integer not null default 0,
+    questions_attempted   integer not null default 0,
+    average_stress        double precision not null default 0,
+    average_answer_score  double precision,
+    category_stats        jsonb not null default '{}'::jsonb,  -- {category: {total_score, count}}
+    updated_at            timestamptz not null default now()
+);
+
+create index if not exists idx_session_stats_user
+    on mock_interview_session_stats (user_id, start_time);
+
+create table if not exists mock_interview_user_stats (
+    user_id         uuid primary key,
+    category_stats  jsonb not null default '{}'::jsonb,  -- {category: {total_score, count}} summed over the session rows
+    session_trend   jsonb not null default '[]'::jsonb,  -- [{session_id, start_time, average_stress, average_answer_score}]
+    updated_at      timestamptz not null default now()
+);
@@ -0,0 +1,61 @@
+-- Paginated session overview for GET /admin/sessions (api/routes/admin.py).
+-- Keyset pagination on (start_time desc, id desc) with optional filters.
+
+drop function if exists admin_get_session_overview();
+drop function if exists admin_get_session_overview(integer, timestamptz, uuid, text, uuid, timestamptz, timestamptz);
+
+create or replace function admin_get_session_overview(
+    p_limit         integer     default 50,
+    p_before_start  timestamptz default null,
+    p_before_id     uuid        default null,
+    p_status        text        default null,
+    p_user_id       uuid        default null,
+    p_start_from    timestamptz default null,
+    p_start_to      timestamptz default null
+)
+returns table (
+    id              uuid,
+    user_id         uuid,
+    resume_id       uuid,
+    start_time      timestamptz,
+    end_time        timestamptz,
+    status          text,
+    overall_score   double precision,
+    question_count  bigint,
+    answer_count    bigint,
+    average_stress  double precision
+)
+language sql stable
+as $$
+    with page as (
+        select s.*
+        from mock_interview_sessions s
+        where (p_status is null or s.status = p_status)
+          and (p_user_id is null or s.user_id = p_user_id)
+          and (p_start_from is null or s.start_time >= p_start_from)
+          and (p_start_to is null or s.start_time < p_start_to)
+          and (p_before_start is null or (s.start_time, s.id) < (p_before_start, p_before_id))
+        order by s.start_time desc, s.id desc
+        limit p_limit
+    )
+    select
+        p.id,
+        p.user_id,
+        p.resume_id,
+        p.start_time,
+        p.end_time,
+        p.status::text,
+        p.overall_score::double precision,
+        (select count(*) from mock_interview_questions q where q.session_id = p.id),
+        (select count(*) from mock_interview_answers a where a.session_id = p.id),
+        (select avg(sa.stress_score)::double precision from mock_interview_stress_analysis sa where sa.session_id = p.id)
+    from page p
+    order by p.start_time desc, p.id desc;
+$$;
+
+create index if not exists idx_sessions_start_id on mock_interview_sessions (start_time desc, id desc);
+create index if not exists idx_sessions_user_start on mock_interview_sessions (user_id, start_time desc);
+create index if not exists idx_sessions_status_start on mock_interview_sessions (status, start_time desc);
+create index if not exists idx_questions_session on mock_interview_questions (session_id, question_number);
+create index if not exists idx_answers_session on mock_interview_answers (session_id, question_number);
+create index if not exists idx_stress_session on mock_interview_stress_analysis (session_id, question_number);
@@ -0,0 +1,18 @@
+-- Transactional cascade delete used by core/session_cleanup.py (SessionDeletionService).
+
+create or replace function admin_delete_sessions(p_session_ids uuid[])
+returns integer
+language plpgsql
+as $$
+declare
+    deleted_count integer;
+begin
+    delete from mock_interview_questions       where session_id = any(p_session_ids);
+    delete from mock_interview_answers         where session_id = any(p_session_ids);
+    delete from mock_interview_stress_analysis where session_id = any(p_session_ids);
+    delete from mock_interview_reports         where session_id = any(p_session_ids);
+    delete from mock_interview_sessions        where id = any(p_session_ids);
+    get diagnostics deleted_count = row_count;
+    return deleted_count;
+end;
+$$;
@@ -0,0 +1,57 @@
+-- Atomic user progress refresh used by core/progress_service.py (ProgressAggregator).
+-- User totals are recomputed from mock_interview_session_stats under a row lock instead of
+-- being patched with deltas, so concurrent refreshes of one user can't lose an update.
+-- Only users that already have an aggregate row are refreshed (the first summary read creates it).
+
+create or replace function refresh_user_progress(p_user_ids uuid[])
+returns integer
+language plpgsql
+as $$
+declare
+    refreshed integer;
+begin
+    -- Serialize refreshes per user; the update below then sees every committed session row
+    perform 1 from mock_interview_user_stats where user_id = any(p_user_ids) for update;
+
+    with per_category as (
+        select s.user_id,
+               c.key as category,
+               sum((c.value->>'total_score')::double precision) as total_score,
+               sum((c.value->>'count')::integer) as count
+        from mock_interview_session_stats s,
+             jsonb_each(s.category_stats) c
+        where s.user_id = any(p_user_ids)
+        group by s.user_id, c.key
+    ),
+    categories as (
+        select user_id,
+               jsonb_object_agg(category, jsonb_build_object('total_score', total_score, 'count', count)) as category_stats
+        from per_category
+        where count > 0
+        group by user_id
+    ),
+    trends as (
+        select user_id,
+               jsonb_agg(jsonb_build_object(
+                   'session_id', session_id,
+                   'start_time', start_time,
+                   'average_stress', average_stress,
+                   'average_answer_score', average_answer_score
+               ) order by start_time) as session_trend
+        from mock_interview_session_stats
+        where user_id = any(p_user_ids)
+        group by user_id
+    )
+    update mock_interview_user_stats u
+    set category_stats = coalesce(c.category_stats, '{}'::jsonb),
+        session_trend  = coalesce(t.session_trend, '[]'::jsonb),
+        updated_at     = now()
+    from unnest(p_user_ids) as ids(user_id)
+    left join categories c on c.user_id = ids.user_id
+    left join trends t on t.user_id = ids.user_id
+    where u.user_id = ids.user_id;
+
+    get diagnostics refreshed = row_count;
+    return refreshed;
+end;
+$$;
@@ -17,6 +17,17 @@ class NextQuestionResponse(BaseModel):
     question_number: int
     total_questions: int
 
+class SessionQuestion(BaseModel):
+    question_number: int
+    question: str
+    category: str
+
+class SessionQuestionsResponse(BaseModel):
+    status: str
+    session_id: str
+    total_questions: int
+    questions: List[SessionQuestion]
+
 class AverageStressResponse(BaseModel):
     status: str
     session_id: str
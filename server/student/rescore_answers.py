@@ -0,0 +1,209 @@
+"""
+Offline re-scoring of stored mock_interview_answers, e.g. after the evaluation prompt or GROQ_MODEL_NAME changes.
+Streams answers in keyset pages, evaluates each page with bounded concurrency against GroqService.evaluate_answer,
+writes the page back in one bulk upsert and checkpoints the cursor so an interrupted run resumes where it stopped.
+With --stress, stored mock_interview_stress_analysis rows are re-scored instead, from their individual_scores metrics
+with the current core/stress_scoring.py heuristics (no API calls, so no checkpoint).
+
+Usage:
+    python rescore_answers.py [--page-size 200] [--concurrency 8] [--limit N] [--session-id ID ...]
+                              [--checkpoint rescore_checkpoint.json] [--reset] [--dry-run] [--skip-progress]
+    python rescore_answers.py --stress [--page-size 200] [--limit N] [--session-id ID ...] [--dry-run] [--skip-progress]
+"""
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load the .env from the server root before settings is imported (same as main.py)
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / '.env', override=True)
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import time
+
+from config.settings import settings
+from core.groq_service import GroqService
+from core.rate_limiter import BATCH
+from core.progress_service import ProgressAggregator
+from core.stress_scoring import rescore_rows
+from utils.supabase_utils import select_in, supabase
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+ANSWER_COLUMNS = "session_id, question_number, answer_text, audio_url, score, feedback"
+STRESS_COLUMNS = "session_id, question_number, stress_score, stress_level, individual_scores"
+
+def load_checkpoint(path: Path) -> Dict:
+    """Return the saved checkpoint, or an empty one if there is none or it was written for another model."""
+    if not path.exists():
+        return {}
+    checkpoint = json.loads(path.read_text())
+    if checkpoint.get("model") != settings.GROQ_MODEL_NAME:
+        logger.info(f"Checkpoint was written for model {checkpoint.get('model')}, starting over with {settings.GROQ_MODEL_NAME}")
+        return {}
+    return checkpoint
+
+def save_checkpoint(path: Path, cursor: Tuple[str, int], stats: Dict) -> None:
+    # Write then rename so an interrupted run never leaves a truncated checkpoint
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({
+        "model": settings.GROQ_MODEL_NAME,
+        "cursor": list(cursor),
+        "stats": stats,
+        "updated_at": datetime.utcnow().isoformat()
+    }, indent=2))
+    tmp.replace(path)
+
+def fetch_page(cursor: Optional[Tuple[str, int]], page_size: int, session_ids: Optional[List[str]],
+               table: str = "mock_interview_answers", columns: str = ANSWER_COLUMNS) -> List[Dict]:
+    """Next page of rows ordered by (session_id, question_number), strictly after the cursor."""
+    query = supabase.table(table).select(columns)
+    if session_ids:
+        query = query.in_("session_id", session_ids)
+    if cursor:
+        after_session, after_number = cursor
+        query = query.or_(f"session_id.gt.{after_session},and(session_id.eq.{after_session},question_number.gt.{after_number})")
+    result = query.order("session_id").order("question_number").limit(page_size).execute()
+    return result.data or []
+
+def fetch_question_texts(answers: List[Dict]) -> Dict[Tuple[str, int], str]:
+    """Question text for every answer in the page (chunked in_() filters, each paged past PostgREST's row cap)."""
+    session_ids = sorted({a["session_id"] for a in answers})
+    questions = select_in(
+        supabase, "mock_interview_questions", "session_id, question_number, question_text",
+        "session_id", session_ids, order=("session_id", "question_number")
+    )
+    return {(q["session_id"], q["question_number"]): q["question_text"] for q in questions}
+
+def rescore_page(groq_service: GroqService, pool: ThreadPoolExecutor, answers: List[Dict]) -> Tuple[List[Dict], int, int]:
+    """Evaluate one page concurrently. Returns (rows to upsert, skipped, failed)."""
+    texts = fetch_question_texts(answers)
+    jobs = []
+    skipped = 0
+    for answer in answers:
+        question_text = texts.get((answer["session_id"], answer["question_number"]))
+        if not question_text or not (answer.get("answer_text") or "").strip():
+            skipped += 1
+            continue
+        jobs.append((answer, pool.submit(groq_service.evaluate_answer, question_text, answer["answer_text"])))
+
+    rows, failed = [], 0
+    for answer, future in jobs:
+        evaluation = future.result()
+        # API errors and unparseable replies come back as placeholders; keep the stored evaluation then
+        if not evaluation.get("evaluated"):
+            logger.warning(f"No usable evaluation for session {answer['session_id']} Q{answer['question_number']}, keeping the stored one")
+            failed += 1
+            continue
+        rows.append({**answer, "score": evaluation["score"], "feedback": evaluation["feedback"]})
+    return rows, skipped, failed
+
+def run(args) -> Dict:
+    checkpoint_path = Path(args.checkpoint)
+    checkpoint = {} if args.reset else load_checkpoint(checkpoint_path)
+    cursor = tuple(checkpoint["cursor"]) if checkpoint.get("cursor") else None
+    stats = checkpoint.get("stats") or {"processed": 0, "updated": 0, "skipped": 0, "failed": 0}
+    if cursor:
+        logger.info(f"Resuming after session {cursor[0]} Q{cursor[1]} ({stats['processed']} answers already processed)")
+
+    # Batch priority: leaves the reserved share of the Groq budget to live interviews
+    groq_service = GroqService(priority=BATCH)
+    progress = ProgressAggregator(supabase=supabase)
+    started = time.perf_counter()
+    run_processed = 0
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        while args.limit is None or run_processed < args.limit:
+            page_size = args.page_size if args.limit is None else min(args.page_size, args.limit - run_processed)
+            answers = fetch_page(cursor, page_size, args.session_id)
+            if not answers:
+                break
+
+            page_started = time.perf_counter()
+            rows, skipped, failed = rescore_page(groq_service, pool, answers)
+            if rows and not args.dry_run:
+                supabase.table("mock_interview_answers").upsert(rows, on_conflict="session_id,question_number").execute()
+                if not args.skip_progress:
+                    for session_id in sorted({r["session_id"] for r in rows}):
+                        progress.refresh_session(session_id)
+
+            cursor = (answers[-1]["session_id"], answers[-1]["question_number"])
+            run_processed += len(answers)
+            stats["processed"] += len(answers)
+            stats["updated"] += len(rows)
+            stats["skipped"] += skipped
+            stats["failed"] += failed
+            if not args.dry_run:
+                save_checkpoint(checkpoint_path, cursor, stats)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Page of {len(answers)} in {time.perf_counter() - page_started:.1f}s - updated {len(rows)}, "
+                f"skipped {skipped}, failed {failed} | total {stats['processed']} ({run_processed / elapsed:.1f} answers/s)"
+            )
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Re-scoring finished: {run_processed} answers this run in {elapsed:.1f}s "
+        f"({run_processed / elapsed if elapsed else 0.0:.1f} answers/s) - totals {stats}"
+    )
+    return stats
+
+def rescore_stress(args) -> Dict:
+    """Re-score stored stress rows page by page; only rows whose score or level changes are written back."""
+    progress = ProgressAggregator(supabase=supabase)
+    stats = {"processed": 0, "updated": 0, "unscorable": 0}
+    cursor = None
+    started = time.perf_counter()
+    while args.limit is None or stats["processed"] < args.limit:
+        page_size = args.page_size if args.limit is None else min(args.page_size, args.limit - stats["processed"])
+        rows = fetch_page(cursor, page_size, args.session_id, "mock_interview_stress_analysis", STRESS_COLUMNS)
+        if not rows:
+            break
+
+        changed = []
+        for before, after in zip(rows, rescore_rows(rows)):
+            if after is before:
+                stats["unscorable"] += 1
+            elif (after["stress_score"], after["stress_level"]) != (before["stress_score"], before["stress_level"]):
+                changed.append(after)
+        if changed and not args.dry_run:
+            supabase.table("mock_interview_stress_analysis").upsert(changed, on_conflict="session_id,question_number").execute()
+            if not args.skip_progress:
+                for session_id in sorted({r["session_id"] for r in changed}):
+                    progress.refresh_session(session_id)
+
+        cursor = (rows[-1]["session_id"], rows[-1]["question_number"])
+        stats["processed"] += len(rows)
+        stats["updated"] += len(changed)
+        logger.info(f"Page of {len(rows)} stress rows - changed {len(changed)} | total {stats['processed']}")
+
+    logger.info(f"Stress re-scoring finished in {time.perf_counter() - started:.1f}s - totals {stats}")
+    return stats
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-evaluate stored interview answers with the current Groq model and prompt.")
+    parser.add_argument("--page-size", type=int, default=200, help="Answers fetched and upserted per page")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent evaluate_answer calls")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many answers in this run")
+    parser.add_argument("--session-id", action="append", default=None, help="Only re-score these sessions (repeatable)")
+    parser.add_argument("--checkpoint", default="rescore_checkpoint.json", help="Checkpoint file used to resume")
+    parser.add_argument("--reset", action="store_true", help="Ignore the checkpoint and start from the beginning")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate but do not write answers or the checkpoint")
+    parser.add_argument("--skip-progress", action="store_true", help="Do not refresh materialized user progress")
+    parser.add_argument("--stress", action="store_true", help="Re-score stored stress rows instead of answers (no API calls)")
+    args = parser.parse_args()
+    if args.page_size < 1 or args.concurrency < 1:
+        parser.error("--page-size and --concurrency must be at least 1")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.stress:
+        rescore_stress(args)
+    else:
+        run(args)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the app's packages (core, config...) the same way main.py does, from server/student
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from core.acoustic_stress import SAMPLE_RATE, extract_features, score_features
+
+def voiced_carrier(seconds: float) -> np.ndarray:
+    """150 Hz voice-like carrier (five harmonics)."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+
+def syllable_train(rate: float, seconds: float = 6.0, syllable_seconds: float = 0.18, seed: int = 0) -> np.ndarray:
+    """Hann-shaped syllable bursts at `rate` per second over a quiet voiced floor, with a little noise and timing jitter."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = np.zeros_like(t)
+    for center in np.arange(0.25, seconds - 0.25, 1 / rate):
+        center += rng.uniform(-0.03, 0.03)
+        burst = np.abs(t - center) < syllable_seconds / 2
+        envelope[burst] = np.hanning(burst.sum())
+    signal = 0.3 * voiced_carrier(seconds) * (0.05 + envelope) + 0.003 * rng.standard_normal(len(t))
+    return signal.astype(np.float32)
+
+@pytest.mark.parametrize("rate", [2, 3, 4, 5])
+def test_speaking_rate_matches_syllable_rate(rate):
+    features = extract_features(syllable_train(rate))
+    assert features["speaking_rate"] == pytest.approx(rate, rel=0.15)
+
+def test_pauses_between_slow_syllables_do_not_inflate_the_rate():
+    features = extract_features(syllable_train(2))
+    assert features["pause_ratio"] > 0.35
+    assert features["speaking_rate"] < 2.5
+
+def test_ripple_within_a_syllable_is_one_peak():
+    # 40 Hz amplitude ripple on each burst: local maxima closer than the minimum spacing / below the prominence
+    seconds = 6.0
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    ripple = 1 + 0.1 * np.sin(2 * np.pi * 40 * t)
+    features = extract_features((syllable_train(3, seconds, syllable_seconds=0.25) * ripple).astype(np.float32))
+    assert features["speaking_rate"] == pytest.approx(3, rel=0.15)
+
+def test_constant_level_voice_is_speech():
+    samples = (0.3 * voiced_carrier(3.0)).astype(np.float32)
+    features = extract_features(samples)
+    assert features["speech_seconds"] == pytest.approx(3.0, abs=0.1)
+    assert features["pause_ratio"] == 0.0
+    assert features["pitch_mean_hz"] == pytest.approx(150, rel=0.05)
+
+def test_silence_is_no_speech_and_neutral():
+    features = extract_features(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert features["speech_seconds"] == 0.0
+    score, individual_scores = score_features(features)
+    assert score == 50.0
+    assert individual_scores == [{"metric": "speech_detected", "value": 0.0, "score": 0.0}]
+
+def test_score_stays_in_range():
+    for rate in (1, 3, 8):
+        score, _ = score_features(extract_features(syllable_train(rate)))
+        assert 0.0 <= score <= 100.0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from core.stress_scoring import (
+    acoustic_stress, rescore_rows, stress_level, stress_levels, wpm_stress,
+    HIGH_STRESS, LOW_STRESS, MODERATE_STRESS, NOT_ANALYZED, WPM_FAST, WPM_SLOW
+)
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+def test_wpm_score_in_range(rng):
+    scores = wpm_stress(rng.uniform(0, 400, 10_000))
+    assert ((scores >= 0) & (scores <= 100)).all()
+
+def test_wpm_score_grows_outside_the_normal_band(rng):
+    fast = np.sort(rng.uniform(WPM_FAST, 400, 1_000))
+    assert (np.diff(wpm_stress(fast)) >= 0).all()
+    slow = np.sort(rng.uniform(0, WPM_SLOW, 1_000))
+    assert (np.diff(wpm_stress(slow)) <= 0).all()
+    assert (wpm_stress(np.linspace(WPM_SLOW, WPM_FAST, 50)) == 50.0).all()
+
+def test_acoustic_score_in_range(rng):
+    scores = acoustic_stress(
+        rng.uniform(0, 10, 10_000), rng.uniform(0, 1, 10_000), rng.uniform(0, 8, 10_000), rng.uniform(0, 30, 10_000)
+    )
+    assert ((scores >= 0) & (scores <= 100)).all()
+
+def test_levels_are_monotonic_in_the_score(rng):
+    rank = {LOW_STRESS: 0, MODERATE_STRESS: 1, HIGH_STRESS: 2}
+    ordered = np.sort(rng.uniform(0, 100, 10_000))
+    assert (np.diff([rank[level] for level in stress_levels(ordered)]) >= 0).all()
+    assert stress_level(None) == NOT_ANALYZED
+
+def test_rescore_rows_matches_scalar_scoring():
+    rows = [
+        {"question_number": 1, "individual_scores": [{"metric": "wpm", "value": 200.0}]},
+        {"question_number": 2, "individual_scores": [{"metric": "audio_speaking_speed", "value": 130.0}]},
+        {"question_number": 3, "individual_scores": [
+            {"metric": "speaking_rate", "value": 7.0},
+            {"metric": "pause_ratio", "value": 0.5},
+            {"metric": "pitch_variability", "value": 2.0},
+            {"metric": "energy_variability", "value": 5.0}
+        ]},
+        {"question_number": 4, "individual_scores": [], "stress_score": 42.0, "stress_level": MODERATE_STRESS},
+    ]
+    rescored = rescore_rows(rows)
+
+    assert rescored[0]["stress_score"] == pytest.approx(float(wpm_stress(200.0)))
+    assert rescored[1]["stress_score"] == 50.0
+    assert rescored[2]["stress_score"] == pytest.approx(float(acoustic_stress(7.0, 0.5, 2.0, 5.0)))
+    # Rows without usable metrics come back unchanged (same object)
+    assert rescored[3] is rows[3]
+    for row in rescored[:3]:
+        assert row["stress_level"] == stress_level(row["stress_score"])
@@ -1,5 +1,6 @@
 from supabase import create_client
 from config.settings import settings
+from typing import Dict, List, Tuple
 
 # Initialize Supabase client
 supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
@@ -10,4 +11,28 @@ def upload_file(bucket: str, file_path: str, file_content: bytes):
 
 def download_file(bucket: str, file_path: str):
     """Download a file from Supabase storage."""
-    return supabase.storage.from_(bucket).download(file_path)
\ No newline at end of file
+    return supabase.storage.from_(bucket).download(file_path)
+# PostgREST returns at most max-rows rows per request (1000 by default), so bigger reads are paged
+PAGE_SIZE = 1000
+# Keeps in_() filters well under PostgREST URL length limits
+IN_CHUNK_SIZE = 150
+
+def select_in(client, table: str, columns: str, column: str, values: List[str], order: Tuple[str, ...]) -> List[Dict]:
+    """
+    Every row of table whose column is in values: one in_() filter per IN_CHUNK_SIZE values,
+    each read in range() pages of PAGE_SIZE until a short page. order must be a unique key so pages don't overlap.
+    """
+    rows: List[Dict] = []
+    for i in range(0, len(values), IN_CHUNK_SIZE):
+        chunk = values[i : i + IN_CHUNK_SIZE]
+        offset = 0
+        while True:
+            query = client.table(table).select(columns).in_(column, chunk)
+            for key in order:
+                query = query.order(key)
+            page = query.range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+    return rows
@@ -116,8 +116,9 @@ def run_tests():
     print_step("9. Admin: List Sessions")
     res = requests.get(f"{BASE_URL}/admin/sessions")
     if res.status_code == 200:
-        sessions = res.json()
-        print(f"✅ Admin Sessions Retrieved: Found {len(sessions)}")
+        # Paginated: {"sessions": [...newest first], "next_cursor": ...}
+        sessions = res.json()["sessions"]
+        print(f"✅ Admin Sessions Retrieved: Found {len(sessions)} on the first page")
         found = any(s['id'] == session_id for s in sessions)
         print(f"   Current Session Found in List: {found}")
     else:
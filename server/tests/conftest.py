@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# Tests import the server modules the same way api_service.py does, from server/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# The Supabase and Groq (OpenAI-compatible) clients are created at import time; tests never reach the network
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
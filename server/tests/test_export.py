@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    # api_service creates its data folders (and the search index) relative to the working directory on import
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("import"))
+        import api_service
+    return api_service
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # Result files live under ./processed_data, so each test gets its own working directory
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def client(api):
+    return TestClient(api.app)
+
+def write_store(api, job_id="job"):
+    store = api.ResultStore(job_id)
+    store.extend([
+        {"filename": "b.pdf", "resume_id": "r2", "analysis": {"Final Score": 6.0, "Key Skills": ["sql"]}, "rank": 2},
+        {"filename": "a.pdf", "resume_id": "r1", "analysis": {"Final Score": 8.0, "Key Skills": ["python"]}, "rank": 1},
+    ])
+    return store
+
+def test_export_is_served_by_the_result_store_handler(api):
+    route = next(r for r in api.app.routes if getattr(r, "path", None) == "/export" and "GET" in r.methods)
+    assert route.endpoint is api.export_results
+
+def test_json_export_streams_the_store_in_rank_order(api, client):
+    write_store(api)
+    response = client.get("/export", params={"job_id": "job"})
+    assert response.status_code == 200
+    assert [r["filename"] for r in response.json()] == ["a.pdf", "b.pdf"]
+
+def test_column_projection(api, client):
+    write_store(api)
+    response = client.get("/export", params={"job_id": "job", "columns": ["Final Score"]})
+    assert response.json()[0] == {"filename": "a.pdf", "analysis": {"Final Score": 8.0}}
+    assert client.get("/export", params={"job_id": "job", "columns": ["nope"]}).status_code == 400
+
+def test_arrow_export(api, client):
+    pa = pytest.importorskip("pyarrow")
+    write_store(api)
+    response = client.get("/export", params={"job_id": "job", "format": "arrow", "columns": ["filename", "Final Score"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == api.MEDIA_TYPES["arrow"]
+    table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+    assert table.column("filename").to_pylist() == ["a.pdf", "b.pdf"]
+    assert table.column("Final Score").to_pylist() == [8.0, 6.0]
+
+def test_legacy_results_are_exported(api, client, tmp_path):
+    legacy = tmp_path / "processed_data" / "old_analysis.json"
+    legacy.parent.mkdir(exist_ok=True)
+    legacy.write_text(json.dumps([{"filename": "c.pdf", "analysis": {"Final Score": 5.0}}]))
+    response = client.get("/export", params={"job_id": "old", "format": "csv"})
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["filename,Final Score", "c.pdf,5.0"]
+
+def test_unknown_job_is_404(client):
+    assert client.get("/export", params={"job_id": "missing"}).status_code == 404
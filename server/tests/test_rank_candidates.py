@@ -0,0 +1,45 @@
+import pytest
+
+import rank_candidates
+from result_store import ResultStore
+from screening_cascade import FAST_TIER, fast_pass_analysis
+
+@pytest.fixture
+def ranked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(rank_candidates, "_upsert_rankings", lambda ranked_list, job_id: None)
+
+    def rank(records):
+        ResultStore("job").extend(records)
+        rank_candidates.compute_relative_ranking("job")
+        return {r["filename"]: r for r in ResultStore("job").records(ranked=True)}
+    return rank
+
+def record(filename, final_score, tier="full", fast_score=0.0):
+    return {"filename": filename, "analysis": {"Final Score": final_score, "Screening Tier": tier, "Fast Pass Score": fast_score}}
+
+def test_fast_tier_ranks_after_every_escalated_resume(ranked):
+    rows = ranked([
+        record("fast-high.pdf", 0.0, FAST_TIER, fast_score=4.9),
+        record("full-low.pdf", 3.0),
+        record("full-high.pdf", 8.0),
+        record("fast-low.pdf", 0.0, FAST_TIER, fast_score=2.0),
+    ])
+    order = sorted(rows, key=lambda filename: rows[filename]["rank"])
+    assert order == ["full-high.pdf", "full-low.pdf", "fast-high.pdf", "fast-low.pdf"]
+    assert rows["full-high.pdf"]["analysis"]["Relative Ranking Score"] == 100.0
+    assert rows["fast-high.pdf"]["analysis"]["Relative Ranking Score"] == 0.0
+
+def test_without_a_cascade_ranking_follows_the_final_score(ranked):
+    rows = ranked([
+        {"filename": "a.pdf", "analysis": {"Final Score": 2.0}},
+        {"filename": "b.pdf", "analysis": {"Final Score": 6.0}},
+    ])
+    assert rows["b.pdf"]["rank"] == 1
+    assert rows["a.pdf"]["analysis"]["Relative Ranking Score"] == 0.0
+
+def test_fast_pass_analysis_leaves_the_llm_score_columns_empty():
+    analysis = fast_pass_analysis(4.9, "python developer")
+    assert analysis["Overall Match Score"] == 0
+    assert analysis["Experience Relevance Score"] == analysis["Projects Relevance Score"] == 0
+    assert "4.9" in analysis["Overall Analysis"]
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from resume_analysis import parse_json_object, repair_json
+
+@pytest.mark.parametrize("raw, expected", [
+    ("{'a': 'it\\'s'}", {"a": "it's"}),
+    ('{"a": "it\\\'s"}', {"a": "it's"}),
+    ("{'a': 'say \"hi\"'}", {"a": 'say "hi"'}),
+    ("```json\n{'a': True, 'b': None, 'c': [1, 2,],}\n```", {"a": True, "b": None, "c": [1, 2]}),
+    ('{"a": "line one\nline\ttwo"}', {"a": "line one\nline\ttwo"}),
+    ('Here you go: {"a": "\\\\"} thanks', {"a": "\\"}),
+])
+def test_repair_json(raw, expected):
+    assert json.loads(repair_json(raw)) == expected
+
+def test_truncated_output_is_cut_back_to_the_last_complete_element():
+    assert json.loads(repair_json('{"a": [1, 2], "b": "unfinish')) == {"a": [1, 2]}
+
+def test_parse_json_object_repairs_escaped_single_quotes():
+    assert parse_json_object("{'Overall Analysis': 'Candidate\\'s projects fit the role.'}") == {
+        "Overall Analysis": "Candidate's projects fit the role."
+    }
+
+def test_no_object_raises():
+    with pytest.raises(ValueError):
+        repair_json("no json here")